@@ -0,0 +1,84 @@
+# bench_input_drivers.py (입력 드라이버 행당 지연 비교 벤치마크)
+#
+# 화면이 없는 Linux에서도 실행할 수 있습니다.
+#   python bench_input_drivers.py --rows 50 --tabs 2
+#
+# - [모델] pyautogui, PAUSE=0.1: pyautogui 드라이버의 대기 시간 + 호출마다 PAUSE 0.1초를 sleep으로 흉내냄
+# - [모델] pyautogui, PAUSE=0: 현재 pyautogui 드라이버의 대기 시간만 sleep으로 흉내냄
+# - [측정] playwright: headless Chromium의 입력칸 표에 실제로 입력
+# [모델] 값은 실제 키 입력/클립보드 시간이 빠진 하한값이므로 [측정] 값과 그대로 비교하면 안 됩니다.
+
+import time
+import argparse
+import statistics
+from input_drivers import InputDriver, PyAutoGuiDriver, PlaywrightDriver, RecordingDriver
+
+
+def build_grid_html(rows: int, tabs: int) -> str:
+    """나이스 입력 화면처럼 행마다 (tabs)개의 입력칸이 있는 표를 만듭니다."""
+    cells = ''.join(
+        '<tr>' + ''.join('<td><textarea></textarea></td>' for _ in range(tabs)) + '</tr>'
+        for _ in range(rows)
+    )
+    return f'<html><body><table>{cells}</table></body></html>'
+
+
+def measure(driver: InputDriver, data_list: list, tab_count: int) -> list:
+    """행마다 걸린 시간(ms)을 측정합니다."""
+    latencies = []
+    for data in data_list:
+        start = time.perf_counter()
+        driver.enter_row(data, tab_count)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name: str, latencies: list):
+    latencies = sorted(latencies)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"{name:<36} 평균 {statistics.mean(latencies):8.1f} ms   p95 {p95:8.1f} ms   "
+          f"합계 {sum(latencies) / 1000:6.1f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="입력 드라이버 행당 지연 비교")
+    parser.add_argument('--rows', type=int, default=30)
+    parser.add_argument('--tabs', type=int, default=2)
+    args = parser.parse_args()
+
+    data_list = [f"{i}번 학생 종합의견 예시 문장입니다." for i in range(1, args.rows + 1)]
+
+    # pyautogui 드라이버는 insert_text 안에서 클립보드 복사 후 'copy'만큼 더 쉽니다.
+    pyautogui_delays = dict(PyAutoGuiDriver.delays,
+                            paste=PyAutoGuiDriver.delays['copy'] + PyAutoGuiDriver.delays['paste'])
+
+    # pyautogui는 실제 화면/키보드가 있어야 하므로 대기 시간만 흉내낸 모델값입니다. (측정값 아님)
+    print("[모델] 값은 pyautogui 드라이버의 대기 시간을 sleep으로 흉내낸 것이며, 실제 입력 시간은 포함하지 않습니다.")
+    legacy = RecordingDriver(call_latency=0.1, delays=pyautogui_delays)
+    report("[모델] pyautogui, PAUSE=0.1", measure(legacy, data_list, args.tabs))
+
+    current = RecordingDriver(call_latency=0.0, delays=pyautogui_delays)
+    report("[모델] pyautogui, PAUSE=0", measure(current, data_list, args.tabs))
+
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        print("playwright가 설치되어 있지 않아 playwright 드라이버 측정을 건너뜁니다.")
+        return
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+        page.set_content(build_grid_html(args.rows, args.tabs))
+        page.locator('textarea').first.focus()
+
+        driver = PlaywrightDriver(page)
+        report("[측정] playwright (insert_text)", measure(driver, data_list, args.tabs))
+
+        filled = page.locator('textarea').evaluate_all('els => els.filter(e => e.value).length')
+        print(f"playwright 입력 확인: {filled}/{args.rows}칸")
+        browser.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# bench_render_profile.py (normal/light 렌더링 프로필 단계 지연 비교 벤치마크)
+#
+# 나이스 메뉴처럼 클릭 후 CSS 전환이 끝나야 하위 메뉴가 나타나는 화면을 만들어
+# 클릭 → to_be_visible 완료까지의 시간을 두 프로필에서 측정합니다.
+#   python bench_render_profile.py --repeat 20
+#
+# 실제 사용 중 측정값 비교는 TimingProfile.summary()를 compare_profiles()에 넘겨 확인합니다.
+
+import time
+import argparse
+import statistics
+from render_profile import apply_profile, compare_profiles
+from timing_profile import timing
+
+MENU_HTML = """
+<html><head><style>
+  #submenu { height: 0; overflow: hidden; transition: height 400ms ease; }
+  #submenu.open { height: 200px; }
+  #leaf { display: none; }
+</style></head><body>
+  <button id="menu">학적</button>
+  <div id="submenu"><a id="leaf" title="학적부">학적부</a></div>
+  <script>
+    const submenu = document.getElementById('submenu');
+    document.getElementById('menu').onclick = () => submenu.classList.toggle('open');
+    submenu.addEventListener('transitionend', () => {
+      document.getElementById('leaf').style.display = submenu.classList.contains('open') ? 'block' : 'none';
+    });
+  </script>
+</body></html>
+"""
+
+
+def measure(page, repeat: int) -> list:
+    from playwright.sync_api import expect
+    latencies = []
+    for _ in range(repeat):
+        page.set_content(MENU_HTML)
+        start = time.perf_counter()
+        page.click('#menu')
+        expect(page.locator('#leaf')).to_be_visible(timeout=5000)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="렌더링 프로필 단계 지연 비교")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    from playwright.sync_api import sync_playwright
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        context = browser.new_context()
+        results = {}
+        for profile in ('normal', 'light'):
+            page = context.new_page()
+            apply_profile(page, profile, background=True)
+            results[profile] = measure(page, args.repeat)
+            page.close()
+        browser.close()
+
+    for profile, latencies in results.items():
+        print(f"{profile:<7} 메뉴 클릭→표시 p50 {statistics.median(latencies):7.1f} ms   "
+              f"최대 {max(latencies):7.1f} ms")
+
+    rows = compare_profiles(timing.summary())
+    if rows:
+        print("\n실사용 측정값 (p50, ms)")
+        for point, normal, light, change in rows:
+            print(f"{point:<28} normal {normal:8.1f}   light {light:8.1f}   {change:+.1f}%")
+
+
+if __name__ == '__main__':
+    main()
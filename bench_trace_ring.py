@@ -0,0 +1,87 @@
+# bench_trace_ring.py (트레이스 링 버퍼 오버헤드 벤치마크)
+#
+# 나이스 입력 화면과 비슷한 로컬 페이지에서 클릭/입력/대기 동작을 반복하며
+# 트레이스 끔(off) / 링 버퍼(스냅샷만) / 링 버퍼(+스크린샷)의 동작당 지연과 조각 파일 크기를 비교합니다.
+#   python bench_trace_ring.py --rows 200 --chunk-seconds 5
+
+import os
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+from trace_ring import TraceRing
+
+FORM_HTML = """
+<html><body>
+  <table id="grid">%s</table>
+  <button id="save" onclick="document.getElementById('msg').innerText = '저장되었습니다'">저장</button>
+  <div id="msg"></div>
+</body></html>
+""" % ''.join(f'<tr><td>{i}번</td><td><textarea id="f{i}"></textarea></td></tr>' for i in range(40))
+
+
+def run_workload(page, ring: TraceRing, rows: int) -> list:
+    """행마다 입력칸 채우기 → 저장 클릭 → 메시지 확인을 하고 동작당 걸린 시간(ms)을 반환합니다."""
+    from playwright.sync_api import expect
+    latencies = []
+    page.set_content(FORM_HTML)
+    for index in range(rows):
+        start = time.perf_counter()
+        page.fill(f'#f{index % 40}', f"{index}번 학생의 행동특성 및 종합의견 " * 5)
+        page.click('#save')
+        expect(page.locator('#msg')).to_have_text('저장되었습니다')
+        page.evaluate("() => document.getElementById('msg').innerText = ''")
+        latencies.append((time.perf_counter() - start) * 1000)
+        if ring:
+            ring.maybe_rotate()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="트레이스 링 버퍼 오버헤드 비교")
+    parser.add_argument('--rows', type=int, default=200)
+    parser.add_argument('--chunk-seconds', type=int, default=5)
+    args = parser.parse_args()
+
+    from playwright.sync_api import sync_playwright
+    trace_dir = tempfile.mkdtemp(prefix='bench_trace_')
+    variants = (('off', None), ('ring', False), ('ring+screenshots', True))
+    results = {}
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            for name, screenshots in variants:
+                context = browser.new_context()
+                ring = None
+                if screenshots is not None:
+                    ring = TraceRing(context, os.path.join(trace_dir, name), ring_minutes=60,
+                                     chunk_seconds=args.chunk_seconds, screenshots=screenshots)
+                    ring.start()
+                page = context.new_page()
+                latencies = run_workload(page, ring, args.rows)
+
+                size_kb, dump_ms = 0.0, 0.0
+                if ring:
+                    start = time.perf_counter()
+                    archive = ring.dump('benchmark')
+                    dump_ms = (time.perf_counter() - start) * 1000
+                    size_kb = os.path.getsize(archive) / 1024
+                    ring.stop()
+                context.close()
+                results[name] = (latencies, size_kb, dump_ms)
+            browser.close()
+    finally:
+        shutil.rmtree(trace_dir, ignore_errors=True)
+
+    base = statistics.median(results['off'][0])
+    for name, (latencies, size_kb, dump_ms) in results.items():
+        p50 = statistics.median(latencies)
+        p95 = sorted(latencies)[int(len(latencies) * 0.95) - 1]
+        print(f"{name:<17} 동작당 p50 {p50:7.2f} ms  p95 {p95:7.2f} ms  "
+              f"(off 대비 {(p50 - base) / base * 100:+5.1f}%)  "
+              f"기록 {size_kb:8.1f} KB  저장 {dump_ms:6.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,81 +1,431 @@
 # btn_commands.py (공유 영구 세션 아키텍처 버전)
 
+import time
+import functools
+import threading
+from contextlib import contextmanager, nullcontext
 from playwright.sync_api import sync_playwright, Page, Playwright, Browser, BrowserContext, TimeoutError, expect
 from utils import urls, open_url_in_new_tab, login
-from tkinter import messagebox
+from har_replay import get_har_settings, context_options, prepare_context, attach_har, finish_recording
+from session_snapshot import save_pages, save_storage_state, load_snapshot, clear_snapshot
+from timing_profile import timing
+from render_profile import get_render_settings, apply_profile, is_light
+from trace_ring import TraceRing
+from page_index import PageIndex, attach_index, detach_index
+from resilience import resilient_goto, classify_error, CircuitOpenError, BROWSER_DEAD, SESSION_EXPIRED, TRANSIENT, FATAL
+from notifier import notify, PARTIAL
+
+
+class BrowserThreadError(RuntimeError):
+    """BrowserManager를 소유 스레드가 아닌 곳에서 사용하거나 종료 중에 사용할 때 발생하는 오류"""
 
 
 class BrowserManager:
     """
     공유 영구 세션을 관리하는 중앙 허브
     단 한 번의 로그인으로 모든 서비스를 병렬 관리
+
+    Playwright 동기 API는 스레드에 묶여 있으므로, 브라우저를 처음 시작한 스레드만
+    (소유 스레드) 브라우저를 다룰 수 있습니다. 다른 스레드에서 호출하면 BrowserThreadError가 발생합니다.
     """
+    # 종료 시 진행 중인 작업이 끝나기를 기다리는 최대 시간 (초)
+    DRAIN_TIMEOUT = 10.0
+    # 탭 재생성 시 새 탭 이동을 기다리는 최대 시간 (밀리초, GUI 타이머에서 호출되므로 짧게)
+    RECYCLE_GOTO_TIMEOUT_MS = 10000
+
     def __init__(self):
         self.playwright: Playwright = None
         self.browser: Browser = None
         self.context: BrowserContext = None
-        self.pages = {}  # {'나이스': Page, '에듀파인': Page}
-        self.is_logged_in = False  # 로그인 상태 플래그
-        self.is_closing = False  # 종료 상태 플래그
+        self.trace_ring: TraceRing = None  # 오류 분석용 트레이스 링 버퍼 ([Trace] mode = ring일 때만)
+        self.page_index: PageIndex = None  # 팝업을 포함한 모든 탭의 URL/제목 색인
+        self._pages = {}  # {'나이스': Page, '에듀파인': Page}
+        self._page_urls = {}  # {'나이스': 마지막 URL} - 브라우저 충돌 복구용
+        self._is_logged_in = False  # 로그인 상태 플래그
+        self._is_closing = False  # 종료 상태 플래그
+
+        # --- 실행 방식 설정 (CLI에서 변경) ---
+        self.headless = False  # 브라우저 창 없이 실행
+        self.storage_state_path = None  # 처음 컨텍스트를 만들 때 불러올 쿠키/스토리지 파일
+        self.snapshots_enabled = True  # 충돌 복구용 세션 스냅샷 저장 여부
+
+        # --- 스레드 안전성 관련 상태 ---
+        self._lock = threading.RLock()
+        self._idle = threading.Condition(self._lock)  # 진행 중인 작업이 모두 끝났음을 알림
+        self._owner_thread = None  # 브라우저를 소유한 스레드
+        self._in_flight = {}  # {스레드 ident: 진행 중인 작업 수}
+        self._active_operations = []  # 진행 중인 작업 이름 (중첩 순서대로)
+        self._draining = False  # close()가 진행 중인 작업을 기다리는 중인지 여부
+        self._metrics = {
+            'lock_acquisitions': 0,   # 상태 잠금 획득 횟수
+            'lock_contentions': 0,    # 잠금을 바로 얻지 못하고 기다린 횟수
+            'lock_wait_ms_total': 0.0,
+            'lock_wait_ms_max': 0.0,
+            'operations': 0,          # 실행된 작업 수
+            'cross_thread_errors': 0, # 소유 스레드가 아닌 곳에서의 호출 횟수
+            'drain_wait_ms_last': 0.0 # 마지막 종료 시 작업 대기 시간
+        }
         print("BrowserManager(세션 관리자)가 준비되었습니다.")
 
+    # --- 잠금으로 보호되는 상태 ---
+    @contextmanager
+    def _locked(self):
+        """상태 잠금을 획득하고 경합/대기 시간을 기록합니다."""
+        if self._lock.acquire(blocking=False):
+            wait_ms = 0.0
+            contended = False
+        else:
+            start = time.perf_counter()
+            self._lock.acquire()
+            wait_ms = (time.perf_counter() - start) * 1000
+            contended = True
+        try:
+            self._metrics['lock_acquisitions'] += 1
+            if contended:
+                self._metrics['lock_contentions'] += 1
+                self._metrics['lock_wait_ms_total'] += wait_ms
+                self._metrics['lock_wait_ms_max'] = max(self._metrics['lock_wait_ms_max'], wait_ms)
+            yield
+        finally:
+            self._lock.release()
+
+    @property
+    def pages(self) -> dict:
+        """서비스별 페이지 목록의 복사본 (다른 스레드에서 읽어도 안전)"""
+        with self._locked():
+            return dict(self._pages)
+
+    @property
+    def is_logged_in(self) -> bool:
+        with self._locked():
+            return self._is_logged_in
+
+    @is_logged_in.setter
+    def is_logged_in(self, value: bool):
+        with self._locked():
+            self._is_logged_in = value
+
+    @property
+    def is_closing(self) -> bool:
+        with self._locked():
+            return self._is_closing
+
+    @property
+    def active_operations(self) -> list:
+        """진행 중인 작업 이름 목록 (바깥 작업부터)"""
+        with self._locked():
+            return list(self._active_operations)
+
+    def get_metrics(self) -> dict:
+        """잠금 경합, 대기 시간 등 스레드 관련 지표를 반환합니다."""
+        with self._locked():
+            metrics = dict(self._metrics)
+            metrics['in_flight'] = sum(self._in_flight.values())
+            metrics['owner_thread'] = self._owner_thread.name if self._owner_thread else None
+            return metrics
+
+    def _check_thread(self):
+        """
+        소유 스레드에서 호출되었는지 확인합니다.
+        아직 소유 스레드가 없으면 현재 스레드가 소유자가 됩니다.
+        """
+        current = threading.current_thread()
+        with self._locked():
+            if self._owner_thread is None or not self._owner_thread.is_alive():
+                self._owner_thread = current
+                return
+            if self._owner_thread is not current:
+                self._metrics['cross_thread_errors'] += 1
+                raise BrowserThreadError(
+                    f"브라우저는 '{self._owner_thread.name}' 스레드에서만 사용할 수 있습니다. "
+                    f"(현재 스레드: '{current.name}')"
+                )
+
+    @contextmanager
+    def operation(self, name: str):
+        """
+        브라우저 작업 하나를 감싸는 컨텍스트 관리자
+        소유 스레드를 확인하고, 종료 중이면 새 작업을 거부하며, 진행 중인 작업 수를 기록합니다.
+        """
+        self._check_thread()
+        ident = threading.get_ident()
+        with self._locked():
+            if self._draining:
+                raise BrowserThreadError(f"브라우저를 종료하는 중이므로 '{name}' 작업을 시작할 수 없습니다.")
+            self._in_flight[ident] = self._in_flight.get(ident, 0) + 1
+            self._active_operations.append(name)
+            self._metrics['operations'] += 1
+        try:
+            yield
+        finally:
+            with self._locked():
+                self._in_flight[ident] -= 1
+                outermost = self._in_flight[ident] == 0
+                if outermost:
+                    del self._in_flight[ident]
+                if name in self._active_operations:
+                    self._active_operations.remove(name)
+                self._idle.notify_all()
+            if outermost and not self._draining:
+                self.save_snapshot()
+                self.rotate_trace()
+
+    def _drain(self):
+        """
+        다른 스레드에서 진행 중인 작업이 끝나기를 기다립니다.
+        같은 스레드의 작업(예: 안내창이 떠 있는 동안 창을 닫은 경우)은 기다릴 수 없으므로 제외합니다.
+        """
+        ident = threading.get_ident()
+        start = time.perf_counter()
+        with self._lock:
+            self._draining = True
+            others = lambda: sum(count for tid, count in self._in_flight.items() if tid != ident)
+            if others():
+                print(f"진행 중인 작업이 끝나기를 기다립니다: {self._active_operations}")
+            drained = self._idle.wait_for(lambda: others() == 0, timeout=self.DRAIN_TIMEOUT)
+            if not drained:
+                print(f"작업 대기 시간이 초과되었습니다. 남은 작업: {self._active_operations}")
+            if self._in_flight.get(ident):
+                print(f"현재 스레드의 작업을 중단하고 종료합니다: {self._active_operations}")
+            self._metrics['drain_wait_ms_last'] = (time.perf_counter() - start) * 1000
+
     def set_closing_flag(self):
         """프로그램 종료가 시작되었음을 알립니다."""
-        self.is_closing = True
+        with self._locked():
+            self._is_closing = True
         print("BrowserManager: 프로그램 종료 플래그가 설정되었습니다.")
 
     def ensure_browser_initialized(self):
         """
         지연 초기화: 첫 번째 자동화 버튼이 클릭될 때만 브라우저를 시작
         """
+        self._check_thread()
+
         if self.browser is None or not self.browser.is_connected():
-            print("브라우저를 지연 초기화합니다...")
+            # 브라우저가 있었는데 연결이 끊겼다면 충돌(또는 사용자가 닫음)으로 보고 복구합니다.
+            crashed = self.browser is not None
+            if crashed:
+                print("브라우저 연결이 끊겼습니다. 마지막 세션 상태로 복구합니다...")
+            else:
+                print("브라우저를 지연 초기화합니다...")
             
             if self.playwright is None:
                 self.playwright = sync_playwright().start()
             
             # 새 브라우저 실행
             self.browser = self.playwright.chromium.launch(
-                headless=False, 
+                headless=self.headless, 
                 channel="msedge"
             )
+            self.browser.on("disconnected", lambda _: print("BrowserManager: 브라우저 연결이 끊겼습니다."))
             print("새 Edge 브라우저를 실행했습니다.")
-            
+
+            snapshot, storage_state_path = load_snapshot() if crashed and self.snapshots_enabled else (None, None)
+            storage_state_path = storage_state_path or self.storage_state_path
+
             # 단일 컨텍스트 생성 (모든 페이지가 쿠키와 세션을 공유)
-            self.context = self.browser.new_context()
+            har_mode, _ = get_har_settings()
+            options = context_options(har_mode)
+            if storage_state_path:
+                options['storage_state'] = storage_state_path
+            self.context = self.browser.new_context(**options)
+            self.page_index = attach_index(self.context)
+            prepare_context(self.context, har_mode)
+            self.trace_ring = TraceRing.from_config(self.context)
             print("공유 브라우저 컨텍스트를 생성했습니다.")
 
-    def get_or_create_page(self, service_name: str) -> Page:
+            with self._locked():
+                self._pages = {}
+            if snapshot:
+                self._restore_pages(snapshot)
+
+    def _register_page(self, service_name: str, page: Page):
+        """서비스 페이지를 등록하고, 이동할 때마다 URL을 스냅샷에 기록하도록 연결합니다."""
+        with self._locked():
+            self._pages[service_name] = page
+            self._page_urls[service_name] = page.url
+        page.on("framenavigated", lambda frame: self._on_page_navigated(service_name, page, frame))
+
+    def _on_page_navigated(self, service_name: str, page: Page, frame):
+        """메인 프레임 이동 시 마지막 URL을 갱신하고 스냅샷 파일에 바로 씁니다."""
+        if frame != page.main_frame or not self.snapshots_enabled:
+            return
+        with self._locked():
+            if self._pages.get(service_name) is not page:
+                return
+            self._page_urls[service_name] = frame.url
+            page_urls = dict(self._page_urls)
+            is_logged_in = self._is_logged_in
+        try:
+            save_pages(page_urls, is_logged_in)
+        except OSError as e:
+            print(f"세션 스냅샷 저장 실패: {e}")
+
+    def save_snapshot(self):
+        """
+        현재 서비스 페이지 URL과 컨텍스트 저장 상태(쿠키 등)를 디스크에 저장합니다.
+        작업이 끝날 때마다 자동으로 호출됩니다.
+        """
+        if not self.snapshots_enabled:
+            return
+        if self.context is None or self.browser is None or not self.browser.is_connected():
+            return
+        try:
+            with self._locked():
+                page_urls = dict(self._page_urls)
+                is_logged_in = self._is_logged_in
+            save_pages(page_urls, is_logged_in)
+            save_storage_state(self.context.storage_state())
+        except Exception as e:
+            print(f"세션 스냅샷 저장 실패: {e}")
+
+    def rotate_trace(self):
+        """
+        트레이스 링 버퍼의 현재 조각이 충분히 길어졌으면 끊어 저장합니다.
+        작업이 끝날 때와 GUI 타이머에서 호출되며, 소유 스레드가 아니면 아무것도 하지 않습니다.
+        """
+        if self.trace_ring is None or self._owner_thread is not threading.current_thread():
+            return
+        try:
+            self.trace_ring.maybe_rotate()
+        except Exception as e:
+            print(f"트레이스 조각 저장 실패: {e}")
+
+    def dump_trace(self, reason: str) -> str:
+        """트레이스 링 버퍼에 남아 있는 최근 기록을 압축 파일로 저장하고 경로를 반환합니다."""
+        if self.trace_ring is None:
+            return None
+        try:
+            self._check_thread()
+            return self.trace_ring.dump(reason)
+        except Exception as e:
+            print(f"트레이스 저장 실패: {e}")
+            return None
+
+    def _restore_pages(self, snapshot: dict):
+        """스냅샷에 기록된 서비스 탭을 마지막 URL로 다시 엽니다."""
+        restored = []
+        for service_name, url in snapshot.get('pages', {}).items():
+            if not url or url == 'about:blank':
+                continue
+            try:
+                page = self.context.new_page()
+                apply_profile(page, get_render_settings()[0])
+                self._register_page(service_name, page)
+                page.goto(url, wait_until="domcontentloaded")
+                restored.append(service_name)
+            except Exception as e:
+                print(f"{service_name} 탭 복구 실패: {e}")
+
+        # 복구된 탭이 로그인 페이지로 돌아가지 않았다면 로그인 상태도 복구합니다.
+        still_logged_in = snapshot.get('is_logged_in', False) and all(
+            'lg00_001.do' not in self._pages[name].url for name in restored
+        )
+        self.is_logged_in = still_logged_in
+        print(f"✓ 세션 복구 완료: {restored} (로그인 상태: {still_logged_in})")
+
+    def attach_har(self, workflow: str):
+        """
+        워크플로우별 HAR 기록/재생을 공유 컨텍스트에 연결합니다.
+        config.ini의 [HAR] mode가 off이면 아무것도 하지 않습니다.
+        """
+        self.ensure_browser_initialized()
+        attach_har(self.context, workflow)
+
+    def get_or_create_page(self, service_name: str, profile: str = None, background: bool = False) -> Page:
         """
         서비스별 페이지를 가져오거나 새로 생성
         기존 페이지가 있으면 재사용, 없으면 새로 생성
+
+        profile: 'normal' 또는 'light' (지정하지 않으면 config.ini [Render] profile)
+        background: light 프로필에서 사용자가 보지 않는 페이지면 더 작은 화면 크기를 사용
         """
         self.ensure_browser_initialized()
         
         # 기존 페이지가 있고 유효하면 재사용
-        if service_name in self.pages:
-            page = self.pages[service_name]
+        page = self.pages.get(service_name)
+        if page is not None:
             if not page.is_closed():
                 page.bring_to_front()
                 return page
         
         # 새 페이지 생성 (공유 컨텍스트를 통해)
         page = self.context.new_page()
-        page.set_viewport_size({"width": 1920, "height": 1080})
-        self.pages[service_name] = page
+        apply_profile(page, profile or get_render_settings()[0], background)
+        self._register_page(service_name, page)
         print(f"{service_name} 전용 새 페이지를 생성했습니다.")
         
         return page
 
+    def find_page(self, service_name: str = None, keyword: str = None, url_filter=None) -> Page:
+        """
+        탭 색인에서 서비스 이름 및/또는 제목·URL 글자로 탭을 찾습니다. (브라우저에 묻지 않음)
+        직접 만든 탭뿐 아니라 포털이 띄운 팝업도 찾을 수 있습니다. 없으면 None
+        """
+        if self.page_index is None:
+            return None
+        return self.page_index.find(service_name, keyword, url_filter=url_filter)
+
+    def recycle_page(self, service_name: str) -> Page:
+        """
+        서비스 탭을 같은 URL의 새 탭으로 바꿉니다. (오래 열어 둔 탭의 메모리를 돌려받기 위함)
+        쿠키는 공유 컨텍스트에 있으므로 로그인은 유지됩니다.
+        메모리 점검 타이머(GUI 스레드)에서 호출되므로 networkidle/재시도 없이 DOM이 준비될 때까지만 한 번 기다리고,
+        실패하면 새 탭을 닫고 기존 탭을 그대로 둡니다.
+        """
+        with self.operation(f'{service_name} 탭 재생성'):
+            old_page = self.pages.get(service_name)
+            if old_page is None or old_page.is_closed():
+                return None
+
+            url = old_page.url
+            page = self.context.new_page()
+            apply_profile(page, 'light' if is_light(old_page) else 'normal')
+            if old_page.viewport_size:
+                page.set_viewport_size(old_page.viewport_size)
+            if url and url != 'about:blank':
+                try:
+                    page.goto(url, wait_until='domcontentloaded', timeout=self.RECYCLE_GOTO_TIMEOUT_MS)
+                except Exception:
+                    page.close()
+                    raise
+            self._register_page(service_name, page)
+            old_page.close()
+            print(f"{service_name} 탭을 새로 열었습니다: {url}")
+            return page
+
     def close(self):
-        """모든 리소스를 안전하게 종료합니다."""
+        """
+        모든 리소스를 안전하게 종료합니다.
+        다른 스레드에서 진행 중인 작업이 끝나기를 먼저 기다린 후 브라우저를 닫습니다.
+        """
+        self._drain()
         try:
+            self._check_thread()
+        except BrowserThreadError:
+            with self._locked():
+                self._draining = False
+            raise
+
+        try:
+            if self.trace_ring and self.browser and self.browser.is_connected():
+                self.trace_ring.stop()
+            if self.context is not None:
+                detach_index(self.context)
+            if self.context and self.browser and self.browser.is_connected():
+                # 컨텍스트를 먼저 닫아야 기록 중인 HAR 파일이 저장됩니다.
+                self.context.close()
+                finish_recording(self.context)
             if self.browser and self.browser.is_connected():
                 print("공유 브라우저를 닫습니다.")
                 self.browser.close()
             if self.playwright:
                 print("Playwright 인스턴스를 중지합니다.")
                 self.playwright.stop()
+            # 정상 종료이므로 복구용 스냅샷은 지웁니다.
+            if self.snapshots_enabled:
+                clear_snapshot()
+            timing.save(force=True)
         except Exception as e:
             print(f"종료 중 오류 발생: {e}")
         finally:
@@ -83,25 +433,86 @@ class BrowserManager:
             self.playwright = None
             self.browser = None
             self.context = None
-            self.pages = {}
-            self.is_logged_in = False
+            self.trace_ring = None
+            self.page_index = None
+            with self._locked():
+                self._pages = {}
+                self._page_urls = {}
+                self._is_logged_in = False
+                self._owner_thread = None
+                self._draining = False
 
 
 # 단 하나의 세션 관리자 인스턴스 생성
 browser_manager = BrowserManager()
 
 
+# 로그인 대기 중 GUI 이벤트를 처리하는 간격 (이동 이벤트는 이 간격과 관계없이 즉시 감지됨)
+LOGIN_EVENT_SLICE_MS = 250
+
+
+def _browser_operation(name: str):
+    """워크플로우 전체를 하나의 BrowserManager 작업으로 실행하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with browser_manager.operation(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
 def _handle_error(e):
-    """오류 처리 시, 세션 관리자를 통해 안전하게 모든 것을 종료합니다."""
+    """
+    오류를 종류별로 처리합니다.
+    브라우저가 실제로 죽은 경우에만 세션 관리자를 통해 모든 것을 종료하고,
+    일시적 오류나 세션 만료는 브라우저와 탭을 그대로 유지합니다.
+    """
     if browser_manager.is_closing:
         print("프로그램 종료 중 발생한 예상된 오류입니다. 무시합니다.")
         return
-    
+
     error_message = f"{type(e).__name__}: {e}"
-    messagebox.showerror("오류 발생", error_message)
-    browser_manager.close()
 
+    if isinstance(e, (CircuitOpenError, BrowserThreadError)):
+        notify.showwarning("잠시 후 다시 시도", str(e), kind=TRANSIENT)
+        return
+
+    # 오류 직전 몇 분의 트레이스를 남깁니다. (트레이스 모드가 꺼져 있으면 None)
+    trace_path = browser_manager.dump_trace(error_message)
+    if trace_path:
+        error_message += f"\n\n오류 기록: {trace_path}"
 
+    browser_alive = browser_manager.browser is not None and browser_manager.browser.is_connected()
+    kind = classify_error(e) if browser_alive else BROWSER_DEAD
+    if kind != BROWSER_DEAD:
+        # 서비스 탭이 로그인 페이지로 돌아가 있으면 세션 만료로 판단합니다.
+        for page in browser_manager.pages.values():
+            if classify_error(e, page) == SESSION_EXPIRED:
+                kind = SESSION_EXPIRED
+                break
+    print(f"오류 분류: {kind}")
+
+    if kind == BROWSER_DEAD:
+        # 브라우저를 닫지 않고 그대로 둡니다. 브라우저가 살아 있으면(탭만 닫힘) 다음 작업에서 탭만 새로 열고,
+        # 브라우저가 끊겼으면 ensure_browser_initialized가 마지막 스냅샷으로 브라우저와 서비스 탭을 복구합니다.
+        if browser_alive:
+            recovery = "닫힌 탭은 다음 작업 시 새로 엽니다. (로그인은 유지됩니다.)"
+        elif browser_manager.snapshots_enabled:
+            recovery = "다음 작업 시 브라우저를 다시 열고 마지막 세션으로 탭을 복구합니다."
+        else:
+            recovery = "다음 작업 시 브라우저를 다시 엽니다. (다시 로그인해야 할 수 있습니다.)"
+        notify.showerror("오류 발생", f"{error_message}\n\n{recovery}", kind=kind)
+    elif kind == SESSION_EXPIRED:
+        browser_manager.is_logged_in = False
+        notify.showwarning("로그인 만료", "로그인 세션이 만료되었습니다. 다시 로그인해주세요.", kind=kind)
+    elif kind == TRANSIENT:
+        notify.showwarning("일시적 오류", f"{error_message}\n\n네트워크가 불안정합니다. 잠시 후 다시 시도해주세요.\n(브라우저와 로그인은 유지됩니다.)", kind=kind)
+    else:
+        notify.showerror("오류 발생", error_message, kind=FATAL)
+
+
+@_browser_operation('범용 로그인')
 def _perform_universal_login(app_instance):
     """
     범용 로그인 워크플로우: 단 한 번의 로그인으로 모든 서비스의 관문 역할
@@ -112,24 +523,23 @@ def _perform_universal_login(app_instance):
         print("✓ 이미 로그인되어 있습니다. 범용 로그인을 건너뜁니다.")
         return
     
-    # 기존 페이지에서 로그인 상태 확인 (업무포털 메인 페이지에 있는지 확인)
+    # 기존 탭(포털이 띄운 팝업 포함)에서 로그인 상태 확인 - 탭 색인에서 바로 찾습니다.
     if browser_manager.browser and browser_manager.browser.is_connected() and browser_manager.context:
-        existing_pages = browser_manager.context.pages
-        for page in existing_pages:
-            try:
-                current_url = page.url
-                # 업무포털 메인 페이지나 서비스 페이지에 있으면 이미 로그인된 상태
-                if ('eduptl.kr' in current_url and 'lg00_001.do' not in current_url) or \
-                   'neis.go.kr' in current_url or 'klef.jbe.go.kr' in current_url:
-                    print("✓ 기존 세션에서 로그인된 상태를 감지했습니다.")
-                    browser_manager.is_logged_in = True
-                    return
-            except Exception:
-                continue  # 페이지 접근 불가 시 다음 페이지 확인
+        # 업무포털 메인 페이지나 서비스 페이지에 있으면 이미 로그인된 상태
+        logged_in_page = (
+            browser_manager.find_page('나이스', url_filter=lambda url: 'lg00_001.do' not in url)
+            or browser_manager.find_page('에듀파인', url_filter=lambda url: 'lg00_001.do' not in url)
+            or browser_manager.find_page('업무포털', url_filter=lambda url: 'lg00_001.do' not in url)
+        )
+        if logged_in_page is not None:
+            print(f"✓ 기존 세션에서 로그인된 상태를 감지했습니다. ({logged_in_page.url})")
+            browser_manager.is_logged_in = True
+            return
     
     try:
         print("=== 범용 로그인 워크플로우 시작 ===")
         browser_manager.ensure_browser_initialized()
+        browser_manager.attach_har('login')
         
         # 임시 로그인용 페이지 생성
         login_page = browser_manager.context.new_page()
@@ -137,33 +547,15 @@ def _perform_universal_login(app_instance):
         
         # 1단계: 업무포털 로그인 페이지로 이동
         print("1단계: 업무포털 로그인 페이지로 이동합니다...")
-        login_page.goto(urls['업무포털 로그인'])
-        login_page.wait_for_load_state("networkidle", timeout=30000)
+        resilient_goto(login_page, urls['업무포털 로그인'], '업무포털')
         
-        # 2단계: 사용자 수동 로그인 안내
+        # 2단계: 사용자 수동 로그인 안내 (모달 창 없이 상태 표시만)
         print("2단계: 사용자 수동 로그인 안내...")
-        messagebox.showinfo("통합 로그인 안내", 
-                          "모든 서비스 이용을 위한 통합 로그인이 필요합니다. 🔐\n\n"
-                          "브라우저에서 수동으로 로그인을 완료해주세요.\n"
-                          "로그인 완료 후 자동으로 감지됩니다.\n\n"
-                          "이 창에서 '확인'을 클릭하고 브라우저에서 로그인해주세요.")
+        _notify_status(app_instance, "🔐 통합 로그인이 필요합니다. 브라우저에서 로그인해주세요. (완료 시 자동 감지)")
         
-        # 3단계: 로그인 성공 감지
+        # 3단계: 로그인 성공 감지 (안내와 동시에 바로 시작)
         print("3단계: 로그인 성공을 감지합니다...")
-        try:
-            # 로그인 페이지에서 벗어나면 로그인 성공으로 판단
-            login_page.wait_for_function(
-                "() => !window.location.href.includes('bpm_lgn_lg00_001.do')", 
-                timeout=180000
-            )
-            print("✓ 로그인 성공이 감지되었습니다!")
-            
-        except TimeoutError:
-            current_url = login_page.url
-            if 'lg00_001.do' not in current_url:
-                print("✓ 로그인이 완료된 것으로 판단됩니다.")
-            else:
-                raise TimeoutError("로그인 시간이 초과되었습니다. 다시 시도해주세요.")
+        _wait_for_login_success(login_page, app_instance)
         
         # 4단계: 로그인 상태 플래그 설정
         browser_manager.is_logged_in = True
@@ -177,7 +569,8 @@ def _perform_universal_login(app_instance):
         raise
 
 
-def do_login_only():
+@_browser_operation('단순 로그인')
+def do_login_only(app_instance=None):
     """
     단순 로그인 전용 함수: 기존 브라우저에서 로그인만 수행
     업무포털 로그인 페이지로 이동하여 사용자 로그인 완료 후 메인 페이지로 이동
@@ -187,6 +580,7 @@ def do_login_only():
         
         # 브라우저가 초기화되지 않았다면 초기화
         browser_manager.ensure_browser_initialized()
+        browser_manager.attach_har('login')
         
         # 기존 페이지 중 하나를 사용하거나 새 페이지 생성
         if browser_manager.pages:
@@ -199,17 +593,11 @@ def do_login_only():
         
         # 업무포털 로그인 페이지로 이동
         print("업무포털 로그인 페이지로 이동합니다...")
-        page.goto(urls['업무포털 로그인'])
-        page.wait_for_load_state("networkidle", timeout=30000)
-        
-        # 사용자 로그인 안내
-        messagebox.showinfo("로그인 필요", 
-                          "로그인이 필요합니다. 🔐\n\n"
-                          "브라우저에서 로그인을 완료해주세요.\n\n"
-                          "이 창에서 '확인'을 클릭하고 브라우저에서 로그인해주세요.")
+        resilient_goto(page, urls['업무포털 로그인'], '업무포털')
         
-        # 로그인 성공 대기
-        _wait_for_login_success(page)
+        # 사용자 로그인 안내 (모달 창 없이 상태 표시만) 후 바로 로그인 감지
+        _notify_status(app_instance, "🔐 로그인이 필요합니다. 브라우저에서 로그인을 완료해주세요.")
+        _wait_for_login_success(page, app_instance)
         browser_manager.is_logged_in = True
         print("✓ 로그인이 완료되었습니다!")
         
@@ -220,6 +608,7 @@ def do_login_only():
         raise
 
 
+@_browser_operation('나이스 접속')
 def navigate_to_neis(app_instance):
     """
     나이스 접속 함수: 단일 스레드에서 기존 브라우저 재사용
@@ -234,6 +623,8 @@ def navigate_to_neis(app_instance):
         else:
             print("기존 브라우저를 재사용합니다...")
         
+        browser_manager.attach_har('navigate_to_neis')
+
         # 2단계: 나이스 페이지 확인/생성
         page = browser_manager.get_or_create_page('나이스')
         
@@ -246,48 +637,45 @@ def navigate_to_neis(app_instance):
             if 'neis.go.kr' in current_url:
                 print("✓ 이미 나이스 페이지에 있습니다.")
                 page.bring_to_front()
-                messagebox.showinfo("나이스 접속", "나이스 페이지가 활성화되었습니다! 🎉")
+                notify.showinfo("나이스 접속", "나이스 페이지가 활성화되었습니다! 🎉")
                 return
             
             # 로그인 페이지인지 확인
             if 'lg00_001.do' in current_url:
                 print("로그인 페이지에 있습니다. 로그인이 필요합니다.")
-                do_login_only()
+                do_login_only(app_instance)
                 # 로그인 후 업무포털 메인 페이지로 이동될 것임
             
             # 업무포털 메인 페이지나 기타 페이지에서 나이스로 이동
             if 'eduptl.kr' in current_url or current_url == 'about:blank':
                 print("업무포털에서 나이스로 이동합니다...")
-                page.goto(urls['나이스'])
-                page.wait_for_load_state("networkidle", timeout=30000)
+                resilient_goto(page, urls['나이스'], '나이스')
                 
                 # 성공 확인
                 final_url = page.url
                 if 'neis.go.kr' in final_url:
                     print("✓ 나이스에 성공적으로 접속했습니다!")
-                    messagebox.showinfo("나이스 접속 완료", 
+                    notify.showinfo("나이스 접속 완료", 
                                       "나이스에 성공적으로 접속했습니다! 🎉")
                 else:
                     print(f"나이스 접속 후 최종 URL: {final_url}")
-                    messagebox.showinfo("나이스 접속", "나이스 접속이 진행 중입니다...")
+                    notify.showinfo("나이스 접속", "나이스 접속이 진행 중입니다...")
             else:
                 # 다른 사이트에서 직접 나이스로 이동
                 print("다른 사이트에서 나이스로 이동합니다...")
-                page.goto(urls['나이스'])
-                page.wait_for_load_state("networkidle", timeout=30000)
-                messagebox.showinfo("나이스 접속 완료", "나이스에 접속했습니다! 🎉")
+                resilient_goto(page, urls['나이스'], '나이스')
+                notify.showinfo("나이스 접속 완료", "나이스에 접속했습니다! 🎉")
         
         except Exception as url_error:
             print(f"URL 확인/이동 중 오류: {url_error}")
             # 로그인이 필요할 수 있음
             try:
                 print("로그인을 시도합니다...")
-                do_login_only()
+                do_login_only(app_instance)
                 
                 # 로그인 후 나이스 이동
-                page.goto(urls['나이스'])
-                page.wait_for_load_state("networkidle", timeout=30000)
-                messagebox.showinfo("나이스 접속 완료", "로그인 후 나이스에 접속했습니다! 🎉")
+                resilient_goto(page, urls['나이스'], '나이스')
+                notify.showinfo("나이스 접속 완료", "로그인 후 나이스에 접속했습니다! 🎉")
                 
             except Exception as login_error:
                 print(f"로그인 후 이동 중 오류: {login_error}")
@@ -298,6 +686,7 @@ def navigate_to_neis(app_instance):
         _handle_error(e)
 
 
+@_browser_operation('K-에듀파인 접속')
 def navigate_to_edufine(app_instance):
     """
     K-에듀파인 접속 함수: 단일 스레드에서 기존 브라우저 재사용
@@ -312,6 +701,8 @@ def navigate_to_edufine(app_instance):
         else:
             print("기존 브라우저를 재사용합니다...")
         
+        browser_manager.attach_har('navigate_to_edufine')
+
         # 2단계: 에듀파인 페이지 확인/생성
         page = browser_manager.get_or_create_page('에듀파인')
         
@@ -324,48 +715,45 @@ def navigate_to_edufine(app_instance):
             if 'klef.jbe.go.kr' in current_url:
                 print("✓ 이미 K-에듀파인 페이지에 있습니다.")
                 page.bring_to_front()
-                messagebox.showinfo("K-에듀파인 접속", "K-에듀파인 페이지가 활성화되었습니다! 🎉")
+                notify.showinfo("K-에듀파인 접속", "K-에듀파인 페이지가 활성화되었습니다! 🎉")
                 return
             
             # 로그인 페이지인지 확인
             if 'lg00_001.do' in current_url:
                 print("로그인 페이지에 있습니다. 로그인이 필요합니다.")
-                do_login_only()
+                do_login_only(app_instance)
                 # 로그인 후 업무포털 메인 페이지로 이동될 것임
             
             # 업무포털 메인 페이지나 기타 페이지에서 에듀파인으로 이동
             if 'eduptl.kr' in current_url or current_url == 'about:blank':
                 print("업무포털에서 K-에듀파인으로 이동합니다...")
-                page.goto(urls['에듀파인'])
-                page.wait_for_load_state("networkidle", timeout=30000)
+                resilient_goto(page, urls['에듀파인'], '에듀파인')
                 
                 # 성공 확인
                 final_url = page.url
                 if 'klef.jbe.go.kr' in final_url:
                     print("✓ K-에듀파인에 성공적으로 접속했습니다!")
-                    messagebox.showinfo("K-에듀파인 접속 완료", 
+                    notify.showinfo("K-에듀파인 접속 완료", 
                                       "K-에듀파인에 성공적으로 접속했습니다! 🎉")
                 else:
                     print(f"K-에듀파인 접속 후 최종 URL: {final_url}")
-                    messagebox.showinfo("K-에듀파인 접속", "K-에듀파인 접속이 진행 중입니다...")
+                    notify.showinfo("K-에듀파인 접속", "K-에듀파인 접속이 진행 중입니다...")
             else:
                 # 다른 사이트에서 직접 에듀파인으로 이동
                 print("다른 사이트에서 K-에듀파인으로 이동합니다...")
-                page.goto(urls['에듀파인'])
-                page.wait_for_load_state("networkidle", timeout=30000)
-                messagebox.showinfo("K-에듀파인 접속 완료", "K-에듀파인에 접속했습니다! 🎉")
+                resilient_goto(page, urls['에듀파인'], '에듀파인')
+                notify.showinfo("K-에듀파인 접속 완료", "K-에듀파인에 접속했습니다! 🎉")
         
         except Exception as url_error:
             print(f"URL 확인/이동 중 오류: {url_error}")
             # 로그인이 필요할 수 있음
             try:
                 print("로그인을 시도합니다...")
-                do_login_only()
+                do_login_only(app_instance)
                 
                 # 로그인 후 에듀파인 이동
-                page.goto(urls['에듀파인'])
-                page.wait_for_load_state("networkidle", timeout=30000)
-                messagebox.showinfo("K-에듀파인 접속 완료", "로그인 후 K-에듀파인에 접속했습니다! 🎉")
+                resilient_goto(page, urls['에듀파인'], '에듀파인')
+                notify.showinfo("K-에듀파인 접속 완료", "로그인 후 K-에듀파인에 접속했습니다! 🎉")
                 
             except Exception as login_error:
                 print(f"로그인 후 이동 중 오류: {login_error}")
@@ -376,30 +764,80 @@ def navigate_to_edufine(app_instance):
         _handle_error(e)
 
 
-def _wait_for_login_success(page: Page):
+def _notify_status(app_instance, message: str):
+    """앱 화면에 모달 창 없이 진행 상태를 표시합니다. (앱이 없으면 출력만)"""
+    print(message)
+    if app_instance is not None and hasattr(app_instance, 'show_status'):
+        app_instance.show_status(message)
+
+
+def _pump_gui(app_instance):
+    """
+    GUI 스레드에서 오래 기다리는 동안 창이 멈추지 않도록 대기 중인 GUI 이벤트를 처리합니다.
+    이벤트 루프에 다시 들어가므로 반드시 app_instance.blocking_wait() 안에서 호출해야 합니다.
+    (그 동안 다른 자동화 버튼과 창 닫기가 중첩 실행되지 않음)
+    """
+    if app_instance is not None and threading.current_thread() is threading.main_thread():
+        try:
+            app_instance.update()
+        except Exception:
+            pass  # 창이 이미 닫힌 경우
+
+
+def _cookie_names(page: Page) -> set:
+    return {(cookie['domain'], cookie['name']) for cookie in page.context.cookies()}
+
+
+def _wait_for_login_success(page: Page, app_instance=None, timeout: int = 180000):
     """
     로그인 성공을 대기하는 헬퍼 함수
     로그인 페이지에서 벗어나면 로그인 성공으로 판단
+
+    안내창 확인을 기다리지 않고 바로 감지를 시작합니다.
+    - 메인 프레임 이동(framenavigated) 이벤트가 오는 즉시 반환
+    - 이동 이벤트 없이 쿠키만 바뀐 경우 현재 주소를 직접 다시 확인
+    - 기다리는 동안 GUI 이벤트를 처리하여 창이 멈추지 않게 함
     """
-    try:
-        print("로그인 성공을 감지합니다...")
-        # 로그인 페이지에서 벗어나면 로그인 성공으로 판단
-        page.wait_for_function(
-            "() => !window.location.href.includes('bpm_lgn_lg00_001.do')", 
-            timeout=180000
-        )
-        print("✓ 로그인 성공이 감지되었습니다!")
-        return True
-        
-    except TimeoutError:
-        current_url = page.url
-        if 'lg00_001.do' not in current_url:
-            print("✓ 로그인이 완료된 것으로 판단됩니다.")
-            return True
-        else:
-            raise TimeoutError("로그인 시간이 초과되었습니다. 다시 시도해주세요.")
+    print("로그인 성공을 감지합니다...")
+    start = time.perf_counter()
+    deadline = start + timeout / 1000
+    cookies = _cookie_names(page)
+
+    def left_login_page(frame):
+        return frame == page.main_frame and 'lg00_001.do' not in frame.url
+
+    # 기다리는 동안 이벤트 루프를 돌리므로 다른 버튼/창 닫기가 중첩 실행되지 않게 막습니다.
+    blocking_wait = getattr(app_instance, 'blocking_wait', None)
+    with blocking_wait() if blocking_wait else nullcontext():
+        while 'lg00_001.do' in page.url:
+            if browser_manager.is_closing:
+                raise BrowserThreadError("프로그램을 종료하는 중이라 로그인 대기를 중단했습니다.")
+            remaining_ms = (deadline - time.perf_counter()) * 1000
+            if remaining_ms <= 0:
+                _notify_status(app_instance, "⏰ 로그인 시간이 초과되었습니다.")
+                raise TimeoutError("로그인 시간이 초과되었습니다. 다시 시도해주세요.")
+            try:
+                page.wait_for_event("framenavigated", predicate=left_login_page,
+                                    timeout=min(LOGIN_EVENT_SLICE_MS, remaining_ms))
+                break
+            except TimeoutError:
+                pass
+
+            current_cookies = _cookie_names(page)
+            if current_cookies != cookies:
+                cookies = current_cookies
+                if 'lg00_001.do' not in page.evaluate("() => window.location.href"):
+                    break
+            _pump_gui(app_instance)
+
+    elapsed = time.perf_counter() - start
+    timing.record('login.user', elapsed * 1000)
+    print(f"✓ 로그인 성공이 감지되었습니다! ({elapsed:.1f}초)")
+    _notify_status(app_instance, "✅ 로그인되었습니다.")
+    return True
 
 
+@_browser_operation('업무포털 (나이스+에듀파인) 접속')
 def open_neis_and_edufine_after_login(app_instance):
     """
     업무포털 로그인 후 나이스와 에듀파인을 순차적으로 여는 핵심 함수
@@ -413,26 +851,20 @@ def open_neis_and_edufine_after_login(app_instance):
         # 1단계: 브라우저 실행 및 로그인 페이지 이동
         print("1단계: 브라우저 실행 및 업무포털 로그인 페이지로 이동합니다...")
         browser_manager.ensure_browser_initialized()
+        browser_manager.attach_har('login')
         
         # 로그인용 페이지 생성
         login_page = browser_manager.context.new_page()
         login_page.set_viewport_size({"width": 1920, "height": 1080})
-        login_page.goto(urls['업무포털 로그인'])
-        login_page.wait_for_load_state("networkidle", timeout=30000)
+        resilient_goto(login_page, urls['업무포털 로그인'], '업무포털')
         
         # 자동 로그인 버튼 클릭
         login(login_page)
         
-        # 2단계: 수동 로그인 안내 및 대기
+        # 2단계: 수동 로그인 안내 및 대기 (모달 창 없이, 안내와 동시에 감지 시작)
         print("2단계: 사용자 수동 로그인을 안내합니다...")
-        messagebox.showinfo("업무포털 로그인 안내", 
-                          "나이스와 에듀파인 접속을 위한 로그인이 필요합니다. 🔐\n\n"
-                          "브라우저에서 수동으로 로그인을 완료해주세요.\n"
-                          "로그인 완료 후 자동으로 두 사이트가 열립니다.\n\n"
-                          "이 창에서 '확인'을 클릭하고 브라우저에서 로그인해주세요.")
-        
-        # 로그인 성공 대기
-        _wait_for_login_success(login_page)
+        _notify_status(app_instance, "🔐 브라우저에서 로그인을 완료해주세요. 완료되면 나이스와 에듀파인이 바로 열립니다.")
+        _wait_for_login_success(login_page, app_instance)
         browser_manager.is_logged_in = True
         
         # 로그인용 페이지 닫기
@@ -446,9 +878,9 @@ def open_neis_and_edufine_after_login(app_instance):
         # 나이스 탭 열기
         try:
             print("나이스 탭을 여는 중...")
+            browser_manager.attach_har('navigate_to_neis')
             neis_page = browser_manager.get_or_create_page('나이스')
-            neis_page.goto(urls['나이스'])
-            neis_page.wait_for_load_state("networkidle", timeout=30000)
+            resilient_goto(neis_page, urls['나이스'], '나이스')
             results['나이스'] = "성공"
             print("✓ 나이스 탭이 성공적으로 열렸습니다!")
         except Exception as e:
@@ -458,9 +890,9 @@ def open_neis_and_edufine_after_login(app_instance):
         # 에듀파인 탭 열기
         try:
             print("에듀파인 탭을 여는 중...")
+            browser_manager.attach_har('navigate_to_edufine')
             edufine_page = browser_manager.get_or_create_page('에듀파인')
-            edufine_page.goto(urls['에듀파인'])
-            edufine_page.wait_for_load_state("networkidle", timeout=30000)
+            resilient_goto(edufine_page, urls['에듀파인'], '에듀파인')
             results['에듀파인'] = "성공"
             print("✓ 에듀파인 탭이 성공적으로 열렸습니다!")
         except Exception as e:
@@ -472,23 +904,23 @@ def open_neis_and_edufine_after_login(app_instance):
         
         if success_count == 2:
             print("✓ 나이스와 에듀파인 모두 성공적으로 접속했습니다!")
-            messagebox.showinfo("접속 완료", 
+            notify.showinfo("접속 완료", 
                               "나이스와 에듀파인에 모두 성공적으로 접속했습니다! 🎉\n\n"
                               "이제 두 사이트에서 필요한 작업을 수행하세요.\n"
                               "탭을 전환하여 각 사이트를 이용할 수 있습니다.")
         elif success_count == 1:
             failed_service = [service for service, result in results.items() if result != "성공"][0]
             print(f"일부 접속 실패: {failed_service}")
-            messagebox.showwarning("일부 접속 실패", 
+            notify.showwarning("일부 접속 실패", 
                                  f"한 사이트는 성공했지만 {failed_service} 접속에 실패했습니다.\n\n"
                                  f"오류: {results[failed_service]}\n\n"
-                                 "성공한 사이트는 정상적으로 이용 가능합니다.")
+                                 "성공한 사이트는 정상적으로 이용 가능합니다.", kind=PARTIAL)
         else:
             print("두 사이트 모두 접속에 실패했습니다.")
             error_msg = "접속 실패:\n"
             for service, result in results.items():
                 error_msg += f"- {service}: {result}\n"
-            messagebox.showerror("접속 실패", error_msg)
+            notify.showerror("접속 실패", error_msg)
         
     except Exception as e:
         print(f"업무포털 (나이스+k-에듀파인) 접속 중 오류: {e}")
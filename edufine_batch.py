@@ -0,0 +1,293 @@
+# edufine_batch.py (엑셀 기반 K-에듀파인 일괄 입력)
+
+import os
+import json
+import time
+import hashlib
+import datetime
+import pandas as pd
+from playwright.sync_api import Page, expect
+from utils import urls
+from resilience import classify_error, TRANSIENT
+from timing_profile import timing
+from rate_limiter import get_limiter
+from metrics import metrics
+
+# 양식 설정(form spec) 예시 - JSON 파일로 저장해 사용합니다.
+# {
+#     "name": "소액 품의",
+#     "form_url": "http://klef.jbe.go.kr/...",          # 입력 화면 URL (처음 한 번만 이동)
+#     "new_entry_selector": "button:has-text('신규')",   # 다음 행 입력을 위해 빈 양식을 여는 버튼
+#     "ready_selector": "input[name='title']",           # 양식이 열렸는지 확인할 요소
+#     "submit_selector": "button:has-text('저장')",
+#     "success_selector": "text=저장되었습니다",
+#     "id_column": "관리번호",                            # (선택) 행을 구분하는 엑셀 열. 없으면 입력 내용으로 구분
+#     "fields": {
+#         "제목": {"selector": "input[name='title']", "required": true},
+#         "금액": {"selector": "input[name='amount']", "type": "number", "required": true},
+#         "지출일": {"selector": "input[name='date']", "type": "date"},
+#         "구분": {"selector": "select[name='kind']", "type": "select", "options": ["물품", "용역"]}
+#     }
+# }
+FIELD_TYPES = ('text', 'number', 'date', 'select')
+
+
+def load_form_spec(path: str) -> dict:
+    """양식 설정 JSON 파일을 읽고 기본 형식을 확인합니다."""
+    with open(path, 'r', encoding='utf-8') as file:
+        spec = json.load(file)
+    for key in ('ready_selector', 'submit_selector', 'success_selector', 'fields'):
+        if key not in spec:
+            raise ValueError(f"양식 설정에 '{key}' 항목이 없습니다: {path}")
+    for column, field in spec['fields'].items():
+        if field.get('type', 'text') not in FIELD_TYPES:
+            raise ValueError(f"'{column}' 항목의 type이 올바르지 않습니다: {field.get('type')}")
+    return spec
+
+
+def load_rows(xlsx_path: str, sheet_name=0) -> list:
+    """엑셀 파일의 각 행을 {'row': 엑셀 행 번호, 'values': {열 이름: 값}} 목록으로 읽습니다."""
+    df = pd.read_excel(xlsx_path, sheet_name=sheet_name, dtype=object)
+    df = df.dropna(how='all')
+    rows = []
+    for index, record in zip(df.index, df.to_dict(orient='records')):
+        values = {column: (None if pd.isna(value) else value) for column, value in record.items()}
+        rows.append({'row': int(index) + 2, 'values': values})  # 머리글이 1행이므로 +2
+    return rows
+
+
+def _normalize(value, field: dict):
+    """엑셀 값을 입력칸에 넣을 문자열로 바꿉니다. 형식이 맞지 않으면 ValueError"""
+    kind = field.get('type', 'text')
+    if kind == 'number':
+        number = float(str(value).replace(',', ''))
+        return str(int(number)) if number.is_integer() else str(number)
+    if kind == 'date':
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            return value.strftime(field.get('format', '%Y-%m-%d'))
+        return pd.to_datetime(str(value)).strftime(field.get('format', '%Y-%m-%d'))
+    text = str(value).strip()
+    if kind == 'select' and field.get('options') and text not in field['options']:
+        raise ValueError(f"허용되지 않는 값입니다 (가능: {', '.join(field['options'])})")
+    return text
+
+
+def validate_rows(rows: list, spec: dict) -> tuple:
+    """
+    입력 전에 모든 행을 검사합니다.
+    반환값: (입력 가능한 행 목록, {엑셀 행 번호: [오류 메시지]})
+    """
+    valid, errors = [], {}
+    for row in rows:
+        row_errors, prepared = [], {}
+        for column, field in spec['fields'].items():
+            value = row['values'].get(column)
+            if value is None or str(value).strip() == '':
+                if field.get('required'):
+                    row_errors.append(f"'{column}' 값이 비어 있습니다.")
+                continue
+            try:
+                prepared[column] = _normalize(value, field)
+            except (ValueError, TypeError) as e:
+                row_errors.append(f"'{column}' 값 '{value}' 오류: {e}")
+        if row_errors:
+            errors[row['row']] = row_errors
+        else:
+            valid.append(dict(row, prepared=prepared))
+    return valid, errors
+
+
+def _content_hash(row: dict) -> str:
+    content = json.dumps(row['prepared'], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()[:12]
+
+
+def row_keys(rows: list, id_column: str = None) -> list:
+    """
+    행마다 이어받기용 키를 만듭니다. 엑셀 행 번호는 쓰지 않으므로 행을 끼워 넣거나 지워도 키가 바뀌지 않습니다.
+    - id_column이 있으면 그 열의 값으로 구분합니다.
+    - 없으면 입력 내용의 해시로 구분하고, 내용이 같은 행은 '해시#순번'으로 나눕니다.
+    엑셀에서 행 내용을 고치면(id_column이 없을 때) 다시 입력 대상이 됩니다.
+    """
+    keys, seen = [], {}
+    for row in rows:
+        if id_column and row['values'].get(id_column) not in (None, ''):
+            base = f"id:{str(row['values'][id_column]).strip()}"
+        else:
+            base = _content_hash(row)
+        keys.append(f"{base}#{seen.get(base, 0)}")
+        seen[base] = seen.get(base, 0) + 1
+    return keys
+
+
+class BatchJournal:
+    """
+    행별 처리 결과를 JSON Lines 파일에 한 줄씩 추가 기록합니다.
+    상태: done(완료), failed(저장 전 실패 → 다시 실행하면 재시도), retry,
+          unknown(저장 버튼을 누른 뒤 실패 → 저장됐는지 알 수 없으므로 다시 입력하지 않음)
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.status = {}  # {행 키: 마지막 상태}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.status[entry['key']] = entry['status']
+
+    def is_done(self, key: str) -> bool:
+        return self.status.get(key) == 'done'
+
+    def is_unknown(self, key: str) -> bool:
+        return self.status.get(key) == 'unknown'
+
+    def write(self, key: str, row_number: int, status: str, **extra):
+        self.status[key] = status
+        entry = dict(key=key, row=row_number, status=status, time=datetime.datetime.now().isoformat(), **extra)
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+class SubmitUncertainError(Exception):
+    """저장 버튼을 누른 뒤 실패하여 저장됐는지 알 수 없는 경우 (다시 저장하면 중복 입력될 수 있음)"""
+
+
+class EdufineBatchRunner:
+    """
+    검증된 행을 하나의 에듀파인 페이지에서 차례로 입력/저장합니다.
+    매 행마다 처음부터 다시 이동하지 않고, 양식이 닫혔을 때만 '신규' 버튼으로 빈 양식을 엽니다.
+    """
+    SERVICE_NAME = '에듀파인 일괄입력'
+
+    def __init__(self, manager, spec: dict, journal_path: str, max_attempts: int = 2):
+        self.manager = manager
+        self.spec = spec
+        self.journal = BatchJournal(journal_path)
+        self.max_attempts = max_attempts
+
+    def _open_form(self, page: Page):
+        """양식이 열려 있지 않으면 '신규' 버튼(없으면 form_url 이동)으로 엽니다."""
+        ready = page.locator(self.spec['ready_selector'])
+        if ready.count() and ready.first.is_visible():
+            return
+        if self.spec.get('new_entry_selector') and page.locator(self.spec['new_entry_selector']).count():
+            page.locator(self.spec['new_entry_selector']).first.click()
+        else:
+            page.goto(self.spec.get('form_url', urls['에듀파인']), wait_until='domcontentloaded')
+        with timing.measure('edufine_batch.form'):
+            expect(ready.first).to_be_visible(timeout=timing.timeout('edufine_batch.form', 15000))
+
+    def _fill_and_submit(self, page: Page, prepared: dict):
+        for column, value in prepared.items():
+            field = self.spec['fields'][column]
+            locator = page.locator(field['selector']).first
+            if field.get('type') == 'select':
+                locator.select_option(label=value)
+            else:
+                locator.fill(value)
+        # 저장은 서버에 요청을 보내므로 에듀파인 속도 제한을 거칩니다.
+        limiter = get_limiter('에듀파인')
+        limiter.acquire()
+        start = time.perf_counter()
+        page.locator(self.spec['submit_selector']).first.click()
+        # 여기부터의 실패는 서버에 저장됐을 수도 있으므로 재시도하지 않습니다.
+        try:
+            with timing.measure('edufine_batch.submit'):
+                expect(page.locator(self.spec['success_selector']).first).to_be_visible(
+                    timeout=timing.timeout('edufine_batch.submit', 30000))
+        except Exception as e:
+            limiter.observe((time.perf_counter() - start) * 1000, ok=False)
+            raise SubmitUncertainError(f"저장 버튼을 누른 뒤 완료를 확인하지 못했습니다: {e}") from e
+        limiter.observe((time.perf_counter() - start) * 1000)
+
+    def run(self, rows: list, on_progress=None) -> dict:
+        """
+        검증된 행(validate_rows의 결과)을 입력합니다. 이미 완료된 행은 건너뜁니다.
+        저장 버튼을 누른 뒤 실패한 행은 중복 입력을 막기 위해 다시 저장하지 않고 'unknown'으로 남깁니다.
+        (에듀파인에서 확인한 뒤 다시 입력하려면 journal 파일에서 그 행의 줄을 지우세요.)
+        반환값: {'done': n, 'skipped': n, 'failed': n, 'unknown': n}
+        """
+        summary = {'done': 0, 'skipped': 0, 'failed': 0, 'unknown': 0}
+        keys = row_keys(rows, self.spec.get('id_column'))
+        pending = sum(1 for key in keys if not self.journal.is_done(key) and not self.journal.is_unknown(key))
+        with self.manager.operation('에듀파인 일괄입력'), metrics.track('에듀파인 일괄입력', pending) as progress:
+            page = self.manager.get_or_create_page(self.SERVICE_NAME)
+            for index, (row, key) in enumerate(zip(rows, keys), 1):
+                if self.journal.is_done(key):
+                    summary['skipped'] += 1
+                    progress.restart_row()
+                    continue
+                if self.journal.is_unknown(key):
+                    summary['unknown'] += 1
+                    print(f"⚠ {row['row']}행은 지난 실행에서 저장 여부를 확인하지 못했습니다. 에듀파인에서 직접 확인하세요.")
+                    progress.restart_row()
+                    continue
+
+                for attempt in range(1, self.max_attempts + 1):
+                    start = time.perf_counter()
+                    try:
+                        self._open_form(page)
+                        self._fill_and_submit(page, row['prepared'])
+                    except SubmitUncertainError as e:
+                        self.journal.write(key, row['row'], 'unknown', error=str(e), attempt=attempt,
+                                           note="저장 여부 확인 필요")
+                        print(f"⚠ {row['row']}행 저장 여부를 알 수 없습니다. 에듀파인에서 직접 확인하세요: {e}")
+                        summary['unknown'] += 1
+                        metrics.counter('edufine_batch.unknown').inc()
+                        progress.step(ok=False)
+                        break
+                    except Exception as e:
+                        kind = classify_error(e, page)
+                        retry = kind == TRANSIENT and attempt < self.max_attempts
+                        self.journal.write(key, row['row'], 'retry' if retry else 'failed',
+                                           error=str(e), kind=kind, attempt=attempt)
+                        print(f"✗ {row['row']}행 입력 실패 ({kind}, {attempt}회차): {e}")
+                        if not retry:
+                            summary['failed'] += 1
+                            metrics.counter('edufine_batch.failed').inc()
+                            progress.step(ok=False)
+                            break
+                        # 실패한 양식을 버리고 처음 상태에서 다시 시도합니다.
+                        # 새로고침마저 실패하면 이 행만 실패로 남기고 다음 행으로 넘어갑니다.
+                        try:
+                            page.reload(wait_until='domcontentloaded')
+                        except Exception as reload_error:
+                            self.journal.write(key, row['row'], 'failed', error=str(reload_error),
+                                               kind=classify_error(reload_error, page), attempt=attempt)
+                            print(f"✗ {row['row']}행 재시도 전 새로고침 실패: {reload_error}")
+                            summary['failed'] += 1
+                            metrics.counter('edufine_batch.failed').inc()
+                            progress.step(ok=False)
+                            break
+                    else:
+                        elapsed_ms = (time.perf_counter() - start) * 1000
+                        self.journal.write(key, row['row'], 'done', elapsed_ms=round(elapsed_ms))
+                        summary['done'] += 1
+                        metrics.counter('edufine_batch.done').inc()
+                        progress.step()
+                        print(f"✓ {row['row']}행 입력 완료 ({elapsed_ms:.0f} ms)")
+                        break
+
+                if on_progress:
+                    on_progress(index, len(rows), summary)
+        return summary
+
+
+def run_batch(manager, xlsx_path: str, spec_path: str, sheet_name=0, on_progress=None) -> dict:
+    """
+    엑셀 파일 하나를 검증 → 입력까지 처리합니다.
+    진행 기록은 엑셀 파일 옆의 '<파일 이름>.journal.jsonl'에 남습니다.
+    반환값: {'done', 'skipped', 'failed', 'unknown', 'invalid': {엑셀 행 번호: [오류]}}
+    """
+    spec = load_form_spec(spec_path)
+    rows, invalid = validate_rows(load_rows(xlsx_path, sheet_name), spec)
+    for row_number, messages in invalid.items():
+        print(f"⚠ {row_number}행 검증 실패: {' / '.join(messages)}")
+
+    runner = EdufineBatchRunner(manager, spec, os.path.splitext(xlsx_path)[0] + '.journal.jsonl')
+    summary = runner.run(rows, on_progress)
+    summary['invalid'] = invalid
+    print(f"일괄 입력 결과: 완료 {summary['done']}, 건너뜀 {summary['skipped']}, "
+          f"실패 {summary['failed']}, 확인 필요 {summary['unknown']}, 검증 실패 {len(invalid)}")
+    return summary
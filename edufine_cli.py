@@ -0,0 +1,354 @@
+# edufine_cli.py (GUI 없이 실행하는 명령줄 진입점 - 작업 스케줄러용)
+#
+# 사용 예:
+#   python -m edufine_cli login                                  # 처음 한 번: 브라우저에서 로그인 후 세션 저장
+#   python -m edufine_cli --headless navigate neis               # 저장된 세션으로 나이스 접속 확인
+#   python -m edufine_cli fill 품의.xlsx --spec 소액품의.json
+#   python -m edufine_cli export --screen 출결 --key 번호 --menu 학적 출결관리 출결관리 출결상황 --out 출결.csv
+#   python -m edufine_cli download --batch 2025-03 --list-url http://klef.jbe.go.kr/...
+#   python -m edufine_cli --headless --window 18:00-07:00 queue 야간작업.json   # 업무 시간 이후에 차례로 실행
+#
+# 결과는 표준 출력에 JSON 한 개로 출력되고, 진행 로그는 표준 오류로 출력됩니다.
+# 종료 코드는 아래 EXIT_* 값을 따릅니다. (작업 스케줄러의 "다시 시도" 조건에 사용)
+
+import os
+import sys
+import json
+import time
+import argparse
+import configparser
+import contextlib
+from notifier import notify, ConsoleNotifier, PARTIAL
+from metrics import metrics
+
+EXIT_OK = 0
+EXIT_FAILED = 1          # 그 밖의 오류
+EXIT_USAGE = 2           # 잘못된 인자 (argparse)
+EXIT_LOGIN_REQUIRED = 3  # 저장된 세션이 없거나 만료됨 → 'login' 명령을 다시 실행
+EXIT_PARTIAL = 4         # 일부 행/파일만 실패
+EXIT_TEMPFAIL = 75       # 일시적 오류 → 잠시 후 다시 실행하면 성공할 수 있음
+
+# 서비스 이름 → (BrowserManager 페이지 이름, 접속 성공 시 URL에 포함되는 주소)
+SERVICES = {
+    'neis': ('나이스', 'neis.go.kr'),
+    'edufine': ('에듀파인', 'klef.jbe.go.kr'),
+}
+
+
+class CliError(Exception):
+    """종료 코드와 함께 명령을 중단할 때 사용하는 오류"""
+    def __init__(self, message: str, exit_code: int = EXIT_FAILED):
+        super().__init__(message)
+        self.exit_code = exit_code
+
+
+class _Partial(Exception):
+    """일부만 성공한 경우: 결과를 그대로 출력하고 EXIT_PARTIAL로 끝냅니다."""
+    def __init__(self, result: dict):
+        super().__init__("일부 항목이 실패했습니다.")
+        self.result = result
+
+
+def get_cli_settings() -> dict:
+    """config.ini의 [CLI] 섹션에서 세션 파일 경로를 읽습니다."""
+    config = configparser.ConfigParser()
+    config.read('config.ini', encoding='utf-8')
+
+    try:
+        storage_state = config['CLI']['storage_state'].strip()
+    except (KeyError, configparser.NoSectionError):
+        storage_state = os.path.join('session_state', 'cli_storage_state.json')  # 기본값
+    return {'storage_state': storage_state}
+
+
+def _exit_code_for_kind(kind: str) -> int:
+    from resilience import SESSION_EXPIRED, TRANSIENT, BROWSER_DEAD
+    if kind == SESSION_EXPIRED:
+        return EXIT_LOGIN_REQUIRED
+    if kind in (TRANSIENT, BROWSER_DEAD):
+        return EXIT_TEMPFAIL
+    return EXIT_FAILED
+
+
+def _check_notifications(console: ConsoleNotifier, result: dict = None):
+    """
+    워크플로우가 오류를 직접 처리하고 알림만 남긴 경우 그 알림으로 실패를 판단합니다.
+    일부만 성공했다는 알림(PARTIAL)이면 result에 경고를 덧붙여 EXIT_PARTIAL로 끝냅니다.
+    """
+    problems = [entry for entry in console.messages if entry['level'] != 'info']
+    if problems:
+        last = problems[-1]
+        if last['kind'] == PARTIAL and result is not None:
+            raise _Partial(dict(result, warning=f"{last['title']}: {last['message']}"))
+        raise CliError(f"{last['title']}: {last['message']}", _exit_code_for_kind(last['kind']))
+
+
+def open_service(service: str, console: ConsoleNotifier):
+    """btn_commands의 접속 워크플로우로 서비스에 들어가고, 로그인 상태를 확인한 페이지를 반환합니다."""
+    from btn_commands import browser_manager, navigate_to_neis, navigate_to_edufine
+
+    page_name, domain = SERVICES[service]
+    (navigate_to_neis if service == 'neis' else navigate_to_edufine)(None)
+    _check_notifications(console)
+
+    page = browser_manager.pages.get(page_name)
+    if page is None or page.is_closed():
+        raise CliError(f"{page_name} 페이지를 열지 못했습니다.")
+    if 'lg00_001.do' in page.url or domain not in page.url:
+        raise CliError(f"로그인이 필요합니다. (현재 주소: {page.url}) 'login' 명령으로 세션을 다시 저장하세요.",
+                       EXIT_LOGIN_REQUIRED)
+    return page
+
+
+# --- 명령 ---
+def cmd_login(args, console):
+    from btn_commands import browser_manager, do_login_only
+    if browser_manager.headless:
+        raise CliError("login 명령은 브라우저 창에서 직접 로그인해야 하므로 --headless와 함께 쓸 수 없습니다.", EXIT_USAGE)
+    page = do_login_only(None)
+    return {'url': page.url}
+
+
+def cmd_navigate(args, console):
+    from btn_commands import open_neis_and_edufine_after_login
+    if args.service == 'both':
+        open_neis_and_edufine_after_login(None)
+        result = {'services': ['neis', 'edufine']}
+        _check_notifications(console, result)
+        return result
+    page = open_service(args.service, console)
+    return {'service': args.service, 'url': page.url, 'title': page.title()}
+
+
+def cmd_fill(args, console):
+    from btn_commands import browser_manager
+    from edufine_batch import run_batch
+
+    open_service('edufine', console)
+    sheet = int(args.sheet) if str(args.sheet).isdigit() else args.sheet
+    summary = run_batch(browser_manager, args.xlsx, args.spec, sheet_name=sheet)
+    summary['invalid'] = {str(row): messages for row, messages in summary['invalid'].items()}
+    if summary['failed'] or summary['unknown'] or summary['invalid']:
+        raise _Partial(summary)
+    return summary
+
+
+def cmd_export(args, console):
+    from btn_commands import browser_manager
+    from utils import neis_go_menu
+    from neis_cache import NeisCache
+
+    page = open_service('neis', console)
+    params = json.loads(args.params) if args.params else None
+    cache = NeisCache(args.cache_dir)
+    with browser_manager.operation('CLI 나이스 내보내기'):
+        if args.menu:
+            neis_go_menu(page, *args.menu)
+        changes = cache.refresh_from_page(page, args.screen, args.key, params, args.grid)
+    df = cache.load(args.screen, params)
+    if args.out:
+        df.to_csv(args.out, index=False, encoding='utf-8-sig')  # 엑셀에서 한글이 깨지지 않도록 BOM 포함
+    return {
+        'screen': args.screen,
+        'rows': len(df),
+        'added': len(changes.added),
+        'removed': len(changes.removed),
+        'changed': len(changes.changed),
+        'unchanged': changes.unchanged,
+        'full_reload': changes.full_reload,
+        'out': args.out,
+    }
+
+
+def cmd_download(args, console):
+    from btn_commands import browser_manager
+    from resilience import resilient_goto
+    from edufine_downloader import EdufineDownloader
+
+    page = open_service('edufine', console)
+    downloader = EdufineDownloader(browser_manager, args.dest, args.max_pages)
+    with browser_manager.operation('CLI 에듀파인 다운로드'):
+        # 목록 화면의 요청이 edufine_list HAR에 들어가도록 이동하기 전에 연결합니다.
+        browser_manager.attach_har('edufine_list')
+        if args.list_url:
+            resilient_goto(page, args.list_url, '에듀파인')
+        documents = downloader.collect_documents(page, args.link_selector)
+    journal = downloader.download_all(documents, args.batch)
+
+    counts = {}
+    for entry in journal.values():
+        counts[entry['status']] = counts.get(entry['status'], 0) + 1
+    result = {'batch': args.batch, 'documents': len(documents), 'counts': counts}
+    if counts.get('failed'):
+        raise _Partial(result)
+    return result
+
+
+def cmd_queue(args, console):
+    """
+    작업 목록 JSON 파일의 명령을 차례로 실행합니다.
+    [{"args": ["fill", "품의.xlsx", "--spec", "소액품의.json"], "window": "18:00-07:00"}, ...]
+    window가 있는 작업은 그 시간대에만 시작하고, 일시적 오류는 간격을 두고 다시 시도합니다.
+    """
+    from job_scheduler import JobScheduler, parse_window
+    from resilience import classify_error, TRANSIENT, FATAL
+
+    def classify(error):
+        # 명령이 종료 코드로 바꿔 올린 오류도 일시적 오류면 다시 시도합니다.
+        if isinstance(error, CliError):
+            return TRANSIENT if error.exit_code == EXIT_TEMPFAIL else FATAL
+        return classify_error(error)
+
+    with open(args.jobs, encoding='utf-8') as f:
+        specs = json.load(f)
+    parser = build_parser()
+    scheduler = JobScheduler(max_attempts=args.max_attempts, classify=classify)
+
+    def make_job(job_args):
+        def _job():
+            # 작업마다 알림을 따로 모아 어느 작업에서 난 오류인지 구분합니다.
+            job_console = ConsoleNotifier()
+            notify.use(job_console)
+            try:
+                try:
+                    result = COMMANDS[job_args.command](job_args, job_console)
+                except _Partial as partial:
+                    return {'partial': True, **partial.result}
+                return result
+            finally:
+                notify.use(console)
+        return _job
+
+    for number, spec in enumerate(specs, 1):
+        job_args = parser.parse_args(spec['args'])
+        if job_args.command in ('login', 'queue'):
+            raise CliError(f"{number}번 작업: {job_args.command} 명령은 예약할 수 없습니다.", EXIT_USAGE)
+        window = parse_window(spec['window']) if spec.get('window') else None
+        service = '에듀파인' if job_args.command in ('fill', 'download') else '나이스'
+        scheduler.submit(f"{number}. {' '.join(spec['args'])}", make_job(job_args), window, service)
+
+    jobs = scheduler.run_until_empty()
+    result = {'jobs': [{
+        'name': job['name'],
+        'status': 'partial' if job['status'] == 'done' and (job['result'] or {}).get('partial') else job['status'],
+        'attempts': job['attempts'],
+        'result': job['result'],
+        'error': None if job['error'] is None else f"{type(job['error']).__name__}: {job['error']}",
+    } for job in jobs]}
+    if any(job['status'] != 'done' for job in result['jobs']):
+        raise _Partial(result)
+    return result
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='edufine_cli', description="업무포털 자동화 명령줄 도구 (GUI 없이 실행)")
+    parser.add_argument('--headless', action='store_true', help="브라우저 창 없이 실행")
+    parser.add_argument('--storage-state', help="불러오고 저장할 세션 파일 (기본: config.ini [CLI] storage_state)")
+    parser.add_argument('--pretty', action='store_true', help="JSON 결과를 들여쓰기하여 출력")
+    parser.add_argument('--window', help="이 시간대가 될 때까지 기다렸다가 실행 (예: 18:00-07:00)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('login', help="브라우저에서 직접 로그인하고 세션을 저장")
+
+    navigate = commands.add_parser('navigate', help="서비스 접속 (세션 확인용)")
+    navigate.add_argument('service', choices=('neis', 'edufine', 'both'))
+
+    fill = commands.add_parser('fill', help="엑셀 파일의 행을 K-에듀파인 양식에 일괄 입력")
+    fill.add_argument('xlsx')
+    fill.add_argument('--spec', required=True, help="양식 설정 JSON 파일")
+    fill.add_argument('--sheet', default=0, help="시트 이름 또는 번호 (기본: 첫 시트)")
+
+    export = commands.add_parser('export', help="나이스 화면의 그리드를 캐시에 반영하고 CSV로 내보내기")
+    export.add_argument('--screen', required=True, help="캐시에 저장할 화면 이름")
+    export.add_argument('--key', nargs='+', required=True, help="행을 구분하는 열 이름")
+    export.add_argument('--menu', nargs=4, metavar=('L1', 'L2', 'L3', 'L4'), help="먼저 이동할 나이스 메뉴")
+    export.add_argument('--params', help="조회 조건 JSON (캐시 구분용)")
+    export.add_argument('--grid', help="그리드 선택자 (기본: 화면의 첫 번째 그리드)")
+    export.add_argument('--cache-dir', help="캐시 폴더 (기본: config.ini [Cache] neis_cache_dir)")
+    export.add_argument('--out', help="CSV 파일 경로")
+
+    download = commands.add_parser('download', help="K-에듀파인 목록 화면의 첨부파일 일괄 다운로드")
+    download.add_argument('--batch', required=True, help="배치 이름 (같은 이름으로 다시 실행하면 이어받기)")
+    download.add_argument('--list-url', help="첨부파일 목록 화면 URL (없으면 현재 에듀파인 화면)")
+    download.add_argument('--link-selector', help="첨부파일 링크 선택자")
+    download.add_argument('--dest', help="저장 폴더 (기본: config.ini [Download] dest_dir)")
+    download.add_argument('--max-pages', type=int, help="동시에 사용할 페이지 수")
+
+    queue = commands.add_parser('queue', help="작업 목록 JSON의 명령을 시간대에 맞춰 차례로 실행")
+    queue.add_argument('jobs', help="작업 목록 JSON 파일")
+    queue.add_argument('--max-attempts', type=int, default=3, help="일시적 오류 시 작업당 최대 시도 횟수")
+    return parser
+
+
+COMMANDS = {
+    'login': cmd_login,
+    'navigate': cmd_navigate,
+    'fill': cmd_fill,
+    'export': cmd_export,
+    'download': cmd_download,
+    'queue': cmd_queue,
+}
+
+
+def run(args) -> tuple:
+    """명령을 실행하고 (출력할 결과 dict, 종료 코드)를 반환합니다."""
+    from btn_commands import browser_manager
+    from resilience import classify_error
+    from session_snapshot import save_storage_state
+
+    console = ConsoleNotifier()
+    notify.use(console)
+    storage_state = args.storage_state or get_cli_settings()['storage_state']
+    browser_manager.headless = args.headless
+    browser_manager.snapshots_enabled = False  # GUI의 충돌 복구 스냅샷을 건드리지 않습니다.
+    if os.path.exists(storage_state):
+        browser_manager.storage_state_path = storage_state
+
+    start = time.perf_counter()
+    output = {'command': args.command, 'ok': False}
+    exit_code = EXIT_FAILED
+    try:
+        if args.window:
+            from job_scheduler import parse_window, wait_for_window
+            wait_for_window(parse_window(args.window))
+        output['result'] = COMMANDS[args.command](args, console)
+        output['ok'] = True
+        exit_code = EXIT_OK
+    except _Partial as partial:
+        output['result'] = partial.result
+        exit_code = EXIT_PARTIAL
+    except CliError as e:
+        output['error'] = str(e)
+        exit_code = e.exit_code
+    except Exception as e:
+        output['error'] = f"{type(e).__name__}: {e}"
+        exit_code = _exit_code_for_kind(classify_error(e))
+    finally:
+        # 로그인이 유효했던 세션은 다음 실행을 위해 저장합니다.
+        if exit_code != EXIT_LOGIN_REQUIRED and browser_manager.context is not None:
+            try:
+                save_storage_state(browser_manager.context.storage_state(), storage_state)
+                output['storage_state'] = storage_state
+            except Exception as e:
+                print(f"세션 저장 실패: {e}")
+        browser_manager.set_closing_flag()
+        browser_manager.close()
+
+    output['exit_code'] = exit_code
+    output['elapsed_sec'] = round(time.perf_counter() - start, 2)
+    output['notifications'] = console.messages
+    output['counters'] = metrics.counters()
+    return output, exit_code
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    # 워크플로우의 print 로그가 JSON 결과와 섞이지 않도록 표준 오류로 돌립니다.
+    with contextlib.redirect_stdout(sys.stderr):
+        output, exit_code = run(args)
+    print(json.dumps(output, ensure_ascii=False, indent=2 if args.pretty else None, default=str))
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
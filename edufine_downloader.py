@@ -0,0 +1,204 @@
+# edufine_downloader.py (K-에듀파인 첨부/문서 일괄 다운로드)
+
+import os
+import json
+import shutil
+import hashlib
+import configparser
+from playwright.sync_api import Page
+from utils import urls
+from metrics import metrics
+
+# 목록 화면에서 첨부파일 링크를 찾는 기본 선택자 (config.ini [Download] link_selector로 변경 가능)
+DEFAULT_LINK_SELECTOR = 'a[href*="download"], a[onclick*="download"], a[onclick*="fileDown"]'
+
+INDEX_FILE = '.download_index.json'  # {sha256: 저장 경로}
+BATCH_DIR = '.batches'               # 배치별 진행 기록
+
+# 링크 URL을 직접 내려받을 때 사용하는 스크립트 (페이지를 벗어나지 않고 다운로드만 발생시킴)
+_CLICK_LINK_JS = """
+url => {
+    const a = document.createElement('a');
+    a.href = url;
+    a.download = '';
+    document.body.appendChild(a);
+    a.click();
+    a.remove();
+}
+"""
+
+
+def get_download_settings():
+    """config.ini의 [Download] 섹션에서 저장 폴더, 동시 페이지 수, 링크 선택자를 읽습니다."""
+    config = configparser.ConfigParser()
+    config.read('config.ini', encoding='utf-8')
+    section = config['Download'] if config.has_section('Download') else {}
+
+    dest_dir = section.get('dest_dir', 'downloads').strip()
+    try:
+        max_pages = max(1, int(section.get('max_pages', '3')))
+    except ValueError:
+        max_pages = 3
+    link_selector = section.get('link_selector', DEFAULT_LINK_SELECTOR).strip()
+    return dest_dir, max_pages, link_selector
+
+
+def _sha256_of(path: str) -> str:
+    """파일을 조금씩 읽어 SHA-256을 계산합니다. (큰 파일도 메모리를 많이 쓰지 않음)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _unique_path(dest_dir: str, filename: str) -> str:
+    """같은 이름의 파일이 있으면 '이름 (2).확장자' 형식으로 바꿉니다."""
+    base, ext = os.path.splitext(filename)
+    path = os.path.join(dest_dir, filename)
+    counter = 2
+    while os.path.exists(path):
+        path = os.path.join(dest_dir, f"{base} ({counter}){ext}")
+        counter += 1
+    return path
+
+
+def _load_json(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError) as e:
+        print(f"{path} 파일을 읽을 수 없습니다: {e}")
+        return {}
+
+
+def _save_json(path: str, data: dict):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+class EdufineDownloader:
+    """
+    공유 컨텍스트(BrowserManager.context)에서 여러 문서의 첨부파일을 내려받습니다.
+
+    문서(document)는 다음 키를 가진 dict입니다.
+    - id: 문서 식별자 (배치 재개 시 완료 여부 판단에 사용)
+    - url: 첨부파일 URL, 또는 selector와 함께 쓰면 문서 화면 URL
+    - selector: (선택) 문서 화면에서 클릭하면 다운로드가 시작되는 요소의 선택자
+
+    최대 max_pages개의 페이지에서 동시에 다운로드를 시작한 뒤, 각 파일을 디스크에 저장합니다.
+    내용 해시가 이미 인덱스에 있으면 중복으로 보고 새로 저장하지 않습니다.
+    """
+    def __init__(self, manager, dest_dir: str = None, max_pages: int = None):
+        default_dir, default_pages, self.link_selector = get_download_settings()
+        self.manager = manager
+        self.dest_dir = dest_dir or default_dir
+        self.max_pages = max_pages or default_pages
+        os.makedirs(os.path.join(self.dest_dir, BATCH_DIR), exist_ok=True)
+        self.index_path = os.path.join(self.dest_dir, INDEX_FILE)
+        self.index = _load_json(self.index_path)
+
+    def collect_documents(self, page: Page, link_selector: str = None) -> list:
+        """
+        에듀파인 목록 화면에서 첨부파일 링크를 모아 문서 목록으로 만듭니다.
+        HAR 기록/재생을 쓰려면 목록 화면으로 이동하기 전에 manager.attach_har('edufine_list')를 호출해야 합니다.
+        """
+        links = page.locator(link_selector or self.link_selector).evaluate_all(
+            "els => els.map((el, i) => ({id: el.href || (el.getAttribute('onclick') + '#' + i), "
+            "url: el.href, text: (el.innerText || '').trim()}))"
+        )
+        documents = []
+        for index, link in enumerate(links):
+            if link['url'] and not link['url'].startswith('javascript:'):
+                documents.append({'id': link['id'], 'url': link['url']})
+            else:
+                # onclick으로 다운로드하는 링크는 목록 화면에서 n번째 링크를 클릭합니다.
+                selector = f"{link_selector or self.link_selector} >> nth={index}"
+                documents.append({'id': link['id'], 'url': page.url, 'selector': selector})
+        print(f"목록 화면에서 첨부파일 {len(documents)}개를 찾았습니다.")
+        return documents
+
+    def _start_download(self, page: Page, document: dict):
+        """문서 하나의 다운로드를 시작하고 Download 객체를 반환합니다. (완료는 기다리지 않음)"""
+        with page.expect_download() as download_info:
+            if document.get('selector'):
+                if page.url != document['url']:
+                    page.goto(document['url'], wait_until='domcontentloaded')
+                page.locator(document['selector']).click()
+            else:
+                if page.url == 'about:blank':
+                    # 쿠키가 적용된 에듀파인 화면에서 링크를 눌러야 첨부파일을 받을 수 있습니다.
+                    page.goto(urls['에듀파인'], wait_until='domcontentloaded')
+                page.evaluate(_CLICK_LINK_JS, document['url'])
+        return download_info.value
+
+    def _store(self, download, document: dict) -> dict:
+        """다운로드가 끝나기를 기다려 저장하고, 해시로 중복을 확인합니다."""
+        part_name = hashlib.sha1(document['id'].encode('utf-8')).hexdigest()
+        tmp_path = os.path.join(self.dest_dir, BATCH_DIR, f"{part_name}.part")
+        download.save_as(tmp_path)
+        sha256 = _sha256_of(tmp_path)
+
+        existing = self.index.get(sha256)
+        if existing and os.path.exists(existing):
+            os.remove(tmp_path)
+            return {'status': 'duplicate', 'path': existing, 'sha256': sha256}
+
+        final_path = _unique_path(self.dest_dir, download.suggested_filename)
+        shutil.move(tmp_path, final_path)
+        self.index[sha256] = final_path
+        _save_json(self.index_path, self.index)
+        return {'status': 'done', 'path': final_path, 'sha256': sha256}
+
+    def download_all(self, documents: list, batch_name: str) -> dict:
+        """
+        문서 목록을 내려받습니다. 같은 batch_name으로 다시 실행하면 끝난 문서는 건너뜁니다.
+        반환값: {문서 id: {'status': 'done'|'duplicate'|'failed', ...}}
+        """
+        journal_path = os.path.join(self.dest_dir, BATCH_DIR, f"{batch_name}.json")
+        journal = _load_json(journal_path)
+        pending = [doc for doc in documents
+                   if journal.get(doc['id'], {}).get('status') not in ('done', 'duplicate')]
+        print(f"[{batch_name}] 전체 {len(documents)}개 중 {len(documents) - len(pending)}개는 이미 완료, "
+              f"{len(pending)}개를 내려받습니다.")
+
+        with self.manager.operation('에듀파인 일괄 다운로드'), \
+                metrics.track('에듀파인 일괄 다운로드', len(pending)) as progress:
+            self.manager.ensure_browser_initialized()
+            pool = [self.manager.context.new_page() for _ in range(min(self.max_pages, len(pending)))]
+            try:
+                for start in range(0, len(pending), len(pool) or 1):
+                    chunk = pending[start:start + len(pool)]
+
+                    # 1단계: 페이지마다 다운로드를 시작 (전송은 브라우저에서 동시에 진행됨)
+                    started = []
+                    for page, document in zip(pool, chunk):
+                        try:
+                            started.append((document, self._start_download(page, document)))
+                        except Exception as e:
+                            journal[document['id']] = {'status': 'failed', 'error': str(e)}
+                            progress.step(ok=False)
+                            print(f"✗ 다운로드 시작 실패 ({document['id']}): {e}")
+
+                    # 2단계: 시작된 다운로드를 차례로 저장
+                    for document, download in started:
+                        try:
+                            journal[document['id']] = self._store(download, document)
+                            progress.step()
+                            print(f"✓ {journal[document['id']]['status']}: {journal[document['id']]['path']}")
+                        except Exception as e:
+                            journal[document['id']] = {'status': 'failed', 'error': str(e)}
+                            progress.step(ok=False)
+                            print(f"✗ 다운로드 저장 실패 ({document['id']}): {e}")
+
+                    # 묶음마다 진행 기록을 저장하여 중간에 끊겨도 이어서 받을 수 있게 합니다.
+                    _save_json(journal_path, journal)
+            finally:
+                for page in pool:
+                    page.close()
+
+        return journal
@@ -0,0 +1,151 @@
+# har_replay.py (HAR 기록/재생 모드)
+
+import os
+import json
+import time
+import weakref
+import configparser
+from datetime import datetime
+from playwright.sync_api import BrowserContext
+
+# 지원하는 HAR 모드
+# - off: 기본값, 실제 네트워크 사용
+# - record: 워크플로우별로 트래픽을 HAR 파일에 기록 (컨텍스트가 닫힐 때 저장되고, finish_recording이 워크플로우별로 나눔)
+# - replay: 기록된 HAR 파일로만 응답, 네트워크 요청은 모두 차단
+HAR_MODES = ('off', 'record', 'replay')
+
+# 워크플로우 이름 → HAR 파일 이름
+HAR_WORKFLOWS = {
+    'login': 'login.har',
+    'navigate_to_neis': 'navigate_to_neis.har',
+    'navigate_to_edufine': 'navigate_to_edufine.har',
+    'neis_go_menu': 'neis_go_menu.har',
+    'edufine_list': 'edufine_list.har',
+}
+
+# 컨텍스트별로 이미 연결된 워크플로우 목록 (중복 등록 방지)
+_attached = weakref.WeakKeyDictionary()
+# 컨텍스트별로 기록을 시작한 [(시작 시각, HAR 경로)] (시작한 순서)
+_recordings = weakref.WeakKeyDictionary()
+
+
+def get_har_settings():
+    """config.ini의 [HAR] 섹션에서 모드와 저장 폴더를 읽습니다."""
+    config = configparser.ConfigParser()
+    config.read('config.ini', encoding='utf-8')
+
+    try:
+        mode = config['HAR']['mode'].strip().lower()
+    except (KeyError, configparser.NoSectionError):
+        mode = 'off'  # 기본값
+
+    try:
+        har_dir = config['HAR']['har_dir'].strip()
+    except (KeyError, configparser.NoSectionError):
+        har_dir = 'har'  # 기본값
+
+    if mode not in HAR_MODES:
+        print(f"알 수 없는 HAR 모드입니다: {mode} (off로 동작합니다)")
+        mode = 'off'
+
+    return mode, har_dir
+
+
+def get_har_path(har_dir: str, workflow: str) -> str:
+    """워크플로우에 해당하는 HAR 파일 경로를 반환합니다."""
+    if workflow not in HAR_WORKFLOWS:
+        raise ValueError(f"HAR 워크플로우가 아닙니다: {workflow}")
+    return os.path.join(har_dir, HAR_WORKFLOWS[workflow])
+
+
+def context_options(mode: str) -> dict:
+    """HAR 모드에 맞는 new_context() 옵션을 반환합니다."""
+    if mode == 'off':
+        return {}
+    # 서비스 워커를 통한 요청은 HAR 라우팅으로 가로챌 수 없으므로 차단합니다.
+    return {'service_workers': 'block'}
+
+
+def prepare_context(context: BrowserContext, mode: str):
+    """
+    컨텍스트 생성 직후 호출합니다.
+    재생 모드에서는 HAR에 없는 요청이 네트워크로 나가지 않도록 전체 차단 라우트를 먼저 등록합니다.
+    (나중에 등록된 HAR 라우트가 우선 적용되고, 없으면 이 라우트로 넘어옵니다.)
+    """
+    _attached[context] = set()
+    _recordings[context] = []
+    if mode == 'replay':
+        context.route('**/*', lambda route: route.abort('internetdisconnected'))
+        print("HAR 재생 모드: 네트워크 요청을 모두 차단합니다.")
+
+
+def attach_har(context: BrowserContext, workflow: str):
+    """
+    워크플로우 시작 시 호출하여 해당 워크플로우의 HAR 기록/재생을 연결합니다.
+    같은 컨텍스트에서 같은 워크플로우는 한 번만 연결됩니다.
+
+    반드시 워크플로우의 첫 이동(goto/클릭) 전에 호출해야 합니다.
+    기록 모드에서는 finish_recording이 '다음 워크플로우를 연결한 시각'을 기준으로 파일을 나누므로,
+    이동한 뒤에 연결하면 그 사이의 요청은 경고 없이 앞 워크플로우의 HAR에 들어가고
+    이 워크플로우의 HAR에는 재생할 응답이 빠집니다.
+    """
+    mode, har_dir = get_har_settings()
+    if mode == 'off' or context is None:
+        return
+
+    attached = _attached.setdefault(context, set())
+    if workflow in attached:
+        return
+
+    har_path = get_har_path(har_dir, workflow)
+
+    if mode == 'record':
+        os.makedirs(har_dir, exist_ok=True)
+        context.route_from_har(
+            har_path,
+            update=True,
+            update_content='embed',
+            update_mode='minimal'
+        )
+        _recordings.setdefault(context, []).append((time.time(), har_path))
+        print(f"HAR 기록 시작: {workflow} → {har_path}")
+    else:
+        if not os.path.exists(har_path):
+            print(f"재생할 HAR 파일이 없습니다: {har_path}")
+            return
+        context.route_from_har(har_path, not_found='fallback')
+        print(f"HAR 재생 연결: {workflow} ← {har_path}")
+
+    attached.add(workflow)
+
+
+def _entry_time(entry: dict) -> float:
+    """HAR 항목의 요청 시작 시각 (유닉스 시간). 읽을 수 없으면 0"""
+    try:
+        return datetime.fromisoformat(entry['startedDateTime'].replace('Z', '+00:00')).timestamp()
+    except (KeyError, ValueError, AttributeError):
+        return 0.0
+
+
+def finish_recording(context: BrowserContext):
+    """
+    기록 모드에서 컨텍스트를 닫은 뒤 호출합니다.
+    컨텍스트의 HAR 기록은 모두 닫힐 때까지 트래픽을 받으므로, 먼저 시작한 워크플로우의 파일에는
+    뒤 워크플로우의 요청도 들어 있습니다. 파일마다 다음 워크플로우가 시작되기 전의 요청만 남깁니다.
+    """
+    recordings = _recordings.pop(context, [])
+    for (started, har_path), (next_started, _) in zip(recordings, recordings[1:]):
+        try:
+            with open(har_path, 'r', encoding='utf-8') as file:
+                har = json.load(file)
+        except (OSError, ValueError) as e:
+            print(f"HAR 파일을 정리하지 못했습니다: {har_path} ({e})")
+            continue
+        entries = har['log']['entries']
+        kept = [entry for entry in entries if _entry_time(entry) < next_started]
+        if len(kept) == len(entries):
+            continue
+        har['log']['entries'] = kept
+        with open(har_path, 'w', encoding='utf-8') as file:
+            json.dump(har, file, ensure_ascii=False)
+        print(f"HAR 정리: {har_path} (뒤 워크플로우의 요청 {len(entries) - len(kept)}개 제외)")
@@ -0,0 +1,231 @@
+# input_drivers.py (스마트 붙여넣기 입력 드라이버)
+
+import time
+import configparser
+from abc import ABC, abstractmethod
+
+DRIVER_NAMES = ('pyautogui', 'playwright')
+
+
+class InputDriver(ABC):
+    """
+    스마트 붙여넣기의 키 입력을 담당하는 드라이버의 기본 클래스
+    한 행 입력 = 기존 내용 지우기 → 텍스트 입력 → Tab으로 다음 칸 이동
+    네 가지 키 동작을 모두 구현하지 않은 드라이버는 만들 때(붙여넣기 시작 전) 바로 TypeError가 납니다.
+    """
+    name = 'base'
+
+    # 각 단계 후 대기 시간(초). 드라이버마다 필요한 안정화 시간이 다릅니다.
+    delays = {
+        'select_all': 0.0,
+        'delete': 0.0,
+        'copy': 0.0,
+        'paste': 0.0,
+        'tab': 0.0,
+        'row': 0.0,
+    }
+
+    @abstractmethod
+    def select_all(self):
+        """현재 칸의 내용을 모두 선택합니다."""
+
+    @abstractmethod
+    def delete(self):
+        """선택한 내용을 지웁니다."""
+
+    @abstractmethod
+    def insert_text(self, text: str):
+        """현재 칸에 text를 입력합니다."""
+
+    @abstractmethod
+    def press_tab(self):
+        """Tab을 눌러 다음 칸으로 이동합니다."""
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def enter_row(self, text: str, tab_count: int):
+        """현재 칸의 내용을 text로 바꾸고 tab_count만큼 Tab을 눌러 다음 칸으로 이동합니다."""
+        self.select_all()
+        self.sleep(self.delays['select_all'])
+        self.delete()
+        self.sleep(self.delays['delete'])
+        self.insert_text(text)
+        self.sleep(self.delays['paste'])
+        for _ in range(tab_count):
+            self.press_tab()
+            self.sleep(self.delays['tab'])
+        self.sleep(self.delays['row'])
+
+    def skip_rows(self, row_count: int, tab_count: int):
+        """내용을 바꾸지 않고 Tab만 눌러 row_count개 행을 지나갑니다. (입력 후 안정화 대기 없음)"""
+        for _ in range(row_count * tab_count):
+            self.press_tab()
+            self.sleep(self.delays['tab'])
+
+    def close(self):
+        """드라이버가 바꾼 설정을 원래대로 돌립니다."""
+
+
+class PyAutoGuiDriver(InputDriver):
+    """
+    기존 방식: OS 수준 키 입력(pyautogui) + 클립보드 붙여넣기(pyperclip)
+    어떤 창이든 포커스된 곳에 입력하지만, 창 전환/클립보드 처리를 위한 대기가 필요합니다.
+    """
+    name = 'pyautogui'
+    delays = {
+        'select_all': 0.1,
+        'delete': 0.1,
+        'copy': 0.1,
+        'paste': 0.2,
+        'tab': 0.1,
+        'row': 0.5,
+    }
+
+    def __init__(self, pause: float = 0.0):
+        # 화면이 없는 환경에서도 이 모듈을 불러올 수 있도록 필요할 때만 불러옵니다.
+        import pyautogui
+        import pyperclip
+        self._pyautogui = pyautogui
+        self._pyperclip = pyperclip
+        # pyautogui는 모든 호출 뒤에 PAUSE(기본 0.1초)만큼 추가로 쉬므로,
+        # 명시적인 대기(delays)와 중복되지 않도록 드라이버 사용 중에는 줄여 둡니다.
+        self._saved_pause = pyautogui.PAUSE
+        pyautogui.PAUSE = pause
+
+    def select_all(self):
+        self._pyautogui.hotkey('ctrl', 'a')
+
+    def delete(self):
+        self._pyautogui.press('delete')
+
+    def insert_text(self, text: str):
+        self._pyperclip.copy(text)
+        self.sleep(self.delays['copy'])
+        self._pyautogui.hotkey('ctrl', 'v')
+
+    def press_tab(self):
+        self._pyautogui.press('tab')
+
+    def skip_rows(self, row_count: int, tab_count: int):
+        # 입력이 없으므로 나이스가 처리할 것이 적어 짧은 간격으로 연달아 누릅니다.
+        self._pyautogui.press('tab', presses=row_count * tab_count, interval=0.02)
+
+    def close(self):
+        self._pyautogui.PAUSE = self._saved_pause
+
+
+class PlaywrightDriver(InputDriver):
+    """
+    Playwright 키보드로 나이스 페이지에 직접 입력합니다.
+    keyboard.insert_text는 현재 포커스된 프레임의 입력칸에 바로 들어가므로 클립보드를 거치지 않습니다.
+
+    Playwright 동기 API는 브라우저 소유 스레드에서만 호출할 수 있으므로,
+    다른 스레드에서 사용할 때는 dispatch(소유 스레드에서 함수를 실행하는 함수)를 넘겨야 합니다.
+    """
+    name = 'playwright'
+    delays = {
+        'select_all': 0.0,
+        'delete': 0.0,
+        'copy': 0.0,
+        'paste': 0.05,
+        'tab': 0.0,
+        'row': 0.1,
+    }
+
+    def __init__(self, page, dispatch=None):
+        self.page = page
+        self._dispatch = dispatch or (lambda func: func())
+
+    def select_all(self):
+        self._dispatch(lambda: self.page.keyboard.press('Control+A'))
+
+    def delete(self):
+        self._dispatch(lambda: self.page.keyboard.press('Delete'))
+
+    def insert_text(self, text: str):
+        self._dispatch(lambda: self.page.keyboard.insert_text(text))
+
+    def press_tab(self):
+        self._dispatch(lambda: self.page.keyboard.press('Tab'))
+
+    def enter_row(self, text: str, tab_count: int):
+        # 소유 스레드 왕복을 행마다 한 번으로 줄이기 위해 한 행의 키 입력을 묶어서 보냅니다.
+        def _enter():
+            keyboard = self.page.keyboard
+            keyboard.press('Control+A')
+            keyboard.press('Delete')
+            keyboard.insert_text(text)
+            for _ in range(tab_count):
+                keyboard.press('Tab')
+        self._dispatch(_enter)
+        self.sleep(self.delays['paste'] + self.delays['row'])
+
+    def skip_rows(self, row_count: int, tab_count: int):
+        def _skip():
+            for _ in range(row_count * tab_count):
+                self.page.keyboard.press('Tab')
+        self._dispatch(_skip)
+
+
+class RecordingDriver(InputDriver):
+    """
+    실제 입력 없이 호출만 기록하는 가짜 드라이버 (테스트/벤치마크용)
+    call_latency로 드라이버 호출 한 번당 지연(예: pyautogui.PAUSE)을 흉내낼 수 있습니다.
+    """
+    name = 'recording'
+
+    def __init__(self, call_latency: float = 0.0, delays: dict = None):
+        self.call_latency = call_latency
+        self.delays = dict(InputDriver.delays, **(delays or {}))
+        self.events = []  # [(시각, 동작, 인자)]
+
+    def _record(self, action: str, arg=None):
+        self.events.append((time.perf_counter(), action, arg))
+        self.sleep(self.call_latency)
+
+    def select_all(self):
+        self._record('select_all')
+
+    def delete(self):
+        self._record('delete')
+
+    def insert_text(self, text: str):
+        self._record('insert_text', text)
+
+    def press_tab(self):
+        self._record('tab')
+
+    @property
+    def texts(self) -> list:
+        """입력된 텍스트 목록"""
+        return [arg for _, action, arg in self.events if action == 'insert_text']
+
+
+def get_driver_name():
+    """config.ini의 [Paste] 섹션에서 사용할 입력 드라이버 이름을 읽습니다."""
+    config = configparser.ConfigParser()
+    config.read('config.ini', encoding='utf-8')
+
+    try:
+        name = config['Paste']['input_driver'].strip().lower()
+    except (KeyError, configparser.NoSectionError):
+        name = 'pyautogui'  # 기본값
+
+    if name not in DRIVER_NAMES:
+        print(f"알 수 없는 입력 드라이버입니다: {name} (pyautogui로 동작합니다)")
+        name = 'pyautogui'
+    return name
+
+
+def create_input_driver(name: str, page=None, dispatch=None) -> InputDriver:
+    """
+    이름에 맞는 입력 드라이버를 만듭니다.
+    playwright 드라이버를 쓸 나이스 페이지가 없으면 pyautogui 드라이버로 대신합니다.
+    """
+    if name == 'playwright':
+        if page is not None and not page.is_closed():
+            return PlaywrightDriver(page, dispatch)
+        print("나이스 페이지가 없어 pyautogui 입력 드라이버를 사용합니다.")
+    return PyAutoGuiDriver()
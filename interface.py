@@ -4,13 +4,35 @@ import customtkinter
 import threading
 import datetime
 import time
-import pyautogui
 import pyperclip
 import webbrowser
+from contextlib import contextmanager
 from tkinter import messagebox
 from btn_commands import (
     navigate_to_neis, navigate_to_edufine, open_neis_and_edufine_after_login, browser_manager
 )
+from input_drivers import create_input_driver, get_driver_name
+from paste_diff import is_diff_enabled, read_column_values, plan_rows, group_plan, normalize
+from roster_index import RosterIndex, parse_keyed_records, number_key
+from paste_trigger import get_trigger_settings, is_cell_focused, GlobalHotkey
+from ui_watchdog import UiWatchdog
+from memory_governor import MemoryGovernor
+from metrics import metrics, format_duration
+from rate_limiter import set_interactive_thread
+
+# 나이스 입력칸 포커스를 확인하는 간격 (초)와, 시작으로 보기 위해 연속으로 확인되어야 하는 횟수
+# (클릭이 끝나기 전에 입력을 시작하지 않도록 포커스가 잠시 유지되는지 봅니다.)
+FOCUS_POLL_INTERVAL = 0.2
+FOCUS_STABLE_POLLS = 2
+
+# 번호/이름으로 입력할 때 학생 사이의 안정화 대기 (초)
+KEYED_ROW_DELAY = 0.1
+
+# 처리 속도/남은 시간 패널을 새로 그리는 간격 (ms)
+THROUGHPUT_REFRESH_MS = 500
+
+# 트레이스 링 버퍼의 조각 길이를 확인하는 간격 (ms)
+TRACE_ROTATE_MS = 15000
 
 # --- UI 기본 설정 ---
 customtkinter.set_appearance_mode("System")  # PC의 다크/라이트 모드를 따라감
@@ -20,6 +42,8 @@ customtkinter.set_default_color_theme("blue")  # 파란색 테마
 class App(customtkinter.CTk):
     def __init__(self):
         super().__init__()
+        # GUI 스레드의 브라우저 작업은 속도 제한 때문에 잠들지 않게 합니다. (일괄 작업 스레드/CLI만 기다림)
+        set_interactive_thread(threading.current_thread())
 
         # --- INPUT_MODES 딕셔너리 (Tab 키 횟수 설정) ---
         self.INPUT_MODES = {
@@ -35,6 +59,10 @@ class App(customtkinter.CTk):
         # --- 자동화 상태 변수 ---
         self.stop_automation = False
         self.automation_running = False
+        self.current_operation = None  # UI 멈춤 기록에 남길 현재 작업 이름
+        self.blocking_wait_depth = 0  # 이벤트 루프를 돌리며 기다리는 작업(로그인 대기)의 중첩 수
+        self.close_requested = False  # 그 대기 중에 창 닫기를 눌렀는지 여부
+        self.automation_buttons = []
 
         # --- 폰트 설정 (가독성 개선) ---
         self.font_title = customtkinter.CTkFont(family="맑은 고딕", size=24, weight="bold")
@@ -67,6 +95,29 @@ class App(customtkinter.CTk):
         self.create_right_frame()   # 오른쪽 프레임 (로그)
         self.create_footer_frame()  # 푸터 프레임 (제작자 정보)
         
+        # --- UI 응답성 감시 시작 ---
+        self.watchdog = UiWatchdog(
+            self,
+            get_operation=lambda: ', '.join(browser_manager.active_operations) or self.current_operation,
+            on_stall=self.on_ui_stall
+        )
+        self.watchdog.start()
+        self.update_lag_indicator()
+        self.update_throughput_panel()
+
+        # --- 서비스 탭 메모리 감시 시작 (붙여넣기 중에는 탭을 새로 열지 않음) ---
+        self.memory_governor = MemoryGovernor(
+            self,
+            browser_manager,
+            is_busy=lambda: self.automation_running,
+            on_recycle=lambda service, sample: self.add_log(
+                f"♻ 메모리 사용량이 많아 {service} 탭을 새로 열었습니다. (힙 {sample['heap_mb']}MB)")
+        )
+        self.memory_governor.start()
+
+        # --- 트레이스 링 버퍼 조각 나누기 (작업이 없을 때도 오래된 기록이 쌓이지 않도록) ---
+        self.after(TRACE_ROTATE_MS, self.rotate_trace)
+
         # --- 초기 로그 메시지 추가 ---
         self.add_log("프로그램이 준비되었습니다.")
 
@@ -96,6 +147,17 @@ class App(customtkinter.CTk):
         # 자동화 작업 버튼들
         self.create_automation_buttons()
 
+        # 진행 상태 라벨 (로그인 안내 등을 모달 창 없이 표시)
+        self.status_label = customtkinter.CTkLabel(
+            self.left_frame,
+            text="",
+            font=self.font_subtitle,
+            text_color="#1976d2",
+            wraplength=260,
+            justify="left"
+        )
+        self.status_label.pack(pady=(10, 10), padx=20, fill="x")
+
     def create_middle_frame(self):
         self.middle_frame = customtkinter.CTkFrame(self, corner_radius=10)
         self.middle_frame.grid(row=0, column=1, padx=5, pady=10, sticky="nsew")
@@ -128,7 +190,7 @@ class App(customtkinter.CTk):
             "1. 엑셀/한글에서 입력할 내용을 모두 복사 (Ctrl+C)",
             "2. 아래에서 '입력 항목'을 선택하세요",
             "3. '자동 입력 시작' 버튼을 클릭하세요",
-            "4. 5초 안에 나이스 화면으로 돌아가 입력칸을 클릭하세요"
+            "4. 나이스 화면의 첫 입력칸을 클릭하면 바로 시작됩니다"
         ]
 
         # 5. for 루프를 사용하여 각 단계를 라벨로 생성 및 배치
@@ -195,7 +257,30 @@ class App(customtkinter.CTk):
             text="준비됨",
             font=self.font_subtitle
         )
-        self.paste_status_label.pack(pady=(0, 15))
+        self.paste_status_label.pack(pady=(0, 10))
+
+        # 처리 속도/남은 시간 패널 (붙여넣기 등 대량 작업 중에 metrics에서 0.5초마다 갱신)
+        throughput_frame = customtkinter.CTkFrame(self.middle_frame, corner_radius=8)
+        throughput_frame.pack(fill="x", padx=15, pady=(0, 15))
+
+        self.throughput_title = customtkinter.CTkLabel(
+            throughput_frame,
+            text="처리 현황: 대기 중",
+            font=self.font_small_button
+        )
+        self.throughput_title.pack(anchor="w", padx=10, pady=(8, 2))
+
+        self.throughput_progress = customtkinter.CTkProgressBar(throughput_frame)
+        self.throughput_progress.pack(fill="x", padx=10, pady=2)
+        self.throughput_progress.set(0)
+
+        self.throughput_label = customtkinter.CTkLabel(
+            throughput_frame,
+            text="속도 - · 남은 시간 - · 최근 행 -",
+            font=self.font_subtitle,
+            justify="left"
+        )
+        self.throughput_label.pack(anchor="w", padx=10, pady=(2, 8))
 
     def create_right_frame(self):
         """오른쪽 프레임 (로그)을 생성"""
@@ -209,7 +294,16 @@ class App(customtkinter.CTk):
             font=self.font_log_title,
             text_color="#1f538d"
         )
-        self.log_title.pack(pady=(15, 10), padx=10)
+        self.log_title.pack(pady=(15, 0), padx=10)
+
+        # UI 응답성 표시 (이벤트 루프 지연)
+        self.lag_label = customtkinter.CTkLabel(
+            self.right_frame,
+            text="UI 지연 -",
+            font=self.font_footer,
+            text_color="#666666"
+        )
+        self.lag_label.pack(pady=(0, 5), padx=10)
 
         # 로그 출력 텍스트 박스
         self.log_textbox = customtkinter.CTkTextbox(
@@ -231,7 +325,19 @@ class App(customtkinter.CTk):
             height=35,
             corner_radius=8
         )
-        self.clear_log_button.pack(pady=(0, 15))
+        self.clear_log_button.pack(side="left", expand=True, padx=(15, 5), pady=(0, 15))
+
+        # UI 응답성 통계 버튼
+        self.lag_stats_button = customtkinter.CTkButton(
+            self.right_frame,
+            text="응답성 통계",
+            command=self.show_lag_histogram,
+            font=self.font_small_button,
+            width=120,
+            height=35,
+            corner_radius=8
+        )
+        self.lag_stats_button.pack(side="right", expand=True, padx=(5, 15), pady=(0, 15))
 
     def create_footer_frame(self):
         """푸터 프레임 (제작자 정보)를 생성"""
@@ -280,10 +386,42 @@ class App(customtkinter.CTk):
                 corner_radius=10
             )
             button.pack(pady=6, padx=20, fill="x")
+            self.automation_buttons.append(button)
+
+    @contextmanager
+    def blocking_wait(self):
+        """
+        GUI 스레드에서 이벤트 루프를 돌리며 오래 기다리는 동안(로그인 대기) 사용합니다.
+        자동화 버튼을 막아 중첩 실행을 방지하고, 그 사이에 창을 닫으면 대기가 끝난 뒤 종료합니다.
+        """
+        self.blocking_wait_depth += 1
+        if self.blocking_wait_depth == 1:
+            for button in self.automation_buttons + [self.start_paste_button]:
+                button.configure(state="disabled")
+        try:
+            yield
+        finally:
+            self.blocking_wait_depth -= 1
+            if self.blocking_wait_depth == 0:
+                for button in self.automation_buttons:
+                    button.configure(state="normal")
+                if not self.automation_running:
+                    self.start_paste_button.configure(state="normal")
+                if self.close_requested:
+                    self.after(0, self.on_closing)
+
+    def is_blocked(self) -> bool:
+        """다른 작업이 이벤트 루프를 돌리며 기다리는 중이면 로그를 남기고 True"""
+        if self.blocking_wait_depth:
+            self.add_log("로그인 대기 중에는 다른 작업을 시작할 수 없습니다.")
+            return True
+        return False
 
     # --- 스마트 붙여넣기 관련 메소드들 ---
     def start_paste_automation(self):
         """자동 붙여넣기를 시작합니다."""
+        if self.is_blocked():
+            return
         # 클립보드에서 직접 텍스트 읽기
         content = pyperclip.paste().strip()
         if not content:
@@ -296,6 +434,7 @@ class App(customtkinter.CTk):
             return
 
         # 버튼 상태 변경
+        self.current_operation = "스마트 붙여넣기"
         self.start_paste_button.configure(state="disabled")
         self.stop_paste_button.configure(state="normal")
         self.automation_running = True
@@ -307,11 +446,19 @@ class App(customtkinter.CTk):
         # 데이터 준비
         data_list = [line.strip() for line in content.split('\n') if line.strip()]
         tab_count = self.INPUT_MODES[selected_mode]
+
+        # 입력 드라이버 준비 (config.ini의 [Paste] input_driver)
+        driver = create_input_driver(
+            get_driver_name(),
+            page=browser_manager.pages.get('나이스'),
+            dispatch=self.call_in_gui_thread
+        )
+        self.add_log(f"입력 드라이버: {driver.name}")
         
         # 별도 스레드에서 자동화 실행
         thread = threading.Thread(
             target=self.run_paste_thread, 
-            args=(data_list, tab_count), 
+            args=(data_list, tab_count, driver), 
             daemon=True
         )
         thread.start()
@@ -322,59 +469,37 @@ class App(customtkinter.CTk):
         self.update_paste_status("중지 중...")
         self.add_log("스마트 붙여넣기 중지 요청")
 
-    def run_paste_thread(self, data_list, tab_count):
+    def run_paste_thread(self, data_list, tab_count, driver):
         """실제 자동화 로직을 실행합니다."""
         try:
             total_items = len(data_list)
             self.add_log(f"총 {total_items}개 항목의 스마트 붙여넣기를 시작합니다.")
             
-            # 5초 카운트다운 (나이스로 이동할 시간 제공)
-            for i in range(5, 0, -1):
-                if self.stop_automation:
-                    return
-                self.update_paste_status(f"나이스 화면으로 이동하세요! {i}초 후 시작...")
-                time.sleep(1)
-            
-            if self.stop_automation:
+            # 나이스 입력칸을 클릭하거나 단축키를 누르면 바로 시작 (확인할 수 없으면 카운트다운)
+            if not self.wait_for_paste_start():
+                # 시작 전에 중지해도 처리 현황에 지난 작업의 '완료'가 남지 않도록 중지된 작업으로 기록합니다.
+                with metrics.track("스마트 붙여넣기", total_items) as progress:
+                    progress.stop()
+                self.update_paste_status("중지됨")
+                self.add_log("스마트 붙여넣기가 시작 전에 중지되었습니다.")
                 return
             
             self.update_paste_status("자동 붙여넣기 진행 중...")
-            
-            # 각 항목을 순서대로 처리
-            for idx, data in enumerate(data_list, 1):
-                if self.stop_automation:
-                    break
-                
-                self.update_paste_status(f"진행 중... ({idx}/{total_items})")
-                
-                # 기존 내용 모두 선택 후 삭제 (안정성 향상)
-                pyautogui.hotkey('ctrl', 'a')
-                time.sleep(0.1)
-                pyautogui.press('delete')
-                time.sleep(0.1)
-                
-                # 클립보드에 텍스트 복사
-                pyperclip.copy(data)
-                time.sleep(0.1)
-                
-                # Ctrl+V로 붙여넣기
-                pyautogui.hotkey('ctrl', 'v')
-                time.sleep(0.2)
-                
-                # 지정된 횟수만큼 Tab 키 누르기
-                for _ in range(tab_count):
-                    pyautogui.press('tab')
-                    time.sleep(0.1)
-                
-                # 다음 입력을 위한 대기
-                time.sleep(0.5)
-                
-                # 로그 출력
-                self.add_log(f"[{idx}/{total_items}] 처리 완료: {data[:30]}{'...' if len(data) > 30 else ''}")
+
+            # 첫 열이 화면 명렬의 번호/이름이면 학생 행으로 바로 이동해 입력하고, 아니면 순서대로 입력합니다.
+            keyed_records = parse_keyed_records(data_list)
+            index = self.build_roster_index(keyed_records) if keyed_records is not None else None
+            if index is not None:
+                self.add_log("번호/이름이 있는 내용입니다. 명렬에서 학생을 찾아 브라우저로 바로 입력합니다. (입력 방식 설정과 무관)")
+                entered, skipped, missing = self.run_keyed_paste(index, keyed_records)
+                summary = f"입력 {entered}개, 건너뜀 {skipped}개, 찾지 못함 {missing}개"
+            else:
+                entered, skipped = self.run_positional_paste(data_list, tab_count, driver)
+                summary = f"입력 {entered}개, 건너뜀 {skipped}개"
             
             if not self.stop_automation:
-                self.update_paste_status("모든 입력이 완료되었습니다!")
-                self.add_log("스마트 붙여넣기가 모두 완료되었습니다.")
+                self.update_paste_status(f"모든 입력이 완료되었습니다! ({summary})")
+                self.add_log(f"스마트 붙여넣기가 모두 완료되었습니다. ({summary})")
                 self.after(3000, lambda: self.update_paste_status("준비됨 - 다음 작업을 위해 새로운 내용을 복사하세요"))
             else:
                 self.update_paste_status("중지됨")
@@ -384,11 +509,187 @@ class App(customtkinter.CTk):
             error_msg = f"스마트 붙여넣기 중 오류 발생: {str(e)}"
             self.update_paste_status("오류 발생")
             self.add_log(error_msg)
+            # 트레이스는 브라우저 소유 스레드에서만 저장할 수 있습니다.
+            try:
+                trace_path = self.call_in_gui_thread(lambda: browser_manager.dump_trace(error_msg), timeout=30)
+            except Exception as dump_error:
+                trace_path = None
+                print(f"트레이스 저장 실패: {dump_error}")
+            if trace_path:
+                self.add_log(f"오류 기록을 저장했습니다: {trace_path}")
+                error_msg += f"\n\n오류 기록: {trace_path}"
             self.after(0, lambda: messagebox.showerror("오류", error_msg))
         finally:
+            driver.close()
             # 버튼 상태 복원
             self.after(0, self.reset_paste_buttons)
 
+    def wait_for_paste_start(self):
+        """
+        나이스 페이지가 맨 앞에 있고 입력칸에 포커스가 가면, 또는 시작 단축키를 누르면 바로 돌아옵니다.
+        포커스를 확인할 나이스 페이지가 없거나, focus_timeout초 동안 입력칸 포커스를 찾지 못하거나,
+        [Paste] start_mode = countdown이면 카운트다운 후 돌아옵니다.
+        반환값: 시작하면 True, 그 사이에 중지되면 False
+        """
+        settings = get_trigger_settings()
+        pressed = threading.Event()
+        hotkey = GlobalHotkey(settings['start_hotkey'], pressed.set)
+        hint = f" ({settings['start_hotkey']}: 바로 시작)" if hotkey.start() else ""
+        page = browser_manager.pages.get('나이스')
+
+        def start_by_hotkey():
+            self.add_log("단축키로 붙여넣기를 시작합니다. (단축키를 떼면 입력합니다)")
+            hotkey.wait_released()
+            return not self.stop_automation
+
+        try:
+            if settings['start_mode'] == 'focus' and page is not None:
+                self.update_paste_status(f"나이스 입력칸을 클릭하면 시작합니다...{hint}")
+                stable = 0
+                deadline = time.monotonic() + settings['focus_timeout']
+                while not self.stop_automation:
+                    if pressed.is_set():
+                        return start_by_hotkey()
+                    if time.monotonic() >= deadline:
+                        self.add_log(f"{settings['focus_timeout']}초 동안 나이스 입력칸 포커스를 확인하지 못해 카운트다운으로 시작합니다.")
+                        break
+                    try:
+                        focused = self.call_in_gui_thread(lambda: is_cell_focused(page), timeout=5)
+                    except Exception as e:
+                        self.add_log(f"나이스 입력칸 포커스를 확인할 수 없어 카운트다운으로 시작합니다: {e}")
+                        break
+                    stable = stable + 1 if focused else 0
+                    if stable >= FOCUS_STABLE_POLLS:
+                        self.add_log("나이스 입력칸 포커스를 확인했습니다. 붙여넣기를 시작합니다.")
+                        return True
+                    pressed.wait(FOCUS_POLL_INTERVAL)
+                if self.stop_automation:
+                    return False
+
+            for i in range(settings['countdown'], 0, -1):
+                if self.stop_automation:
+                    return False
+                if pressed.is_set():
+                    return start_by_hotkey()
+                self.update_paste_status(f"나이스 화면으로 이동하세요! {i}초 후 시작...{hint}")
+                pressed.wait(1)
+            return not self.stop_automation
+        finally:
+            hotkey.stop()
+
+    def run_positional_paste(self, data_list, tab_count, driver):
+        """
+        i번째 줄을 i번째 행에 입력합니다. (포커스된 칸부터 Tab으로 이동)
+        반환값: (입력한 행 수, 같은 내용이라 건너뛴 행 수)
+        """
+        total_items = len(data_list)
+        entered_counter = metrics.counter('paste.rows_entered')
+        skipped_counter = metrics.counter('paste.rows_skipped')
+
+        # 나이스 화면의 현재 값을 한 번에 읽어 이미 같은 내용인 행은 건너뜁니다.
+        current_values = None
+        if is_diff_enabled():
+            page = browser_manager.pages.get('나이스')
+            try:
+                current_values = self.call_in_gui_thread(lambda: read_column_values(page), timeout=10)
+            except Exception as e:
+                print(f"현재 값 읽기 실패: {e}")
+            if current_values is None:
+                self.add_log("나이스 화면의 현재 값을 읽을 수 없어 모든 행을 입력합니다.")
+        plan = plan_rows(data_list, current_values)
+        skipped = sum(1 for _, _, changed in plan if not changed)
+        if current_values is not None:
+            self.add_log(f"현재 값과 비교: 입력 {total_items - skipped}개, 같은 내용이라 건너뜀 {skipped}개")
+
+        # 각 항목을 순서대로 처리 (건너뛸 행은 연속된 것끼리 묶어 Tab만 누름)
+        entered = 0
+        with metrics.track("스마트 붙여넣기", total_items - skipped) as progress:
+            for kind, rows in group_plan(plan):
+                if self.stop_automation:
+                    progress.stop()
+                    break
+
+                if kind == 'skip':
+                    driver.skip_rows(len(rows), tab_count)
+                    skipped_counter.inc(len(rows))
+                    progress.restart_row()  # 건너뛴 시간은 행 지연에 넣지 않습니다.
+                    continue
+
+                idx, data, _ = rows[0]
+                self.update_paste_status(f"진행 중... ({idx}/{total_items})")
+
+                # 기존 내용 삭제 → 입력 → 지정된 횟수만큼 Tab (드라이버별 대기 포함)
+                driver.enter_row(data, tab_count)
+                entered += 1
+                entered_counter.inc()
+                progress.step()
+
+                # 로그 출력
+                self.add_log(f"[{idx}/{total_items}] 처리 완료: {data[:30]}{'...' if len(data) > 30 else ''}")
+        return entered, skipped
+
+    def build_roster_index(self, records):
+        """
+        첫 열 값이 나이스 화면 명렬의 번호/이름과 맞으면 명렬 색인을, 아니면 None(순서대로 입력)을 반환합니다.
+        첫 열이 모두 번호인데 화면을 찾지 못하면 순서대로 입력할 수 없으므로 오류를 냅니다.
+        """
+        keys = [key for key, _ in records]
+        page = browser_manager.pages.get('나이스')
+        index = self.call_in_gui_thread(lambda: RosterIndex.build(page), timeout=10)
+        if index is None:
+            if all(number_key(key) is not None for key in keys):
+                raise RuntimeError("번호/이름으로 입력하려면 프로그램에서 연 나이스 화면에서 첫 학생의 입력칸을 클릭해 두어야 합니다.")
+            return None
+        if not index.recognizes(keys):
+            self.add_log("첫 열이 화면의 번호/이름과 맞지 않아 순서대로 입력합니다.")
+            return None
+        return index
+
+    def run_keyed_paste(self, index, records):
+        """
+        '번호(또는 이름)<Tab>내용' 목록을 명렬 색인으로 학생 행에 바로 입력합니다.
+        줄 순서나 빠진 학생과 관계없이 적힌 학생만 입력하므로, 걸리는 시간이 입력할 학생 수에 비례합니다.
+        학생 칸으로 포커스를 옮겨야 하므로 입력 방식(input_driver) 설정과 관계없이 브라우저로 입력합니다.
+        반환값: (입력한 수, 같은 내용이라 건너뛴 수, 화면에서 찾지 못한 수)
+        """
+        todo, skipped, missing = [], 0, 0
+        for key, text in records:
+            try:
+                entry = index.lookup(key)
+            except (KeyError, ValueError) as e:
+                self.add_log(f"⚠ {e.args[0]}")
+                missing += 1
+                continue
+            if is_diff_enabled() and normalize(entry['value']) == normalize(text):
+                skipped += 1
+                continue
+            todo.append((key, entry, text))
+        self.add_log(f"명렬 {len(index.entries)}명 중 입력 {len(todo)}명, 같은 내용이라 건너뜀 {skipped}명")
+
+        def fill(entry, text):
+            if not index.is_current():
+                raise RuntimeError("나이스 화면이 바뀌어 입력을 중단했습니다. 다시 시작해주세요.")
+            index.fill(entry, text)
+
+        metrics.counter('paste.rows_skipped').inc(skipped)
+        entered_counter = metrics.counter('paste.rows_entered')
+        entered = 0
+        with metrics.track("스마트 붙여넣기 (번호/이름)", len(todo)) as progress:
+            for number, (key, entry, text) in enumerate(todo, 1):
+                if self.stop_automation:
+                    progress.stop()
+                    break
+                self.update_paste_status(f"진행 중... ({number}/{len(todo)})")
+                self.call_in_gui_thread(lambda entry=entry, text=text: fill(entry, text), timeout=30)
+                entered += 1
+                entered_counter.inc()
+                progress.step()
+                self.add_log(f"[{key}] 처리 완료: {text[:30]}{'...' if len(text) > 30 else ''}")
+                time.sleep(KEYED_ROW_DELAY)
+        if entered:
+            self.call_in_gui_thread(index.commit, timeout=10)
+        return entered, skipped, missing
+
     def update_paste_status(self, message):
         """붙여넣기 상태 라벨을 업데이트합니다."""
         # 상태에 따른 아이콘과 색상 설정
@@ -421,6 +722,93 @@ class App(customtkinter.CTk):
         self.start_paste_button.configure(state="normal")
         self.stop_paste_button.configure(state="disabled")
         self.automation_running = False
+        self.current_operation = None
+
+    def show_status(self, message):
+        """왼쪽 프레임의 진행 상태 라벨을 바꾸고 로그에도 남깁니다. (어느 스레드에서나 호출 가능)"""
+        def update():
+            self.status_label.configure(text=message)
+            self.add_log(message)
+        if threading.current_thread() is threading.main_thread():
+            update()
+        else:
+            self.after(0, update)
+
+    def call_in_gui_thread(self, func, timeout=None):
+        """
+        func를 GUI(브라우저 소유) 스레드에서 실행하고 결과를 돌려줍니다.
+        작업 스레드에서 Playwright를 다뤄야 할 때 사용합니다.
+        """
+        if threading.current_thread() is threading.main_thread():
+            return func()
+
+        done = threading.Event()
+        result = {}
+
+        def run():
+            try:
+                result['value'] = func()
+            except Exception as e:
+                result['error'] = e
+            finally:
+                done.set()
+
+        self.after(0, run)
+        if not done.wait(timeout):
+            raise TimeoutError("GUI 스레드 작업 대기 시간이 초과되었습니다.")
+        if 'error' in result:
+            raise result['error']
+        return result.get('value')
+
+    def rotate_trace(self):
+        """트레이스 링 버퍼의 현재 조각이 길어졌으면 끊어 저장합니다. (GUI 스레드 타이머)"""
+        if not self.blocking_wait_depth:
+            browser_manager.rotate_trace()
+        self.after(TRACE_ROTATE_MS, self.rotate_trace)
+
+    # --- UI 응답성 감시 ---
+    def update_lag_indicator(self):
+        """최근 이벤트 루프 지연을 0.5초마다 라벨에 표시합니다."""
+        lag = self.watchdog.last_lag_ms
+        if lag < 50:
+            color = "#2e7d32"
+        elif lag < self.watchdog.stall_threshold_ms:
+            color = "#f57c00"
+        else:
+            color = "#d32f2f"
+        self.lag_label.configure(text=f"UI 지연 {lag:.0f}ms · 멈춤 {len(self.watchdog.stalls)}회", text_color=color)
+        self.after(500, self.update_lag_indicator)
+
+    def update_throughput_panel(self):
+        """진행 중인(또는 마지막) 대량 작업의 처리 속도, 남은 시간, 최근 행 지연을 0.5초마다 표시합니다."""
+        current = metrics.current()
+        if current is not None:
+            processed = current['done'] + current['failed']
+            count = f"{processed}/{current['total']}"
+            state = {'done': "완료", 'stopped': f"중지됨 · {count}", 'error': f"오류로 중단 · {count}"}.get(current['status'], count)
+            failed = f" · 실패 {current['failed']}" if current['failed'] else ""
+            self.throughput_title.configure(text=f"처리 현황: {current['name']} ({state}{failed})")
+            self.throughput_progress.set(processed / current['total'] if current['total'] else 1)
+            if current['finished'] and current['status'] != 'done':
+                text = f"걸린 시간 {format_duration(current['elapsed_sec'])}"
+            elif current['finished']:
+                average = processed / current['elapsed_sec'] if current['elapsed_sec'] > 0 else 0
+                text = f"평균 {average:.2f}건/초 · 걸린 시간 {format_duration(current['elapsed_sec'])}"
+            else:
+                text = f"속도 {current['rate']:.2f}건/초 · 남은 시간 약 {format_duration(current['eta_sec'])}"
+            if current['last_ms'] is not None:
+                text += f"\n최근 행 {current['last_ms']:.0f}ms (최근 평균 {current['mean_ms']:.0f}ms)"
+            self.throughput_label.configure(text=text)
+        self.after(THROUGHPUT_REFRESH_MS, self.update_throughput_panel)
+
+    def on_ui_stall(self, stall):
+        """1초 이상 멈춘 경우에만 로그에 남깁니다. (짧은 멈춤은 통계에서 확인)"""
+        if stall['duration_ms'] >= 1000:
+            self.add_log(f"⚠ 화면이 {stall['duration_ms'] / 1000:.1f}초 멈췄습니다 (작업: {stall['operation'] or '없음'})")
+
+    def show_lag_histogram(self):
+        """UI 지연 히스토그램과 최근 멈춤 기록을 로그에 출력합니다."""
+        self.add_log(self.watchdog.histogram_text())
 
     # --- 기존 기능들 (로그, 자동화 작업) ---
     def add_log(self, message):
@@ -459,6 +847,8 @@ class App(customtkinter.CTk):
     # --- 각 자동화 작업을 실행하는 함수들 ---
     def navigate_to_neis_directly(self):
         """나이스에 직접 접속 (스레드 생성 없이)"""
+        if self.is_blocked():
+            return
         try:
             self.add_log("나이스 접속 작업을 시작합니다...")
             navigate_to_neis(self)
@@ -470,6 +860,8 @@ class App(customtkinter.CTk):
     
     def navigate_to_edufine_directly(self):
         """에듀파인에 직접 접속 (스레드 생성 없이)"""
+        if self.is_blocked():
+            return
         try:
             self.add_log("K-에듀파인 접속 작업을 시작합니다...")
             navigate_to_edufine(self)
@@ -481,6 +873,8 @@ class App(customtkinter.CTk):
 
     def open_neis_and_edufine_directly(self):
         """업무포털 (나이스+에듀파인)에 직접 접속 (스레드 생성 없이)"""
+        if self.is_blocked():
+            return
         try:
             self.add_log("업무포털 (나이스+에듀파인) 접속 작업을 시작합니다...")
             open_neis_and_edufine_after_login(self)
@@ -502,8 +896,15 @@ class App(customtkinter.CTk):
 
     def on_closing(self):
         """창이 닫힐 때 호출될 함수 - 공유 브라우저 세션을 안전하게 정리"""
-        # 가장 먼저 종료 플래그를 설정합니다
+        # 가장 먼저 종료 플래그를 설정합니다 (로그인 대기 중이면 대기가 이 플래그를 보고 멈춥니다)
         browser_manager.set_closing_flag()
+        if self.blocking_wait_depth:
+            # 대기 중인 작업 안에서 브라우저를 닫고 창을 없애면 안 되므로, 대기가 끝난 뒤 다시 호출됩니다.
+            self.close_requested = True
+            self.add_log("로그인 대기를 멈추고 프로그램을 종료합니다...")
+            return
+        self.watchdog.stop()
+        self.memory_governor.stop()
         
         if self.automation_running:
             self.stop_automation = True
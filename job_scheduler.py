@@ -0,0 +1,119 @@
+# job_scheduler.py (한가한 시간대 대량 작업 예약)
+
+import time
+import datetime
+from resilience import classify_error, backoff_delay, TRANSIENT
+from rate_limiter import get_limiter
+
+
+# --- 시간대 ---
+def parse_window(text: str) -> tuple:
+    """'18:00-07:00' 형식을 (시작, 끝) datetime.time으로 바꿉니다. 끝이 시작보다 이르면 자정을 넘기는 시간대입니다."""
+    try:
+        start, end = (datetime.datetime.strptime(part.strip(), '%H:%M').time() for part in text.split('-'))
+    except ValueError:
+        raise ValueError(f"시간대 형식이 올바르지 않습니다: {text} (예: 18:00-07:00)")
+    return start, end
+
+
+def in_window(window: tuple, now: datetime.datetime = None) -> bool:
+    if window is None:
+        return True
+    now = (now or datetime.datetime.now()).time()
+    start, end = window
+    if start <= end:
+        return start <= now < end
+    return now >= start or now < end
+
+
+def seconds_until(window: tuple, now: datetime.datetime = None) -> float:
+    """시간대가 시작될 때까지 남은 시간(초). 이미 시간대 안이면 0"""
+    now = now or datetime.datetime.now()
+    if in_window(window, now):
+        return 0.0
+    start = datetime.datetime.combine(now.date(), window[0])
+    if start <= now:
+        start += datetime.timedelta(days=1)
+    return (start - now).total_seconds()
+
+
+def wait_for_window(window: tuple, sleep=time.sleep):
+    """시간대가 될 때까지 기다립니다."""
+    remaining = seconds_until(window)
+    if remaining > 0:
+        start_at = datetime.datetime.now() + datetime.timedelta(seconds=remaining)
+        print(f"작업 시간대까지 기다립니다: {start_at:%H:%M} 시작 ({remaining / 60:.0f}분 후)")
+        sleep(remaining)
+
+
+class JobScheduler:
+    """
+    대량 작업(일괄 입력, 내보내기, 다운로드)을 줄 세워 두고 지정한 시간대에 하나씩 실행합니다.
+
+    - 작업은 BrowserManager의 소유 스레드에서 차례로 실행됩니다. (run_until_empty를 호출한 스레드)
+    - 일시적 오류로 실패한 작업은 점점 긴 간격을 두고 다시 시도하고, 해당 서비스의 요청 속도도 줄입니다.
+    - 오류 분류는 classify(기본: resilience.classify_error)로 하므로, 작업이 자체 오류 형식을 쓰면 분류 함수를 넘깁니다.
+    """
+    RETRY_BASE_DELAY = 60.0   # 작업 단위 재시도 기본 간격 (초)
+    RETRY_MAX_DELAY = 900.0
+
+    def __init__(self, max_attempts: int = 3, classify=classify_error):
+        self.max_attempts = max_attempts
+        self.classify = classify
+        self.jobs = []
+
+    def submit(self, name: str, func, window: tuple = None, service: str = None) -> dict:
+        """작업을 예약합니다. window가 없으면 바로 실행 가능한 작업입니다."""
+        job = {'name': name, 'func': func, 'window': window, 'service': service,
+               'status': 'pending', 'attempts': 0, 'not_before': 0.0, 'result': None, 'error': None}
+        self.jobs.append(job)
+        return job
+
+    def _pending(self) -> list:
+        return [job for job in self.jobs if job['status'] == 'pending']
+
+    def _ready(self, job: dict) -> bool:
+        return in_window(job['window']) and time.monotonic() >= job['not_before']
+
+    def _run(self, job: dict):
+        job['attempts'] += 1
+        start = time.perf_counter()
+        print(f"=== 예약 작업 시작: {job['name']} ({job['attempts']}회차) ===")
+        try:
+            job['result'] = job['func']()
+        except Exception as e:
+            job['error'] = e
+            kind = self.classify(e)
+            if kind == TRANSIENT and job['attempts'] < self.max_attempts:
+                delay = self.RETRY_BASE_DELAY + backoff_delay(job['attempts'], self.RETRY_BASE_DELAY, self.RETRY_MAX_DELAY)
+                job['not_before'] = time.monotonic() + delay
+                if job['service']:
+                    get_limiter(job['service']).observe(0.0, ok=False)
+                print(f"✗ {job['name']} 일시적 오류로 {delay:.0f}초 후 다시 시도합니다: {e}")
+            else:
+                job['status'] = 'failed'
+                print(f"✗ {job['name']} 실패 ({kind}): {e}")
+        else:
+            job['status'] = 'done'
+            job['error'] = None
+            print(f"✓ {job['name']} 완료 ({time.perf_counter() - start:.1f}초)")
+
+    def run_pending(self) -> int:
+        """지금 실행할 수 있는 작업을 모두 실행하고, 실행한 작업 수를 반환합니다."""
+        count = 0
+        for job in self._pending():
+            if self._ready(job):
+                self._run(job)
+                count += 1
+        return count
+
+    def run_until_empty(self, sleep=time.sleep, poll_seconds: float = 60.0):
+        """모든 작업이 끝날 때까지 시간대/재시도 간격에 맞춰 기다리며 실행합니다."""
+        while self._pending():
+            if self.run_pending():
+                continue
+            waits = []
+            for job in self._pending():
+                waits.append(max(seconds_until(job['window']), job['not_before'] - time.monotonic()))
+            sleep(max(1.0, min(min(waits), poll_seconds)))
+        return self.jobs
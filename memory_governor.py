@@ -0,0 +1,212 @@
+# memory_governor.py (장시간 실행 시 서비스 탭 메모리 감시 + 자동 재생성)
+
+import os
+import csv
+import datetime
+import configparser
+from urllib.parse import urlsplit
+import pandas as pd
+
+# CDP Performance.getMetrics 결과 중 기록할 항목
+_METRIC_NAMES = ('JSHeapUsedSize', 'JSHeapTotalSize', 'Nodes', 'JSEventListeners', 'Documents', 'Frames')
+
+LOG_COLUMNS = ('time', 'service', 'screen', 'heap_mb', 'heap_total_mb', 'nodes', 'listeners', 'documents',
+               'frames', 'recycled')
+
+
+def get_memory_settings() -> dict:
+    """config.ini의 [Memory] 섹션에서 측정 간격, 재생성 기준, 기록 파일을 읽습니다."""
+    config = configparser.ConfigParser()
+    config.read('config.ini', encoding='utf-8')
+    section = config['Memory'] if config.has_section('Memory') else {}
+
+    settings = {'interval_sec': 300, 'heap_limit_mb': 400, 'node_limit': 150000}
+    for key, default in list(settings.items()):
+        try:
+            settings[key] = int(section.get(key, default))
+        except ValueError:
+            print(f"[Memory] {key} 값이 올바르지 않습니다. (기본값 {default} 사용)")
+    settings['log_file'] = section.get('log_file', 'memory_log.csv').strip()
+    return settings
+
+
+def screen_of(url: str) -> str:
+    """URL에서 쿼리를 뺀 화면 주소 (나이스 URL의 긴 data 파라미터는 화면 구분에 쓰지 않음)"""
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path}" if parts.netloc else url
+
+
+class MemoryGovernor:
+    """
+    서비스 탭(BrowserManager.pages)의 JS 힙 사용량과 DOM 노드 수를 CDP로 주기적으로 측정합니다.
+
+    - 측정은 after() 타이머로 GUI(브라우저 소유) 스레드에서 실행됩니다.
+    - 측정값은 CSV 파일에 한 줄씩 추가되어 어느 화면에서 메모리가 늘어나는지 나중에 볼 수 있습니다.
+    - 기준을 넘은 탭은 진행 중인 작업이 없고 사용자가 보고 있지 않을 때 같은 URL로 새로 엽니다.
+    """
+    def __init__(self, app, manager, is_busy=None, on_recycle=None, settings: dict = None):
+        self.app = app
+        self.manager = manager
+        self.is_busy = is_busy or (lambda: False)  # 붙여넣기 등 브라우저 밖의 작업 진행 여부
+        self.on_recycle = on_recycle  # 탭을 새로 연 뒤 (서비스 이름, 측정값)으로 호출됨
+        self.settings = settings or get_memory_settings()
+        self._sessions = {}  # {서비스 이름: (Page, CDPSession)}
+        self._pending = set()  # 기준을 넘었지만 아직 재생성하지 못한 서비스
+        self._running = False
+
+    def start(self):
+        self._running = True
+        self.app.after(self.settings['interval_sec'] * 1000, self._tick)
+
+    def stop(self):
+        self._running = False
+        for service_name in list(self._sessions):
+            self._drop_session(service_name)
+
+    def _tick(self):
+        if not self._running:
+            return
+        try:
+            self.check()
+        except Exception as e:
+            print(f"메모리 점검 중 오류: {e}")
+        self.app.after(self.settings['interval_sec'] * 1000, self._tick)
+
+    def _session_for(self, service_name: str, page):
+        """탭별 CDP 세션을 한 번만 만들어 재사용합니다. (탭이 바뀌면 새로 만듦)"""
+        cached = self._sessions.get(service_name)
+        if cached and cached[0] is page:
+            return cached[1]
+        self._drop_session(service_name)
+        session = page.context.new_cdp_session(page)
+        session.send('Performance.enable')
+        self._sessions[service_name] = (page, session)
+        return session
+
+    def _drop_session(self, service_name: str):
+        """탭의 CDP 세션을 떼어냅니다. (탭이 이미 닫혔으면 세션도 끊겨 있으므로 오류는 무시)"""
+        cached = self._sessions.pop(service_name, None)
+        if cached is None:
+            return
+        try:
+            cached[1].detach()
+        except Exception:
+            pass
+
+    def _drop_stale_sessions(self):
+        """닫혔거나 더 이상 서비스 탭이 아닌 페이지의 세션을 정리합니다."""
+        pages = self.manager.pages
+        for service_name, (page, _) in list(self._sessions.items()):
+            if page.is_closed() or pages.get(service_name) is not page:
+                self._drop_session(service_name)
+
+    def sample(self, service_name: str, page) -> dict:
+        """탭 하나의 메모리 지표를 측정합니다."""
+        response = self._session_for(service_name, page).send('Performance.getMetrics')
+        metrics = {item['name']: item['value'] for item in response['metrics'] if item['name'] in _METRIC_NAMES}
+        return {
+            'time': datetime.datetime.now().isoformat(timespec='seconds'),
+            'service': service_name,
+            'screen': screen_of(page.url),
+            'heap_mb': round(metrics.get('JSHeapUsedSize', 0) / 1024 / 1024, 1),
+            'heap_total_mb': round(metrics.get('JSHeapTotalSize', 0) / 1024 / 1024, 1),
+            'nodes': int(metrics.get('Nodes', 0)),
+            'listeners': int(metrics.get('JSEventListeners', 0)),
+            'documents': int(metrics.get('Documents', 0)),
+            'frames': int(metrics.get('Frames', 0)),
+            'recycled': False,
+        }
+
+    def is_over_limit(self, sample: dict) -> bool:
+        return sample['heap_mb'] > self.settings['heap_limit_mb'] or sample['nodes'] > self.settings['node_limit']
+
+    def check(self) -> list:
+        """
+        모든 서비스 탭을 측정해 기록하고, 기준을 넘은 탭을 한가할 때 새로 엽니다.
+        반환값: 이번에 측정한 값 목록
+        """
+        browser = self.manager.browser
+        if browser is None or not browser.is_connected() or self.manager.is_closing:
+            return []
+        if self.manager.active_operations:
+            return []  # 작업 중에는 측정도 하지 않습니다. (다음 주기에 다시 시도)
+
+        samples = []
+        with self.manager.operation('메모리 점검'):
+            self._drop_stale_sessions()
+            for service_name, page in self.manager.pages.items():
+                if page.is_closed():
+                    continue
+                try:
+                    sample = self.sample(service_name, page)
+                except Exception as e:
+                    print(f"{service_name} 탭 메모리 측정 실패: {e}")
+                    continue
+                if self.is_over_limit(sample):
+                    self._pending.add(service_name)
+                if service_name in self._pending and not self.is_busy():
+                    sample['recycled'] = self._recycle(service_name, page, sample)
+                samples.append(sample)
+        self._write_log(samples)
+        return samples
+
+    def _recycle(self, service_name: str, page, sample: dict) -> bool:
+        """사용자가 보고 있는 탭은 건너뛰고, 나머지는 같은 URL로 새로 엽니다."""
+        try:
+            if page.evaluate("() => document.hasFocus()"):
+                print(f"{service_name} 탭을 사용 중이므로 재생성을 미룹니다. (힙 {sample['heap_mb']}MB, 노드 {sample['nodes']}개)")
+                return False
+            # 옛 탭을 닫기 전에 측정용 CDP 세션을 떼어냅니다.
+            self._drop_session(service_name)
+            self.manager.recycle_page(service_name)
+        except Exception as e:
+            print(f"{service_name} 탭 재생성 실패: {e}")
+            return False
+        self._pending.discard(service_name)
+        print(f"♻ {service_name} 탭을 새로 열었습니다. (힙 {sample['heap_mb']}MB, 노드 {sample['nodes']}개)")
+        if self.on_recycle:
+            self.on_recycle(service_name, sample)
+        return True
+
+    def _write_log(self, samples: list):
+        if not samples:
+            return
+        path = self.settings['log_file']
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        new_file = not os.path.exists(path)
+        try:
+            with open(path, 'a', newline='', encoding='utf-8') as file:
+                writer = csv.DictWriter(file, fieldnames=LOG_COLUMNS)
+                if new_file:
+                    writer.writeheader()
+                writer.writerows(samples)
+        except OSError as e:
+            print(f"메모리 기록 저장 실패: {e}")
+
+
+def summarize_log(path: str = None) -> pd.DataFrame:
+    """
+    메모리 기록 파일을 서비스/화면별로 요약합니다.
+    시간당 힙 증가량(heap_mb_per_hour)이 큰 화면이 메모리 누수가 의심되는 화면입니다.
+    """
+    df = pd.read_csv(path or get_memory_settings()['log_file'], parse_dates=['time'])
+    rows = []
+    for (service, screen), group in df.groupby(['service', 'screen']):
+        group = group.sort_values('time')
+        hours = (group['time'].iloc[-1] - group['time'].iloc[0]).total_seconds() / 3600
+        growth = group['heap_mb'].iloc[-1] - group['heap_mb'].iloc[0]
+        rows.append({
+            'service': service,
+            'screen': screen,
+            'samples': len(group),
+            'heap_mb_max': group['heap_mb'].max(),
+            'nodes_max': group['nodes'].max(),
+            'heap_mb_per_hour': round(growth / hours, 1) if hours > 0 else 0.0,
+            'recycled': int(group['recycled'].astype(str).eq('True').sum()),
+        })
+    return pd.DataFrame(rows).sort_values('heap_mb_per_hour', ascending=False, ignore_index=True)
+
+
+if __name__ == "__main__":
+    print(summarize_log().to_string())
@@ -0,0 +1,180 @@
+# metrics.py (대량 작업 처리량/남은 시간 지표)
+
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+RATE_WINDOW = 30.0   # 처리 속도를 계산하는 최근 구간 (초)
+LATENCY_WINDOW = 10  # 최근 행 지연 평균에 쓰는 행 수
+
+
+class Counter:
+    """누적 횟수 (여러 작업 스레드에서 올리므로 잠금 안에서 더합니다)"""
+    def __init__(self, lock=None):
+        self.value = 0
+        self._lock = lock or threading.Lock()
+
+    def inc(self, amount: int = 1):
+        with self._lock:
+            self.value += amount
+
+
+class RollingRate:
+    """
+    최근 window초 동안의 처리 속도(건/초)와 건당 걸린 시간
+    mark()는 deque에 한 번 추가할 뿐이므로 행마다 호출해도 부담이 없습니다.
+    """
+    def __init__(self, window: float = RATE_WINDOW):
+        self.window = window
+        self._events = deque()  # 최근 구간에 처리한 시각들
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self.last_ms = None
+
+    def mark(self, latency_ms: float = None, now: float = None):
+        now = time.monotonic() if now is None else now
+        self._events.append(now)
+        if latency_ms is not None:
+            self._latencies.append(latency_ms)
+            self.last_ms = latency_ms
+        while self._events and self._events[0] < now - self.window:
+            self._events.popleft()
+
+    def rate(self, now: float = None, since: float = None) -> float:
+        """
+        최근 구간의 초당 처리 건수. 시작한 지 구간보다 짧으면 시작 시각(since)부터 계산합니다.
+        (첫 몇 건만으로 속도가 튀지 않도록)
+        """
+        now = time.monotonic() if now is None else now
+        start = now - self.window
+        events = [t for t in list(self._events) if t >= start]
+        if not events:
+            return 0.0
+        if since is not None and since > start:
+            start = since
+        elapsed = now - start
+        return len(events) / elapsed if elapsed > 0 else 0.0
+
+    def mean_ms(self) -> float:
+        latencies = list(self._latencies)
+        return sum(latencies) / len(latencies) if latencies else None
+
+
+class Progress:
+    """
+    대량 작업 하나의 진행 상황 (처리한 건수, 속도, 남은 시간)
+    status: 'running' → 끝나면 'done'(다 처리함) / 'stopped'(사용자가 중지) / 'error'(오류로 중단)
+    """
+    def __init__(self, name: str, total: int):
+        self.name = name
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.started = time.monotonic()
+        self.finished = None
+        self.status = 'running'
+        self.rate = RollingRate()
+        self._row_start = self.started
+
+    def step(self, ok: bool = True):
+        """한 건을 처리했을 때 호출합니다. 건당 걸린 시간은 직전 step부터 잽니다."""
+        now = time.monotonic()
+        self.rate.mark((now - self._row_start) * 1000, now)
+        self._row_start = now
+        if ok:
+            self.done += 1
+        else:
+            self.failed += 1
+
+    def stop(self):
+        """사용자가 중지한 작업으로 표시합니다. (끝까지 처리하지 않았으므로 '완료'로 보이지 않게)"""
+        self.status = 'stopped'
+
+    def restart_row(self):
+        """건너뛰기처럼 세지 않을 시간이 지난 뒤, 다음 건의 시간을 지금부터 잽니다."""
+        self._row_start = time.monotonic()
+
+    def snapshot(self) -> dict:
+        now = self.finished or time.monotonic()
+        processed = self.done + self.failed
+        rate = self.rate.rate(now, self.started)
+        remaining = max(0, self.total - processed)
+        return {
+            'name': self.name,
+            'total': self.total,
+            'done': self.done,
+            'failed': self.failed,
+            'elapsed_sec': now - self.started,
+            'rate': rate,
+            'eta_sec': remaining / rate if rate > 0 and not self.finished else None,
+            'last_ms': self.rate.last_ms,
+            'mean_ms': self.rate.mean_ms(),
+            'finished': self.finished is not None,
+            'status': self.status,
+        }
+
+
+class MetricsRegistry:
+    """
+    프로세스 안의 지표 모음 (이름별 누적 횟수, 진행 중인 대량 작업의 처리 속도)
+    작업 스레드에서 기록하고 GUI 타이머에서 읽습니다.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._progress = []  # 진행 중이거나 마지막으로 끝난 작업 (최근 것이 뒤)
+
+    def counter(self, name: str) -> Counter:
+        with self._lock:
+            return self._counters.setdefault(name, Counter(self._lock))
+
+    @contextmanager
+    def track(self, name: str, total: int):
+        """
+        with 블록 동안 대량 작업의 진행 상황을 등록합니다. 끝난 작업은 다음 작업이 시작될 때까지 남겨 둡니다.
+        블록이 예외로 끝나면 'error', progress.stop()을 불렀으면 'stopped', 그 밖에는 'done'으로 표시합니다.
+        """
+        progress = Progress(name, total)
+        with self._lock:
+            self._progress = [p for p in self._progress if p.finished is None]
+            self._progress.append(progress)
+        try:
+            yield progress
+        except BaseException:
+            if progress.status == 'running':
+                progress.status = 'error'
+            raise
+        finally:
+            if progress.status == 'running':
+                progress.status = 'done'
+            progress.finished = time.monotonic()
+
+    def current(self) -> dict:
+        """진행 중인 작업(없으면 마지막으로 끝난 작업)의 진행 상황. 없으면 None"""
+        with self._lock:
+            progress = list(self._progress)
+        running = [p for p in progress if p.finished is None]
+        latest = (running or progress)[-1:]
+        return latest[0].snapshot() if latest else None
+
+    def counters(self) -> dict:
+        """모든 누적 횟수 {이름: 값} (로그/CLI 출력용)"""
+        with self._lock:
+            return {name: counter.value for name, counter in self._counters.items()}
+
+
+def format_duration(seconds: float) -> str:
+    if seconds is None:
+        return '-'
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}초"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}분 {seconds}초"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}시간 {minutes}분"
+
+
+# 프로그램 전체에서 공유하는 지표 모음
+metrics = MetricsRegistry()
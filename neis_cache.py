@@ -0,0 +1,177 @@
+# neis_cache.py (나이스 화면 데이터 로컬 캐시 + 변경 감지)
+
+import os
+import json
+import time
+import hashlib
+import configparser
+import pandas as pd
+from playwright.sync_api import Page
+
+# 나이스(eXBuilder6) 그리드를 한 번의 evaluate로 읽는 스크립트
+# 화면에 보이는 첫 번째 그리드의 머리글과 모든 행의 셀 텍스트(입력칸이면 값)를 반환합니다.
+_READ_GRID_JS = """
+(gridSelector) => {
+    const grids = Array.from(document.querySelectorAll(gridSelector || '[role="grid"]'))
+        .filter(g => g.offsetParent !== null);
+    if (!grids.length) return null;
+    const grid = grids[0];
+    const cellText = cell => {
+        const input = cell.querySelector('input, textarea, select');
+        return (input ? input.value : cell.innerText || '').trim();
+    };
+    const headers = Array.from(grid.querySelectorAll('[role="columnheader"]')).map(cellText);
+    const rows = Array.from(grid.querySelectorAll('[role="row"]'))
+        .map(row => Array.from(row.querySelectorAll('[role="gridcell"]')).map(cellText))
+        .filter(cells => cells.length);
+    return {headers, rows};
+}
+"""
+
+
+def get_cache_dir():
+    """config.ini의 [Cache] 섹션에서 캐시 폴더를 읽습니다."""
+    config = configparser.ConfigParser()
+    config.read('config.ini', encoding='utf-8')
+
+    try:
+        return config['Cache']['neis_cache_dir'].strip()
+    except (KeyError, configparser.NoSectionError):
+        return 'neis_cache'  # 기본값
+
+
+def read_grid(page: Page, grid_selector: str = None) -> pd.DataFrame:
+    """
+    현재 나이스 화면의 그리드를 DataFrame으로 읽습니다.
+    그리드가 iframe 안에 있을 수 있으므로 모든 프레임에서 찾습니다.
+    """
+    for frame in page.frames:
+        try:
+            result = frame.evaluate(_READ_GRID_JS, grid_selector)
+        except Exception:
+            continue
+        if result and result['rows']:
+            width = max(len(cells) for cells in result['rows'])
+            headers = list(result['headers'][:width])
+            headers += [f"열{i + 1}" for i in range(len(headers), width)]
+            # 머리글이 중복되면 DataFrame 열이 겹치므로 번호를 붙입니다.
+            seen = {}
+            for i, name in enumerate(headers):
+                if name in seen:
+                    seen[name] += 1
+                    headers[i] = f"{name}_{seen[name]}"
+                else:
+                    seen[name] = 0
+            rows = [cells + [''] * (width - len(cells)) for cells in result['rows']]
+            return pd.DataFrame(rows, columns=headers, dtype=str)
+    raise ValueError("현재 화면에서 그리드를 찾을 수 없습니다.")
+
+
+class ChangeSet:
+    """이전 캐시와 새 데이터의 차이 (키 열 값의 튜플 목록)"""
+    def __init__(self, added=(), removed=(), changed=(), unchanged=0, full_reload=False):
+        self.added = list(added)
+        self.removed = list(removed)
+        self.changed = list(changed)
+        self.unchanged = unchanged
+        self.full_reload = full_reload  # 열 구성이 달라져 전체를 새로 저장했는지 여부
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.removed or self.changed or self.full_reload)
+
+    def __repr__(self):
+        return (f"ChangeSet(추가 {len(self.added)}, 삭제 {len(self.removed)}, "
+                f"변경 {len(self.changed)}, 동일 {self.unchanged}, 전체 {self.full_reload})")
+
+
+def diff_frames(old: pd.DataFrame, new: pd.DataFrame, key_columns: list) -> ChangeSet:
+    """키 열을 기준으로 두 DataFrame의 추가/삭제/변경 행을 찾습니다."""
+    if old is None or list(old.columns) != list(new.columns):
+        return ChangeSet(added=new.set_index(key_columns).index.tolist(), full_reload=True)
+
+    old_indexed = old.set_index(key_columns)
+    new_indexed = new.set_index(key_columns)
+    added = new_indexed.index.difference(old_indexed.index)
+    removed = old_indexed.index.difference(new_indexed.index)
+    common = new_indexed.index.intersection(old_indexed.index)
+
+    # 키가 같은 행끼리 나머지 열의 해시를 비교합니다.
+    old_hash = pd.util.hash_pandas_object(old_indexed.loc[common], index=False).to_numpy()
+    new_hash = pd.util.hash_pandas_object(new_indexed.loc[common], index=False).to_numpy()
+    changed = common[old_hash != new_hash]
+
+    return ChangeSet(added=added.tolist(), removed=removed.tolist(), changed=changed.tolist(),
+                     unchanged=len(common) - len(changed))
+
+
+class NeisCache:
+    """
+    나이스 화면 데이터를 화면 이름 + 조회 조건별 Parquet 파일로 보관합니다.
+    refresh()는 새로 읽은 데이터와 캐시를 비교해 바뀐 행만 캐시에 반영하고 ChangeSet을 돌려줍니다.
+    """
+    def __init__(self, cache_dir: str = None):
+        self.cache_dir = cache_dir or get_cache_dir()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _paths(self, screen: str, params: dict) -> tuple:
+        key = json.dumps({'screen': screen, 'params': params or {}}, ensure_ascii=False, sort_keys=True)
+        name = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        return (os.path.join(self.cache_dir, f"{name}.parquet"),
+                os.path.join(self.cache_dir, f"{name}.json"))
+
+    def load(self, screen: str, params: dict = None, max_age: float = None):
+        """
+        캐시된 DataFrame을 반환합니다. 없거나 max_age(초)보다 오래되었으면 None
+        """
+        data_path, meta_path = self._paths(screen, params)
+        if not os.path.exists(data_path) or not os.path.exists(meta_path):
+            return None
+        with open(meta_path, 'r', encoding='utf-8') as file:
+            meta = json.load(file)
+        if max_age is not None and time.time() - meta['refreshed_at'] > max_age:
+            return None
+        return pd.read_parquet(data_path)
+
+    def refresh(self, screen: str, new_df: pd.DataFrame, key_columns: list, params: dict = None) -> ChangeSet:
+        """새로 읽은 데이터를 캐시와 비교하고, 바뀐 행만 캐시에 반영합니다."""
+        data_path, meta_path = self._paths(screen, params)
+        new_df = new_df.astype(str)
+
+        # 키가 중복되면 행 위치를 키로 사용합니다.
+        if new_df.duplicated(subset=key_columns).any():
+            print(f"[{screen}] 키 열 {key_columns}이(가) 중복되어 행 순서를 키로 사용합니다.")
+            new_df = new_df.reset_index().rename(columns={'index': '_행'}).astype(str)
+            key_columns = ['_행']
+
+        old_df = pd.read_parquet(data_path) if os.path.exists(data_path) else None
+        changes = diff_frames(old_df, new_df, key_columns)
+
+        if changes.full_reload:
+            merged = new_df
+        elif changes.has_changes:
+            merged = old_df.set_index(key_columns)
+            new_indexed = new_df.set_index(key_columns)
+            merged = merged.drop(index=changes.removed)
+            if changes.changed:
+                merged.loc[changes.changed] = new_indexed.loc[changes.changed]
+            if changes.added:
+                merged = pd.concat([merged, new_indexed.loc[changes.added]])
+            # 화면의 행 순서를 그대로 유지합니다.
+            merged = merged.loc[new_indexed.index].reset_index()
+        else:
+            merged = None  # 바뀐 것이 없으면 데이터 파일을 다시 쓰지 않습니다.
+
+        if merged is not None:
+            merged.to_parquet(data_path, index=False)
+        with open(meta_path, 'w', encoding='utf-8') as file:
+            json.dump({'screen': screen, 'params': params or {}, 'key_columns': key_columns,
+                       'refreshed_at': time.time()}, file, ensure_ascii=False)
+
+        print(f"[{screen}] 캐시 갱신: {changes}")
+        return changes
+
+    def refresh_from_page(self, page: Page, screen: str, key_columns: list,
+                          params: dict = None, grid_selector: str = None) -> ChangeSet:
+        """현재 나이스 화면의 그리드를 읽어 캐시를 갱신합니다."""
+        return self.refresh(screen, read_grid(page, grid_selector), key_columns, params)
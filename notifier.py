@@ -0,0 +1,52 @@
+# notifier.py (사용자 알림 출력 방식 선택 - GUI 안내창 / 콘솔)
+
+# 워크플로우(btn_commands, utils)는 tkinter messagebox 대신 notify를 사용합니다.
+# GUI에서는 기존처럼 안내창이 뜨고, CLI(edufine_cli.py)에서는 ConsoleNotifier로 바꿔
+# 안내창 없이 메시지를 모아 JSON 결과와 종료 코드에 반영합니다.
+
+# 오류 분류(resilience의 TRANSIENT 등) 외에 알림에 붙이는 종류
+PARTIAL = 'partial'  # 여러 작업 중 일부만 성공함 → CLI는 EXIT_PARTIAL로 끝냄
+
+
+class MessageBoxNotifier:
+    """tkinter 안내창으로 알립니다. (기본값)"""
+    def notify(self, level: str, title: str, message: str, kind: str = None):
+        from tkinter import messagebox  # CLI에서는 tkinter를 불러오지 않도록 필요할 때만 가져옵니다.
+        {'info': messagebox.showinfo, 'warning': messagebox.showwarning,
+         'error': messagebox.showerror}[level](title, message)
+
+
+class ConsoleNotifier:
+    """안내창 없이 출력만 하고, 알림을 목록에 모아 둡니다."""
+    def __init__(self):
+        self.messages = []  # [{'level', 'title', 'message', 'kind'}]
+
+    def notify(self, level: str, title: str, message: str, kind: str = None):
+        print(f"[{level}] {title}: {message}")
+        self.messages.append({'level': level, 'title': title, 'message': message, 'kind': kind})
+
+    def has_problems(self) -> bool:
+        return any(entry['level'] != 'info' for entry in self.messages)
+
+
+class _Notify:
+    """messagebox와 같은 이름(showinfo/showwarning/showerror)으로 현재 알림 방식을 호출합니다."""
+    def __init__(self):
+        self.backend = MessageBoxNotifier()
+
+    def use(self, backend):
+        """알림 방식을 바꾸고 이전 방식을 반환합니다."""
+        previous, self.backend = self.backend, backend
+        return previous
+
+    def showinfo(self, title: str, message: str, kind: str = None):
+        self.backend.notify('info', title, message, kind)
+
+    def showwarning(self, title: str, message: str, kind: str = None):
+        self.backend.notify('warning', title, message, kind)
+
+    def showerror(self, title: str, message: str, kind: str = None):
+        self.backend.notify('error', title, message, kind)
+
+
+notify = _Notify()
@@ -0,0 +1,180 @@
+# page_index.py (컨텍스트의 모든 탭 색인 - 이벤트로 유지)
+
+import threading
+from urllib.parse import urlsplit
+
+# 주소(도메인)로 서비스를 구분합니다. 앞에서부터 먼저 맞는 서비스로 봅니다.
+SERVICE_DOMAINS = (
+    ('나이스', 'neis.go.kr'),
+    ('에듀파인', 'klef.jbe.go.kr'),
+    ('업무포털', 'eduptl.kr'),
+)
+
+# 최상위 문서의 제목이 정해지거나 바뀔 때마다 파이썬 쪽 색인에 알려주는 스크립트
+# (탭마다 page.title()을 호출하지 않아도 제목을 알 수 있게 합니다.)
+_TITLE_REPORTER_JS = """
+(() => {
+    if (window !== window.top) return;
+    let last = null;
+    const report = () => {
+        if (document.title === last || !window.__pageIndexTitle) return;
+        last = document.title;
+        window.__pageIndexTitle(last).catch(() => {});
+    };
+    // 같은 문서 안의 이동(해시/history API)에도 framenavigated가 오므로, 그때도 제목을 다시 알려줍니다.
+    const again = () => { last = null; setTimeout(report, 0); };
+    window.addEventListener('hashchange', again);
+    window.addEventListener('popstate', again);
+    for (const name of ['pushState', 'replaceState']) {
+        const original = history[name];
+        history[name] = function (...args) { const result = original.apply(this, args); again(); return result; };
+    }
+    const watch = () => {
+        report();
+        const head = document.head || document.documentElement;
+        if (head) new MutationObserver(report).observe(head, {subtree: true, childList: true, characterData: true});
+    };
+    if (document.readyState === 'loading') document.addEventListener('DOMContentLoaded', watch);
+    else watch();
+})();
+"""
+
+
+def service_of(url: str) -> str:
+    """URL이 속한 서비스 이름. 알 수 없으면 None"""
+    host = urlsplit(url or '').netloc
+    for service_name, domain in SERVICE_DOMAINS:
+        if host.endswith(domain):
+            return service_name
+    return None
+
+
+class PageIndex:
+    """
+    컨텍스트에 열린 모든 탭(포털이 띄운 팝업 포함)의 URL/제목/서비스 색인
+
+    context의 'page' 이벤트로 새 탭을, 탭의 'framenavigated'/'close' 이벤트로 이동과 닫힘을 반영하므로
+    찾을 때 브라우저에 묻지 않고(IPC 없이) 메모리에서 바로 찾습니다.
+    이벤트는 브라우저 소유 스레드에서 처리되고, 찾기는 어느 스레드에서 해도 됩니다.
+    """
+    def __init__(self, context):
+        self.context = context
+        self._lock = threading.Lock()
+        self._entries = {}     # {Page: {'url', 'title', 'service', 'seq'}}
+        self._by_service = {}  # {서비스 이름: {Page, ...}}
+        self._seq = 0          # 마지막으로 이동한 탭을 먼저 찾기 위한 순번
+
+    @classmethod
+    def attach(cls, context):
+        """
+        컨텍스트에 색인을 연결합니다. (새 탭을 열기 전, 컨텍스트를 만든 직후에 호출)
+        이미 열려 있는 탭도 색인에 넣습니다.
+        """
+        index = cls(context)
+        context.expose_binding('__pageIndexTitle', index._on_title)
+        context.add_init_script(_TITLE_REPORTER_JS)
+        context.on('page', index._add)
+        for page in context.pages:
+            index._add(page)
+        return index
+
+    # --- 이벤트 처리 ---
+    def _add(self, page):
+        with self._lock:
+            if page in self._entries:
+                return
+            self._entries[page] = {'url': '', 'title': '', 'service': None, 'seq': 0}
+        self._update(page, page.url)
+        page.on('framenavigated', lambda frame: self._on_navigated(page, frame))
+        page.on('close', lambda _: self._remove(page))
+
+    def _on_navigated(self, page, frame):
+        if frame == page.main_frame:
+            self._update(page, frame.url)
+
+    def _on_title(self, source, title):
+        page = source.get('page')
+        if page is not None and source.get('frame') == page.main_frame:
+            self._update(page, title=title)
+
+    def _update(self, page, url: str = None, title: str = None):
+        with self._lock:
+            entry = self._entries.get(page)
+            if entry is None:
+                return
+            if url is not None and url != entry['url']:
+                # 제목은 지우지 않습니다. 새 문서로 이동하면 스크립트가 곧 새 제목을 알려주고,
+                # 같은 문서 안의 이동이면 제목이 그대로이기 때문입니다.
+                entry['url'] = url
+                self._set_service(page, entry, service_of(url))
+            if title is not None:
+                entry['title'] = title
+            self._seq += 1
+            entry['seq'] = self._seq
+
+    def _set_service(self, page, entry: dict, service_name: str):
+        if entry['service'] == service_name:
+            return
+        if entry['service'] is not None:
+            self._by_service[entry['service']].discard(page)
+        entry['service'] = service_name
+        if service_name is not None:
+            self._by_service.setdefault(service_name, set()).add(page)
+
+    def _remove(self, page):
+        with self._lock:
+            entry = self._entries.pop(page, None)
+            if entry is not None and entry['service'] is not None:
+                self._by_service[entry['service']].discard(page)
+
+    # --- 찾기 ---
+    def find(self, service: str = None, keyword: str = None, exclude=(), url_filter=None) -> object:
+        """
+        서비스 이름 및/또는 제목·URL에 포함된 글자로 탭을 찾습니다. url_filter(url)가 있으면 그 조건도 봅니다.
+        여러 개면 가장 최근에 이동한 탭을, 없으면 None을 반환합니다.
+        """
+        with self._lock:
+            if service is not None:
+                candidates = self._by_service.get(service, ())
+            else:
+                candidates = self._entries.keys()
+            best, best_seq = None, -1
+            for page in candidates:
+                if page in exclude:
+                    continue
+                entry = self._entries[page]
+                if keyword and keyword not in entry['title'] and keyword not in entry['url']:
+                    continue
+                if url_filter is not None and not url_filter(entry['url']):
+                    continue
+                if entry['seq'] > best_seq:
+                    best, best_seq = page, entry['seq']
+            return best
+
+    def snapshot(self) -> list:
+        """모든 탭의 [{'url', 'title', 'service'}] (최근에 이동한 탭부터)"""
+        with self._lock:
+            entries = sorted(self._entries.values(), key=lambda entry: entry['seq'], reverse=True)
+            return [{'url': e['url'], 'title': e['title'], 'service': e['service']} for e in entries]
+
+
+# 컨텍스트별 색인 (utils.switch_tab처럼 Browser만 받는 함수에서 찾기 위함)
+_indexes = {}
+
+
+def attach_index(context) -> PageIndex:
+    """컨텍스트에 색인을 연결하고 등록합니다. (컨텍스트마다 한 번)"""
+    index = _indexes.get(context)
+    if index is None:
+        index = _indexes[context] = PageIndex.attach(context)
+    return index
+
+
+def detach_index(context):
+    """닫히는 컨텍스트의 색인을 등록에서 뺍니다."""
+    _indexes.pop(context, None)
+
+
+def index_for(context) -> PageIndex:
+    """컨텍스트에 연결된 색인. 없으면 None"""
+    return _indexes.get(context)
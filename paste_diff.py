@@ -0,0 +1,87 @@
+# paste_diff.py (스마트 붙여넣기 변경분만 입력하기)
+
+import configparser
+
+# 포커스된 입력칸이 있는 열의 값을 현재 행부터 끝까지 한 번에 읽는 스크립트
+# 나이스 그리드(role=row/gridcell)와 일반 표(tr/td) 모두 지원합니다.
+# 포커스가 이 프레임에 없거나 표 안의 입력칸이 아니면 null을 반환합니다.
+_READ_COLUMN_JS = """
+() => {
+    const active = document.activeElement;
+    if (!document.hasFocus() || !active || !active.matches('input, textarea, [contenteditable="true"]')) return null;
+    const cell = active.closest('[role="gridcell"], td');
+    const row = cell && cell.closest('[role="row"], tr');
+    const table = row && row.closest('[role="grid"], table');
+    if (!table) return null;
+
+    const cellsOf = r => Array.from(r.children).filter(c => c.matches('[role="gridcell"], td'));
+    const column = cellsOf(row).indexOf(cell);
+    const rows = Array.from(table.querySelectorAll('[role="row"], tr')).filter(r => r.closest('[role="grid"], table') === table);
+    const valueOf = c => {
+        const input = c && c.querySelector('input, textarea, [contenteditable="true"]');
+        if (!input) return null;
+        return input.isContentEditable ? input.innerText : input.value;
+    };
+    return rows.slice(rows.indexOf(row)).map(r => valueOf(cellsOf(r)[column]));
+}
+"""
+
+
+def is_diff_enabled() -> bool:
+    """config.ini의 [Paste] diff 설정 (기본: 사용)"""
+    config = configparser.ConfigParser()
+    config.read('config.ini', encoding='utf-8')
+
+    try:
+        return config['Paste']['diff'].strip().lower() in ('1', 'true', 'yes', 'on')
+    except (KeyError, configparser.NoSectionError):
+        return True  # 기본값
+
+
+def normalize(text) -> str:
+    """줄바꿈/앞뒤 공백 차이는 같은 내용으로 봅니다."""
+    return '\n'.join(line.rstrip() for line in str(text).replace('\r\n', '\n').split('\n')).strip()
+
+
+def read_column_values(page) -> list:
+    """
+    나이스 페이지에서 포커스된 입력칸의 열 값을 현재 행부터 읽습니다. (프레임마다 한 번의 evaluate)
+    브라우저 소유 스레드에서 호출해야 합니다. 읽을 수 없으면 None
+    """
+    if page is None or page.is_closed():
+        return None
+    for frame in page.frames:
+        try:
+            values = frame.evaluate(_READ_COLUMN_JS)
+        except Exception:
+            continue
+        if values is not None:
+            return values
+    return None
+
+
+def plan_rows(data_list: list, current_values: list) -> list:
+    """
+    입력할 데이터와 현재 값을 비교해 행마다 입력 여부를 정합니다.
+    반환값: [(행 번호(1부터), 텍스트, 입력 필요 여부)]
+    현재 값을 읽지 못한 행(화면에 없는 행 포함)은 입력 대상으로 봅니다.
+    """
+    current_values = current_values or []
+    plan = []
+    for index, text in enumerate(data_list):
+        current = current_values[index] if index < len(current_values) else None
+        changed = current is None or normalize(current) != normalize(text)
+        plan.append((index + 1, text, changed))
+    return plan
+
+
+def group_plan(plan: list) -> list:
+    """연속으로 건너뛸 행을 묶습니다. 반환값: [('enter', [행...]) 또는 ('skip', [행...])]"""
+    groups = []
+    for row in plan:
+        kind = 'enter' if row[2] else 'skip'
+        if groups and groups[-1][0] == kind and kind == 'skip':
+            groups[-1][1].append(row)
+        else:
+            groups.append((kind, [row]))
+    return groups
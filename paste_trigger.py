@@ -0,0 +1,174 @@
+# paste_trigger.py (스마트 붙여넣기 시작 신호 - 나이스 입력칸 포커스 감지 / 전역 단축키)
+
+import sys
+import time
+import threading
+import configparser
+
+# 이 프레임이 앞에 보이는 창에서 포커스를 가지고 있고, 포커스된 요소가 표 안의 입력칸인지 확인하는 스크립트
+# document.hasFocus()는 브라우저 창이 맨 앞에 있고 이 탭이 활성 탭일 때만 true입니다.
+_FOCUS_STATE_JS = """
+() => {
+    const active = document.activeElement;
+    return document.visibilityState === 'visible' && document.hasFocus() && !!active
+        && active.matches('input:not([type=button]):not([type=submit]), textarea, [contenteditable="true"]')
+        && !active.disabled && !active.readOnly
+        && !!active.closest('[role="gridcell"], td');
+}
+"""
+
+# 전역 단축키 수식키 (Windows RegisterHotKey)
+_MODIFIERS = {'alt': 0x0001, 'ctrl': 0x0002, 'shift': 0x0004, 'win': 0x0008}
+_MOD_NOREPEAT = 0x4000
+_NAMED_KEYS = {'space': 0x20, 'enter': 0x0D, 'pause': 0x13, 'insert': 0x2D, 'home': 0x24, 'end': 0x23}
+
+
+def get_trigger_settings() -> dict:
+    """config.ini의 [Paste] 섹션에서 시작 방식 설정을 읽습니다."""
+    config = configparser.ConfigParser()
+    config.read('config.ini', encoding='utf-8')
+
+    settings = {'start_mode': 'focus', 'start_hotkey': 'ctrl+alt+p', 'countdown': 5, 'focus_timeout': 30}  # 기본값
+    try:
+        section = config['Paste']
+    except KeyError:
+        return settings
+
+    mode = section.get('start_mode', settings['start_mode']).strip().lower()
+    if mode in ('focus', 'countdown'):
+        settings['start_mode'] = mode
+    else:
+        print(f"알 수 없는 붙여넣기 시작 방식입니다: {mode} (focus로 동작합니다)")
+    settings['start_hotkey'] = section.get('start_hotkey', settings['start_hotkey']).strip()
+    for key in ('countdown', 'focus_timeout'):
+        try:
+            settings[key] = max(1, section.getint(key, settings[key]))
+        except ValueError:
+            print(f"{key} 설정이 숫자가 아닙니다. 기본값({settings[key]}초)을 사용합니다.")
+    return settings
+
+
+def is_cell_focused(page) -> bool:
+    """
+    나이스 페이지가 맨 앞에 있고 표의 입력칸에 포커스가 있는지 확인합니다. (브라우저 소유 스레드에서 호출)
+    나이스 화면은 프레임 안에 있으므로 프레임마다 확인합니다.
+    """
+    if page is None or page.is_closed():
+        return False
+    for frame in page.frames:
+        try:
+            if frame.evaluate(_FOCUS_STATE_JS):
+                return True
+        except Exception:
+            continue
+    return False
+
+
+def parse_hotkey(text: str) -> tuple:
+    """
+    'ctrl+alt+p' 형식을 (수식키 플래그, 가상 키 코드)로 바꿉니다. 잘못된 형식이면 ValueError
+    일반 키는 영문자/숫자/F1~F24/이름 있는 키만 되고, 다른 프로그램의 키를 빼앗지 않도록 수식키가 꼭 있어야 합니다.
+    """
+    modifiers = 0
+    key = None
+    for part in (p.strip().lower() for p in text.split('+')):
+        if part in _MODIFIERS:
+            modifiers |= _MODIFIERS[part]
+        elif key is not None:
+            raise ValueError(f"단축키에는 일반 키가 하나만 있어야 합니다: {text}")
+        elif len(part) == 1 and part.isascii() and part.isalnum():
+            key = ord(part.upper())
+        elif part in _NAMED_KEYS:
+            key = _NAMED_KEYS[part]
+        elif part[:1] == 'f' and part[1:].isdigit() and 1 <= int(part[1:]) <= 24:
+            key = 0x70 + int(part[1:]) - 1
+        else:
+            raise ValueError(f"알 수 없는 키입니다: {part} ({text})")
+    if key is None:
+        raise ValueError(f"단축키에 일반 키가 없습니다: {text}")
+    if not modifiers:
+        raise ValueError(f"단축키에는 ctrl/alt/shift/win 중 하나 이상이 있어야 합니다: {text}")
+    return modifiers, key
+
+
+class GlobalHotkey:
+    """
+    다른 프로그램(나이스 창)이 앞에 있을 때도 동작하는 전역 단축키 (Windows 전용)
+
+    RegisterHotKey는 등록한 스레드의 메시지 큐로 WM_HOTKEY를 보내므로,
+    전용 스레드에서 등록하고 메시지 루프를 돌며 on_press를 호출합니다.
+    """
+    WM_HOTKEY = 0x0312
+    WM_QUIT = 0x0012
+    HOTKEY_ID = 1
+
+    # 단축키를 뗐는지 확인할 키 (Ctrl, Alt, Shift, 왼쪽/오른쪽 Win)
+    _MODIFIER_VKS = (0x11, 0x12, 0x10, 0x5B, 0x5C)
+
+    def __init__(self, spec: str, on_press):
+        self.spec = spec
+        self.on_press = on_press
+        self.key = None
+        self.registered = False
+        self._thread = None
+        self._thread_id = None
+        self._ready = threading.Event()
+
+    def start(self) -> bool:
+        """단축키를 등록합니다. 등록하지 못하면(Windows가 아니거나 다른 프로그램이 사용 중) False"""
+        if sys.platform != 'win32':
+            return False
+        try:
+            modifiers, key = parse_hotkey(self.spec)
+        except ValueError as e:
+            print(f"붙여넣기 시작 단축키 설정 오류: {e}")
+            return False
+        self.key = key
+        self._thread = threading.Thread(target=self._run, args=(modifiers, key), name='paste-hotkey', daemon=True)
+        self._thread.start()
+        self._ready.wait(2.0)
+        if not self.registered:
+            print(f"단축키 {self.spec}을(를) 등록하지 못했습니다. (다른 프로그램이 사용 중일 수 있습니다)")
+        return self.registered
+
+    def _run(self, modifiers: int, key: int):
+        import ctypes
+        from ctypes import wintypes
+        user32 = ctypes.windll.user32
+        self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+        self.registered = bool(user32.RegisterHotKey(None, self.HOTKEY_ID, modifiers | _MOD_NOREPEAT, key))
+        self._ready.set()
+        if not self.registered:
+            return
+        try:
+            msg = wintypes.MSG()
+            while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                if msg.message == self.WM_HOTKEY and msg.wParam == self.HOTKEY_ID:
+                    self.on_press()
+        finally:
+            user32.UnregisterHotKey(None, self.HOTKEY_ID)
+
+    def wait_released(self, timeout: float = 10.0, settle: float = 0.1):
+        """
+        단축키(수식키 포함)를 모두 뗄 때까지 기다립니다.
+        WM_HOTKEY는 키를 누르는 순간 오므로, 바로 입력하면 첫 글자가 Ctrl+Alt+글자로 들어갈 수 있습니다.
+        """
+        if sys.platform != 'win32':
+            return
+        import ctypes
+        user32 = ctypes.windll.user32
+        keys = self._MODIFIER_VKS + ((self.key,) if self.key else ())
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if not any(user32.GetAsyncKeyState(vk) & 0x8000 for vk in keys):
+                break
+            time.sleep(0.02)
+        time.sleep(settle)
+
+    def stop(self):
+        """메시지 루프를 끝내고 단축키 등록을 해제합니다."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        import ctypes
+        ctypes.windll.user32.PostThreadMessageW(self._thread_id, self.WM_QUIT, 0, 0)
+        self._thread.join(1.0)
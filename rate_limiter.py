@@ -0,0 +1,124 @@
+# rate_limiter.py (서비스별 요청 속도 제한 - 응답 시간에 따라 자동 조절)
+
+import time
+import threading
+import configparser
+
+
+# 기다리면 안 되는 스레드 (GUI 스레드). 이 스레드의 요청은 사용자가 직접 누른 것이므로 기다리게 하지 않습니다.
+_interactive_thread = None
+
+
+def set_interactive_thread(thread: threading.Thread):
+    """이 스레드에서는 acquire가 잠들지 않도록 합니다. (Tk 이벤트 루프가 멈추지 않게)"""
+    global _interactive_thread
+    _interactive_thread = thread
+
+
+def is_interactive_thread() -> bool:
+    """지금 스레드가 잠들면 안 되는 GUI 스레드인지 확인합니다."""
+    return _interactive_thread is not None and threading.current_thread() is _interactive_thread
+
+
+def _read_rate_config() -> dict:
+    """config.ini의 [RateLimit] 섹션 (분당 요청 수 등)을 읽습니다."""
+    config = configparser.ConfigParser()
+    config.read('config.ini', encoding='utf-8')
+    return dict(config['RateLimit']) if config.has_section('RateLimit') else {}
+
+
+class TokenBucket:
+    """
+    토큰 버킷: 초당 rate개씩 토큰이 차고 최대 burst개까지 쌓입니다.
+    요청 하나에 토큰 하나를 쓰며, 토큰이 없으면 찰 때까지 기다립니다.
+    """
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self) -> float:
+        """
+        토큰 하나를 가져갑니다. 기다린 시간(초)을 반환합니다.
+        GUI 스레드(set_interactive_thread)에서는 기다리지 않습니다. 토큰이 있으면 쓰고, 없으면 제한 없이 진행합니다.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if is_interactive_thread():
+                self._tokens = max(0.0, self._tokens - 1)
+                return 0.0
+            wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            # 기다리는 동안 찰 토큰까지 미리 써서, 여러 스레드가 같은 토큰을 두고 다투지 않게 합니다.
+            self._tokens -= 1
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class AdaptiveLimiter(TokenBucket):
+    """
+    서버 응답 시간에 따라 속도를 조절하는 토큰 버킷 (AIMD)
+    - 응답이 slow_ms보다 느리거나 일시적 오류가 나면 속도를 절반으로 (최소 min_rate)
+    - 빠른 응답이 이어지면 조금씩 max_rate까지 회복
+    """
+    DECREASE_COOLDOWN = 10.0  # 연달아 느린 응답이 와도 이 간격(초)마다 한 번만 줄입니다.
+
+    def __init__(self, service_name: str, rate: float, burst: int, min_rate: float, slow_ms: float):
+        super().__init__(rate, burst)
+        self.service_name = service_name
+        self.max_rate = rate
+        self.min_rate = min_rate
+        self.slow_ms = slow_ms
+        self.ewma_ms = None  # 최근 응답 시간의 지수 이동 평균
+        self._last_decrease = 0.0
+
+    def observe(self, elapsed_ms: float, ok: bool = True):
+        """요청 하나의 응답 시간(실패 여부)을 반영해 속도를 조절합니다."""
+        with self._lock:
+            if ok:
+                self.ewma_ms = elapsed_ms if self.ewma_ms is None else self.ewma_ms * 0.8 + elapsed_ms * 0.2
+            now = time.monotonic()
+            if not ok or (self.ewma_ms or 0.0) > self.slow_ms:
+                if now - self._last_decrease >= self.DECREASE_COOLDOWN and self.rate > self.min_rate:
+                    self.rate = max(self.min_rate, self.rate / 2)
+                    self._last_decrease = now
+                    print(f"[{self.service_name}] 서버 응답이 느려 요청 속도를 분당 {self.rate * 60:.1f}회로 줄입니다. "
+                          f"(평균 {self.ewma_ms or 0.0:.0f}ms)")
+            elif self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'per_minute': round(self.rate * 60, 1), 'ewma_ms': round(self.ewma_ms or 0.0)}
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(service_name: str) -> AdaptiveLimiter:
+    """
+    서비스 이름에 해당하는 속도 제한기를 반환합니다. (없으면 config.ini [RateLimit]으로 생성)
+    [RateLimit]에 서비스 이름 키(예: 나이스 = 30)가 있으면 그 값을, 없으면 per_minute를 사용합니다.
+    """
+    with _limiters_lock:
+        if service_name not in _limiters:
+            config = _read_rate_config()
+            try:
+                per_minute = float(config.get(service_name, config.get('per_minute', 30)))
+                burst = int(config.get('burst', 5))
+                min_per_minute = float(config.get('min_per_minute', 4))
+                slow_ms = float(config.get('slow_ms', 8000))
+            except ValueError:
+                print("[RateLimit] 설정 값이 올바르지 않아 기본값을 사용합니다.")
+                per_minute, burst, min_per_minute, slow_ms = 30.0, 5, 4.0, 8000.0
+            _limiters[service_name] = AdaptiveLimiter(
+                service_name, per_minute / 60, burst, min(per_minute, min_per_minute) / 60, slow_ms)
+        return _limiters[service_name]
@@ -0,0 +1,117 @@
+# render_profile.py (자동화 전용 페이지의 가벼운 렌더링 프로필)
+
+import weakref
+import configparser
+from playwright.sync_api import Page
+
+RENDER_PROFILES = ('normal', 'light')
+
+NORMAL_VIEWPORT = {"width": 1920, "height": 1080}
+DEFAULT_BACKGROUND_VIEWPORT = {"width": 1280, "height": 720}
+
+# CSS 전환/애니메이션을 사실상 끕니다. expect(...).to_be_visible()이 메뉴 애니메이션을 기다리지 않게 됩니다.
+# 'none'이나 0s로 완전히 없애면 transitionend/animationend 이벤트가 발생하지 않아
+# 이 이벤트를 기다리는 화면 스크립트가 멈출 수 있으므로 1ms로 줄입니다.
+_LIGHT_STYLE = (
+    "*, *::before, *::after {"
+    " transition-duration: 1ms !important;"
+    " transition-delay: 0s !important;"
+    " animation-duration: 1ms !important;"
+    " animation-delay: 0s !important;"
+    " scroll-behavior: auto !important;"
+    " }"
+)
+
+# 모든 프레임, 모든 이동 후에 스타일을 넣는 초기화 스크립트
+_LIGHT_INIT_SCRIPT = """
+(() => {
+    const inject = () => {
+        if (document.getElementById('__automation_light_style')) return;
+        const style = document.createElement('style');
+        style.id = '__automation_light_style';
+        style.textContent = %r;
+        (document.head || document.documentElement).appendChild(style);
+    };
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', inject);
+    } else {
+        inject();
+    }
+})();
+""" % _LIGHT_STYLE
+
+# 가벼운 프로필이 적용된 페이지 목록 (대기 시간 측정 지점을 나누는 데 사용)
+_light_pages = weakref.WeakSet()
+
+
+def get_render_settings():
+    """config.ini의 [Render] 섹션에서 기본 프로필과 백그라운드 페이지 크기를 읽습니다."""
+    config = configparser.ConfigParser()
+    config.read('config.ini', encoding='utf-8')
+
+    try:
+        profile = config['Render']['profile'].strip().lower()
+    except (KeyError, configparser.NoSectionError):
+        profile = 'normal'  # 기본값
+    if profile not in RENDER_PROFILES:
+        print(f"알 수 없는 렌더링 프로필입니다: {profile} (normal로 동작합니다)")
+        profile = 'normal'
+
+    viewport = dict(DEFAULT_BACKGROUND_VIEWPORT)
+    try:
+        width, height = config['Render']['background_viewport'].lower().split('x')
+        viewport = {"width": int(width), "height": int(height)}
+    except (KeyError, ValueError, configparser.NoSectionError):
+        pass
+    return profile, viewport
+
+
+def apply_profile(page: Page, profile: str, background: bool = False):
+    """
+    새 페이지에 렌더링 프로필을 적용합니다.
+    - normal: 기존과 동일 (1920x1080)
+    - light: 전환/애니메이션 제거 + reduced motion, 백그라운드 페이지는 작은 화면 크기
+    """
+    _, background_viewport = get_render_settings()
+
+    if profile != 'light':
+        page.set_viewport_size(NORMAL_VIEWPORT)
+        return
+
+    page.set_viewport_size(background_viewport if background else NORMAL_VIEWPORT)
+    page.emulate_media(reduced_motion='reduce')
+    page.add_init_script(_LIGHT_INIT_SCRIPT)
+    if page.url != 'about:blank':
+        # 이미 열린 문서에도 바로 적용합니다.
+        for frame in page.frames:
+            frame.add_style_tag(content=_LIGHT_STYLE)
+    _light_pages.add(page)
+
+
+def is_light(page: Page) -> bool:
+    return page in _light_pages
+
+
+def point_for(page: Page, point: str) -> str:
+    """
+    대기 시간 측정 지점 이름에 프로필을 붙입니다. (예: neis_menu.leaf@light)
+    두 프로필의 측정값을 따로 모아 단계별 지연을 비교할 수 있습니다.
+    """
+    return f"{point}@light" if is_light(page) else point
+
+
+def compare_profiles(summary: dict) -> list:
+    """
+    TimingProfile.summary() 결과에서 normal/light 측정값이 모두 있는 지점의 p50을 비교합니다.
+    반환값: [(지점, normal p50, light p50, 차이 %)]
+    """
+    rows = []
+    for point, stats in sorted(summary.items()):
+        if point.endswith('@light'):
+            continue
+        light = summary.get(f"{point}@light")
+        if not light:
+            continue
+        change = (light['p50'] - stats['p50']) / stats['p50'] * 100 if stats['p50'] else 0.0
+        rows.append((point, stats['p50'], light['p50'], round(change, 1)))
+    return rows
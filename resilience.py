@@ -0,0 +1,189 @@
+# resilience.py (서비스별 재시도/서킷 브레이커)
+
+import time
+import random
+from playwright.sync_api import Page, Error, TimeoutError
+from timing_profile import timing
+from rate_limiter import get_limiter, is_interactive_thread
+
+# 오류 분류
+TRANSIENT = 'transient'              # 일시적 네트워크 오류 → 재시도
+SESSION_EXPIRED = 'session_expired'  # 로그인 세션 만료 → 재로그인 필요
+BROWSER_DEAD = 'browser_dead'        # 브라우저/컨텍스트가 닫힘 → 브라우저 재시작 필요
+FATAL = 'fatal'                      # 그 밖의 오류 → 재시도하지 않음
+
+# 일시적인 네트워크 오류로 보는 Chromium 오류 코드
+_TRANSIENT_MARKERS = (
+    'net::ERR_CONNECTION_RESET',
+    'net::ERR_CONNECTION_CLOSED',
+    'net::ERR_CONNECTION_REFUSED',
+    'net::ERR_CONNECTION_TIMED_OUT',
+    'net::ERR_TIMED_OUT',
+    'net::ERR_NAME_NOT_RESOLVED',
+    'net::ERR_INTERNET_DISCONNECTED',
+    'net::ERR_NETWORK_CHANGED',
+    'net::ERR_EMPTY_RESPONSE',
+    'net::ERR_SSL_PROTOCOL_ERROR',
+)
+
+# 브라우저가 더 이상 쓸 수 없는 상태임을 나타내는 메시지
+_DEAD_MARKERS = (
+    'Target page, context or browser has been closed',
+    'Browser has been closed',
+    'Browser closed',
+    'Connection closed',
+)
+
+_LOGIN_URL_MARKER = 'lg00_001.do'
+
+
+class CircuitOpenError(Exception):
+    """서킷 브레이커가 열려 있어 서비스 호출을 건너뛸 때 발생하는 오류"""
+
+
+def classify_error(error: Exception, page: Page = None, target_url: str = None) -> str:
+    """
+    예외와 (가능하면) 현재 페이지 상태를 보고 오류 종류를 판단합니다.
+    target_url이 로그인 페이지이면 로그인 페이지에 있는 것이 당연하므로 세션 만료로 보지 않습니다.
+    """
+    message = str(error)
+
+    if any(marker in message for marker in _DEAD_MARKERS):
+        return BROWSER_DEAD
+    if page is not None:
+        try:
+            if page.is_closed():
+                return BROWSER_DEAD
+            going_to_login = target_url is not None and _LOGIN_URL_MARKER in target_url
+            if _LOGIN_URL_MARKER in page.url and not going_to_login:
+                return SESSION_EXPIRED
+        except Error:
+            return BROWSER_DEAD
+
+    if isinstance(error, TimeoutError):
+        return TRANSIENT
+    if any(marker in message for marker in _TRANSIENT_MARKERS):
+        return TRANSIENT
+    return FATAL
+
+
+class CircuitBreaker:
+    """
+    서비스별 서킷 브레이커
+    - closed: 정상 호출
+    - open: 연속 실패가 기준을 넘으면 reset_timeout 동안 호출을 차단
+    - half_open: 차단 시간이 지나면 한 번 시험 호출, 성공하면 closed로 복귀, 일시적 오류면 다시 open
+      (일시적 오류가 아닌 실패는 서버가 응답했다는 뜻이므로 closed로 복귀)
+    """
+    def __init__(self, service_name: str, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.service_name = service_name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def before_call(self):
+        """호출 전에 확인합니다. 차단 중이면 CircuitOpenError를 발생시킵니다."""
+        if self.state == 'open':
+            remaining = self.reset_timeout - (time.monotonic() - self.opened_at)
+            if remaining > 0:
+                raise CircuitOpenError(
+                    f"{self.service_name} 서비스가 응답하지 않아 잠시 호출을 멈췄습니다. "
+                    f"{remaining:.0f}초 후 다시 시도해주세요."
+                )
+            self.state = 'half_open'
+            print(f"[{self.service_name}] 서킷 브레이커: 시험 호출을 허용합니다.")
+
+    def record_success(self):
+        if self.state != 'closed':
+            print(f"[{self.service_name}] 서킷 브레이커: 정상 상태로 복귀했습니다.")
+        self.state = 'closed'
+        self.failures = 0
+
+    def record_other_error(self):
+        """일시적 오류가 아닌 실패(세션 만료, 화면 오류 등). 서버는 응답했으므로 시험 호출 중이었다면 closed로 돌립니다."""
+        if self.state == 'half_open':
+            print(f"[{self.service_name}] 서킷 브레이커: 시험 호출에 서버가 응답하여 정상 상태로 복귀했습니다.")
+            self.state = 'closed'
+            self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == 'half_open' or self.failures >= self.failure_threshold:
+            self.state = 'open'
+            self.opened_at = time.monotonic()
+            print(f"[{self.service_name}] 서킷 브레이커: 연속 {self.failures}회 실패로 호출을 차단합니다.")
+
+
+_breakers = {}
+
+
+def get_breaker(service_name: str) -> CircuitBreaker:
+    """서비스 이름에 해당하는 서킷 브레이커를 반환합니다. (없으면 생성)"""
+    if service_name not in _breakers:
+        _breakers[service_name] = CircuitBreaker(service_name)
+    return _breakers[service_name]
+
+
+def backoff_delay(attempt: int, base_delay: float = 0.5, max_delay: float = 8.0) -> float:
+    """지수 백오프에 전체 지터(full jitter)를 적용한 대기 시간(초)을 계산합니다."""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def call_with_retry(service_name: str, func, page: Page = None, max_attempts: int = 3,
+                    base_delay: float = 0.5, max_delay: float = 8.0, target_url: str = None):
+    """
+    func를 실행하고, 일시적 오류이면 지터 백오프 후 재시도합니다.
+    세션 만료/브라우저 종료/그 밖의 오류는 재시도하지 않고 그대로 올려보냅니다.
+    target_url은 이동할 주소이며 오류 분류에 쓰입니다. (로그인 페이지로 가는 중의 오류를 세션 만료로 보지 않음)
+    매 시도는 서비스별 속도 제한(토큰 버킷)을 거치고, 걸린 시간으로 속도를 조절합니다.
+    GUI 스레드(set_interactive_thread)에서는 창이 멈추지 않도록 백오프 대기 없이 바로 재시도합니다.
+    """
+    breaker = get_breaker(service_name)
+    limiter = get_limiter(service_name)
+    for attempt in range(max_attempts):
+        breaker.before_call()
+        limiter.acquire()
+        start = time.perf_counter()
+        try:
+            result = func()
+        except Exception as e:
+            kind = classify_error(e, page, target_url)
+            if kind != TRANSIENT:
+                breaker.record_other_error()
+                raise
+            limiter.observe((time.perf_counter() - start) * 1000, ok=False)
+            breaker.record_failure()
+            if attempt == max_attempts - 1 or breaker.state == 'open':
+                raise
+            if is_interactive_thread():
+                print(f"[{service_name}] 일시적 오류로 바로 재시도합니다 ({attempt + 1}/{max_attempts}): {e}")
+                continue
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            print(f"[{service_name}] 일시적 오류로 {delay:.1f}초 후 재시도합니다 ({attempt + 1}/{max_attempts}): {e}")
+            time.sleep(delay)
+        except BaseException:
+            # 중단(KeyboardInterrupt 등)으로 결과를 모르면 시험 호출을 실패로 보고 다시 차단합니다.
+            if breaker.state == 'half_open':
+                breaker.record_failure()
+            raise
+        else:
+            limiter.observe((time.perf_counter() - start) * 1000)
+            breaker.record_success()
+            return result
+
+
+def resilient_goto(page: Page, url: str, service_name: str, timeout: int = 30000):
+    """
+    페이지 이동 + 네트워크 안정화 대기를 재시도/서킷 브레이커로 감쌉니다.
+    타임아웃은 서비스별 대기 시간 프로필(goto.<서비스>)에서 가져옵니다.
+    """
+    point = f'goto.{service_name}'
+
+    def _goto():
+        with timing.measure(point):
+            page.goto(url, timeout=timing.timeout(point, timeout))
+            page.wait_for_load_state("networkidle", timeout=timing.timeout(point, timeout))
+
+    call_with_retry(service_name, _goto, page=page, target_url=url)
@@ -0,0 +1,176 @@
+# roster_index.py (나이스 명렬 색인 - 번호/이름으로 학생 행에 바로 입력)
+
+import re
+
+# 포커스된 입력칸이 있는 표에서 번호/이름 열과 입력 열의 현재 값을 한 번에 읽는 스크립트
+# 행 번호(row)는 표 안의 행 순서이며, _FOCUS_CELL_JS에서 같은 순서로 행을 찾습니다.
+_BUILD_INDEX_JS = """
+() => {
+    const active = document.activeElement;
+    if (!document.hasFocus() || !active || !active.matches('input, textarea, [contenteditable="true"]')) return null;
+    const cell = active.closest('[role="gridcell"], td');
+    const row = cell && cell.closest('[role="row"], tr');
+    const table = row && row.closest('[role="grid"], table');
+    if (!table) return null;
+
+    const cellsOf = r => Array.from(r.children).filter(c => c.matches('[role="gridcell"], td, [role="columnheader"], th'));
+    const textOf = c => {
+        if (!c) return '';
+        const input = c.querySelector('input, textarea, [contenteditable="true"]');
+        if (!input) return (c.innerText || '').trim();
+        return input.isContentEditable ? input.innerText : input.value;
+    };
+    const rows = Array.from(table.querySelectorAll('[role="row"], tr')).filter(r => r.closest('[role="grid"], table') === table);
+    const column = cellsOf(row).indexOf(cell);
+
+    // 머리글 행에서 번호/이름 열을 찾습니다. (없으면 -1: 그 열로는 찾을 수 없음)
+    const header = rows.find(r => r.querySelector('[role="columnheader"], th'));
+    const headers = header ? cellsOf(header).map(textOf) : [];
+    const find = pattern => headers.findIndex(h => pattern.test(h.replace(/\\s/g, '')));
+    const numberColumn = find(/^(번호|학생번호|출석번호)$/);
+    const nameColumn = find(/^(이름|성명|학생명)$/);
+
+    const entries = [];
+    rows.forEach((r, index) => {
+        if (r === header) return;
+        const cells = cellsOf(r);
+        const target = cells[column] && cells[column].querySelector('input, textarea, [contenteditable="true"]');
+        if (!target) return;
+        entries.push({
+            row: index,
+            number: numberColumn >= 0 ? textOf(cells[numberColumn]) : '',
+            name: nameColumn >= 0 ? textOf(cells[nameColumn]) : '',
+            value: textOf(cells[column]),
+        });
+    });
+    return {column, numberColumn, nameColumn, entries};
+}
+"""
+
+# row번째 행의 column번째 칸 입력칸에 포커스를 줍니다.
+_FOCUS_CELL_JS = """
+([rowIndex, column]) => {
+    const active = document.activeElement;
+    const table = active && active.closest('[role="grid"], table') || document.querySelector('[role="grid"], table');
+    if (!table) return false;
+    const rows = Array.from(table.querySelectorAll('[role="row"], tr')).filter(r => r.closest('[role="grid"], table') === table);
+    const row = rows[rowIndex];
+    const cells = row ? Array.from(row.children).filter(c => c.matches('[role="gridcell"], td, [role="columnheader"], th')) : [];
+    const input = cells[column] && cells[column].querySelector('input, textarea, [contenteditable="true"]');
+    if (!input) return false;
+    input.scrollIntoView({block: 'center'});
+    input.focus();
+    return document.activeElement === input;
+}
+"""
+
+# 키 부분이 이보다 길면 번호/이름이 아니라 내용에 탭이 들어간 것으로 봅니다.
+MAX_KEY_LENGTH = 20
+# 첫 열 값 중 이 비율 이상이 화면 명렬의 번호/이름과 맞아야 번호/이름 입력으로 봅니다.
+# ('상<Tab>내용'처럼 첫 열이 짧은 글자인 일반 표를 번호/이름으로 잘못 읽지 않도록)
+KEY_MATCH_RATIO = 0.5
+
+
+def parse_keyed_records(lines: list) -> list:
+    """
+    '번호(또는 이름)<Tab>내용' 형식의 줄 목록이면 [(키, 내용)]을 반환합니다.
+    엑셀에서 번호 열과 내용 열을 함께 복사하면 이 형식이 됩니다. 아니면 None (기존 순서 입력)
+    형식만 보므로, 실제로 번호/이름인지는 RosterIndex.recognizes()로 다시 확인해야 합니다.
+    """
+    records = []
+    for line in lines:
+        key, sep, text = line.partition('\t')
+        key = key.strip()
+        if not sep or not key or len(key) > MAX_KEY_LENGTH:
+            return None
+        records.append((key, text.strip()))
+    return records or None
+
+
+def number_key(text: str):
+    """'03', '3번', '3' 을 같은 번호로 봅니다."""
+    match = re.fullmatch(r'0*(\d+)\s*번?', text.strip())
+    return int(match.group(1)) if match else None
+
+
+class RosterIndex:
+    """
+    현재 나이스 화면(포커스된 표)의 명렬 색인
+    번호/이름 → 표 안의 행 위치를 한 번에 만들어 두고, 입력할 학생의 칸으로 바로 이동합니다.
+    입력 칸의 현재 값도 함께 읽어 두므로 바뀐 학생만 입력할 수 있습니다.
+    """
+    def __init__(self, frame, data: dict):
+        self.frame = frame
+        self.url = frame.url
+        self.column = data['column']
+        self.entries = data['entries']
+        self.by_number = {}
+        self.by_name = {}
+        for entry in self.entries:
+            number = number_key(entry['number'])
+            if number is not None:
+                self.by_number[number] = entry
+            if entry['name']:
+                self.by_name.setdefault(entry['name'].strip(), []).append(entry)
+
+    @classmethod
+    def build(cls, page):
+        """포커스된 입력칸이 있는 프레임에서 색인을 만듭니다. (브라우저 소유 스레드에서 호출) 찾지 못하면 None"""
+        if page is None or page.is_closed():
+            return None
+        for frame in page.frames:
+            try:
+                data = frame.evaluate(_BUILD_INDEX_JS)
+            except Exception:
+                continue
+            if data and data['entries']:
+                index = cls(frame, data)
+                print(f"명렬 색인: {len(index.entries)}명 (번호 {len(index.by_number)}, 이름 {len(index.by_name)})")
+                return index
+        return None
+
+    def is_current(self) -> bool:
+        """같은 화면(프레임 주소)에 그대로 있는지 확인합니다. 화면이 바뀌면 색인을 다시 만들어야 합니다."""
+        return not self.frame.is_detached() and self.frame.url == self.url
+
+    def recognizes(self, keys: list, min_ratio: float = KEY_MATCH_RATIO) -> bool:
+        """키 목록의 min_ratio 이상이 이 화면 명렬의 번호나 이름과 맞는지 확인합니다."""
+        def known(key):
+            number = number_key(key)
+            if number is not None:
+                return number in self.by_number
+            return key.strip() in self.by_name
+        matched = sum(1 for key in keys if known(key))
+        return matched > 0 and matched >= len(keys) * min_ratio
+
+    def lookup(self, key: str) -> dict:
+        """
+        번호 또는 이름으로 학생 행을 찾습니다.
+        없으면 KeyError, 같은 이름이 여러 명이면 ValueError (번호로 입력해야 함)
+        """
+        number = number_key(key)
+        if number is not None:
+            if number in self.by_number:
+                return self.by_number[number]
+            raise KeyError(f"{key}번 학생을 화면에서 찾을 수 없습니다.")
+        matches = self.by_name.get(key.strip(), [])
+        if not matches:
+            raise KeyError(f"'{key}' 학생을 화면에서 찾을 수 없습니다.")
+        if len(matches) > 1:
+            raise ValueError(f"'{key}' 이름이 {len(matches)}명이므로 번호로 입력해주세요.")
+        return matches[0]
+
+    def fill(self, entry: dict, text: str):
+        """학생 행의 입력칸으로 바로 이동해 내용을 바꿉니다. (브라우저 소유 스레드에서 호출)"""
+        if not self.frame.evaluate(_FOCUS_CELL_JS, [entry['row'], self.column]):
+            raise RuntimeError(f"{entry['number']} {entry['name']} 학생의 입력칸에 포커스를 줄 수 없습니다.")
+        keyboard = self.frame.page.keyboard
+        keyboard.press('Control+A')
+        keyboard.press('Delete')
+        keyboard.insert_text(text)
+        entry['value'] = text
+
+    def commit(self):
+        """마지막 칸의 입력이 반영되도록 포커스를 다음 칸으로 옮깁니다."""
+        self.frame.page.keyboard.press('Tab')
+
@@ -0,0 +1,95 @@
+# session_snapshot.py (브라우저 세션 스냅샷 저장/복원)
+
+import os
+import json
+import time
+import configparser
+
+SNAPSHOT_FILE = 'snapshot.json'        # 서비스별 페이지 URL, 로그인 상태
+STORAGE_STATE_FILE = 'storage_state.json'  # 컨텍스트 쿠키/로컬 스토리지
+
+
+def get_snapshot_dir():
+    """config.ini의 [Session] 섹션에서 스냅샷 저장 폴더를 읽습니다."""
+    config = configparser.ConfigParser()
+    config.read('config.ini', encoding='utf-8')
+
+    try:
+        return config['Session']['snapshot_dir'].strip()
+    except (KeyError, configparser.NoSectionError):
+        return 'session_state'  # 기본값
+
+
+def _make_private_dir(path: str):
+    """폴더를 만들고 현재 사용자만 접근할 수 있게 합니다. (Windows에서는 권한 비트가 무시됨)"""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    try:
+        os.chmod(path, 0o700)
+    except OSError:
+        pass
+
+
+def _write_json_atomic(path: str, data: dict):
+    """
+    임시 파일에 쓴 뒤 교체하여, 쓰는 도중 충돌해도 이전 파일이 깨지지 않게 합니다.
+    쿠키가 들어갈 수 있으므로 파일은 현재 사용자만 읽고 쓸 수 있게(0600) 만듭니다.
+    """
+    tmp_path = path + '.tmp'
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with open(fd, 'w', encoding='utf-8') as file:
+        json.dump(data, file, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def save_pages(page_urls: dict, is_logged_in: bool):
+    """서비스별 페이지 URL과 로그인 상태를 저장합니다."""
+    snapshot_dir = get_snapshot_dir()
+    _make_private_dir(snapshot_dir)
+    _write_json_atomic(os.path.join(snapshot_dir, SNAPSHOT_FILE), {
+        'pages': page_urls,
+        'is_logged_in': is_logged_in,
+        'saved_at': time.time()
+    })
+
+
+def save_storage_state(storage_state: dict, path: str = None):
+    """
+    context.storage_state()로 얻은 쿠키/스토리지 상태를 저장합니다. (path가 없으면 스냅샷 폴더)
+    로그인 쿠키와 인증 토큰이 암호화 없이 들어가므로, 이 파일을 가진 사람은 같은 계정으로 접속할 수 있습니다.
+    폴더와 파일은 현재 사용자 전용 권한으로 만들고, 정상 종료 시 clear_snapshot()이 지웁니다.
+    """
+    if path is None:
+        path = os.path.join(get_snapshot_dir(), STORAGE_STATE_FILE)
+    _make_private_dir(os.path.dirname(path) or '.')
+    _write_json_atomic(path, storage_state)
+
+
+def load_snapshot():
+    """
+    저장된 스냅샷을 읽습니다.
+    반환값: (스냅샷 dict, storage_state 파일 경로 또는 None). 스냅샷이 없으면 (None, None)
+    """
+    snapshot_dir = get_snapshot_dir()
+    snapshot_path = os.path.join(snapshot_dir, SNAPSHOT_FILE)
+    storage_path = os.path.join(snapshot_dir, STORAGE_STATE_FILE)
+
+    if not os.path.exists(snapshot_path):
+        return None, None
+
+    try:
+        with open(snapshot_path, 'r', encoding='utf-8') as file:
+            snapshot = json.load(file)
+    except (OSError, ValueError) as e:
+        print(f"세션 스냅샷을 읽을 수 없습니다: {e}")
+        return None, None
+
+    return snapshot, (storage_path if os.path.exists(storage_path) else None)
+
+
+def clear_snapshot():
+    """정상 종료 시 스냅샷을 삭제합니다. (쿠키가 디스크에 남지 않도록)"""
+    snapshot_dir = get_snapshot_dir()
+    for name in (SNAPSHOT_FILE, STORAGE_STATE_FILE):
+        path = os.path.join(snapshot_dir, name)
+        if os.path.exists(path):
+            os.remove(path)
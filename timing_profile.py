@@ -0,0 +1,157 @@
+# timing_profile.py (대기 시간/타임아웃 자동 조정 프로필)
+
+import os
+import json
+import time
+import socket
+import threading
+import configparser
+from contextlib import contextmanager
+
+# 동작 모드
+# - fixed: 코드에 적힌 기본값을 그대로 사용 (측정만 함)
+# - conservative: 최근 측정값의 p99에 넉넉한 여유를 둠. 느린 네트워크에서는 기본값보다 길어질 수 있음
+# - aggressive: 최근 측정값의 p90에 작은 여유만 둠. 빠른 네트워크에서 대기 시간을 크게 줄임
+TIMING_MODES = ('fixed', 'conservative', 'aggressive')
+
+# 모드별 설정: (백분위, 배수, 최소 타임아웃 ms, 기본값 대비 최대 배수, 고정 대기 배수)
+_MODE_RULES = {
+    'fixed': None,
+    'conservative': (0.99, 3.0, 3000, 3.0, 1.0),
+    'aggressive': (0.90, 1.5, 1000, 2.0, 0.5),
+}
+
+MIN_SAMPLES = 5     # 이보다 측정값이 적으면 기본값 사용
+WINDOW = 50         # 지점별로 보관하는 최근 측정값 수
+SAVE_INTERVAL = 5.0 # 파일 저장 최소 간격 (초)
+
+
+def _percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class TimingProfile:
+    """
+    대기 지점(point)별로 실제 걸린 시간을 기록하고, 최근 백분위로 타임아웃을 계산합니다.
+    측정값은 PC(호스트 이름)별 파일에 저장되어 다음 실행에도 이어서 사용됩니다.
+    """
+    def __init__(self, mode: str = 'fixed', path: str = None):
+        self.mode = mode if mode in TIMING_MODES else 'fixed'
+        self.path = path
+        self.samples = {}  # {지점: [ms, ...]}
+        self._lock = threading.Lock()
+        self._last_save = 0.0
+        self._dirty = False
+
+    @classmethod
+    def from_config(cls):
+        """config.ini의 [Timing] 섹션에서 모드와 저장 폴더를 읽어 프로필을 만듭니다."""
+        config = configparser.ConfigParser()
+        config.read('config.ini', encoding='utf-8')
+
+        try:
+            mode = config['Timing']['mode'].strip().lower()
+        except (KeyError, configparser.NoSectionError):
+            mode = 'fixed'  # 기본값
+        try:
+            profile_dir = config['Timing']['profile_dir'].strip()
+        except (KeyError, configparser.NoSectionError):
+            profile_dir = 'timing_profiles'  # 기본값
+
+        if mode not in TIMING_MODES:
+            print(f"알 수 없는 대기 시간 모드입니다: {mode} (fixed로 동작합니다)")
+            mode = 'fixed'
+
+        profile = cls(mode, os.path.join(profile_dir, f"{socket.gethostname()}.json"))
+        profile.load()
+        return profile
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                self.samples = {point: list(values)[-WINDOW:] for point, values in json.load(file).items()}
+        except (OSError, ValueError) as e:
+            print(f"대기 시간 프로필을 읽을 수 없습니다: {e}")
+
+    def save(self, force: bool = False):
+        """측정값을 파일에 저장합니다. (force가 아니면 SAVE_INTERVAL마다 한 번)"""
+        if not self.path or not self._dirty:
+            return
+        if not force and time.monotonic() - self._last_save < SAVE_INTERVAL:
+            return
+        with self._lock:
+            data = {point: list(values) for point, values in self.samples.items()}
+            self._dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump(data, file)
+            os.replace(tmp_path, self.path)
+            self._last_save = time.monotonic()
+        except OSError as e:
+            print(f"대기 시간 프로필 저장 실패: {e}")
+
+    def record(self, point: str, elapsed_ms: float):
+        """대기 지점에서 실제로 걸린 시간을 기록합니다."""
+        with self._lock:
+            values = self.samples.setdefault(point, [])
+            values.append(round(elapsed_ms, 1))
+            del values[:-WINDOW]
+            self._dirty = True
+        self.save()
+
+    @contextmanager
+    def measure(self, point: str):
+        """
+        with 블록에 걸린 시간을 기록합니다.
+        실패(타임아웃 등)한 경우에도 걸린 시간을 기록하여 다음 타임아웃이 늘어나도록 합니다.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(point, (time.perf_counter() - start) * 1000)
+
+    def timeout(self, point: str, default_ms: int) -> int:
+        """대기 지점의 타임아웃(ms)을 반환합니다. 측정값이 부족하면 기본값을 사용합니다."""
+        rule = _MODE_RULES[self.mode]
+        with self._lock:
+            values = list(self.samples.get(point, []))
+        if rule is None or len(values) < MIN_SAMPLES:
+            return default_ms
+
+        fraction, factor, floor_ms, max_factor, _ = rule
+        adaptive = _percentile(values, fraction) * factor
+        return int(min(max(adaptive, floor_ms), default_ms * max_factor))
+
+    def settle(self, point: str, default_ms: int) -> int:
+        """
+        클릭 후 안정화처럼 측정할 수 없는 고정 대기 시간(ms)을 모드에 맞게 조정합니다.
+        """
+        rule = _MODE_RULES[self.mode]
+        if rule is None:
+            return default_ms
+        return int(default_ms * rule[4])
+
+    def summary(self) -> dict:
+        """지점별 측정 수, p50/p90/p99, 현재 타임아웃을 반환합니다."""
+        with self._lock:
+            snapshot = {point: list(values) for point, values in self.samples.items()}
+        return {
+            point: {
+                'count': len(values),
+                'p50': _percentile(values, 0.5),
+                'p90': _percentile(values, 0.9),
+                'p99': _percentile(values, 0.99),
+            }
+            for point, values in snapshot.items() if values
+        }
+
+
+# 프로그램 전체에서 공유하는 대기 시간 프로필
+timing = TimingProfile.from_config()
@@ -0,0 +1,153 @@
+# trace_ring.py (최근 몇 분의 Playwright 트레이스만 보관하는 링 버퍼)
+
+import os
+import glob
+import json
+import time
+import shutil
+import zipfile
+import datetime
+import configparser
+from playwright.sync_api import BrowserContext
+
+# 트레이스 모드
+# - off: 기본값, 트레이스를 기록하지 않음
+# - ring: 최근 ring_minutes분의 트레이스 조각(chunk)만 보관하고, 오류가 나면 압축 파일로 저장
+TRACE_MODES = ('off', 'ring')
+
+RING_DIR = '.ring'  # trace_dir 안에서 조각을 보관하는 폴더
+
+
+def get_trace_settings() -> dict:
+    """config.ini의 [Trace] 섹션에서 모드, 보관 시간, 조각 길이, 스크린샷 여부를 읽습니다."""
+    config = configparser.ConfigParser()
+    config.read('config.ini', encoding='utf-8')
+    section = config['Trace'] if config.has_section('Trace') else {}
+
+    mode = section.get('mode', 'off').strip().lower()
+    if mode not in TRACE_MODES:
+        print(f"알 수 없는 트레이스 모드입니다: {mode} (off로 동작합니다)")
+        mode = 'off'
+
+    settings = {'mode': mode, 'trace_dir': section.get('trace_dir', 'traces').strip()}
+    for key, default in (('ring_minutes', 5), ('chunk_seconds', 60)):
+        try:
+            settings[key] = max(1, int(section.get(key, default)))
+        except ValueError:
+            settings[key] = default
+    for key, default in (('screenshots', 'false'), ('snapshots', 'true')):
+        settings[key] = section.get(key, default).strip().lower() in ('1', 'true', 'yes', 'on')
+    return settings
+
+
+class TraceRing:
+    """
+    공유 컨텍스트의 트레이스를 chunk_seconds마다 조각 파일로 끊어 저장하고,
+    ring_minutes분보다 오래된 조각은 지웁니다.
+    dump()를 호출하면 남아 있는 조각을 하나의 압축 파일로 모읍니다.
+
+    Playwright 트레이스는 컨텍스트를 소유한 스레드에서만 다룰 수 있으므로,
+    rotate()/dump()도 BrowserManager의 소유 스레드에서 호출해야 합니다.
+    """
+    def __init__(self, context: BrowserContext, trace_dir: str, ring_minutes: int = 5,
+                 chunk_seconds: int = 60, screenshots: bool = False, snapshots: bool = True):
+        self.context = context
+        self.trace_dir = trace_dir
+        self.ring_dir = os.path.join(trace_dir, RING_DIR)
+        self.ring_seconds = ring_minutes * 60
+        self.chunk_seconds = chunk_seconds
+        self.screenshots = screenshots
+        self.snapshots = snapshots
+        self.chunks = []  # [(조각 시작 시각, 끝 시각, 경로)]
+        self._chunk_started = None
+        self._sequence = 0
+
+    @classmethod
+    def from_config(cls, context: BrowserContext):
+        """config.ini [Trace] mode가 ring이면 트레이스 링 버퍼를 시작해 반환합니다. (off면 None)"""
+        settings = get_trace_settings()
+        if settings['mode'] != 'ring':
+            return None
+        ring = cls(context, settings['trace_dir'], settings['ring_minutes'], settings['chunk_seconds'],
+                   settings['screenshots'], settings['snapshots'])
+        ring.start()
+        return ring
+
+    def start(self):
+        os.makedirs(self.ring_dir, exist_ok=True)
+        # 이전 실행에서 남은 조각은 이번 세션과 관계없으므로 지웁니다.
+        for path in glob.glob(os.path.join(self.ring_dir, '*.zip')):
+            os.remove(path)
+        self.context.tracing.start(screenshots=self.screenshots, snapshots=self.snapshots, sources=False)
+        self.context.tracing.start_chunk()
+        self._chunk_started = time.time()
+        print(f"트레이스 링 버퍼를 시작했습니다. (최근 {self.ring_seconds // 60}분, "
+              f"스크린샷 {'사용' if self.screenshots else '안 함'})")
+
+    def maybe_rotate(self):
+        """현재 조각이 chunk_seconds보다 길어졌으면 끊어 저장합니다."""
+        if self._chunk_started is not None and time.time() - self._chunk_started >= self.chunk_seconds:
+            self.rotate()
+
+    def rotate(self):
+        """현재 조각을 파일로 저장하고 새 조각을 시작합니다."""
+        self._sequence += 1
+        path = os.path.join(self.ring_dir, f"chunk_{self._sequence:05d}.zip")
+        started = self._chunk_started
+        self._chunk_started = None
+        self.context.tracing.stop_chunk(path=path)
+        now = time.time()
+        self.chunks.append((started, now, path))
+        self._trim(now)
+        self.context.tracing.start_chunk()
+        self._chunk_started = time.time()
+
+    def _trim(self, now: float):
+        while self.chunks and self.chunks[0][1] < now - self.ring_seconds:
+            _, _, path = self.chunks.pop(0)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def dump(self, reason: str) -> str:
+        """
+        보관 중인 조각(+ 진행 중이던 조각)을 trace_dir/failure_<시각>.zip으로 모읍니다.
+        브라우저가 이미 죽었으면 진행 중이던 조각은 빠지고 저장된 조각만 모입니다.
+        각 조각은 'playwright show-trace <조각 파일>'로 열어볼 수 있습니다.
+        """
+        try:
+            self.rotate()
+        except Exception as e:
+            print(f"진행 중이던 트레이스 조각을 저장하지 못했습니다: {e}")
+        if not self.chunks:
+            print("저장할 트레이스 조각이 없습니다.")
+            return None
+
+        stamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+        archive_path = os.path.join(self.trace_dir, f"failure_{stamp}.zip")
+        meta = {
+            'reason': reason,
+            'dumped_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'chunks': [{'file': os.path.basename(path),
+                        'start': datetime.datetime.fromtimestamp(start).isoformat(timespec='seconds') if start else None,
+                        'end': datetime.datetime.fromtimestamp(end).isoformat(timespec='seconds')}
+                       for start, end, path in self.chunks],
+        }
+        # 조각 파일은 이미 압축되어 있으므로 다시 압축하지 않고 그대로 담습니다.
+        with zipfile.ZipFile(archive_path, 'w', compression=zipfile.ZIP_STORED) as archive:
+            for _, _, path in self.chunks:
+                if os.path.exists(path):
+                    archive.write(path, os.path.basename(path))
+            archive.writestr('meta.json', json.dumps(meta, ensure_ascii=False, indent=2))
+        print(f"트레이스를 저장했습니다: {archive_path} ({reason})")
+        return archive_path
+
+    def stop(self):
+        """트레이스를 멈추고 보관 중인 조각을 지웁니다. (정상 종료 시)"""
+        try:
+            self.context.tracing.stop()
+        except Exception as e:
+            print(f"트레이스 종료 중 오류: {e}")
+        self.chunks = []
+        shutil.rmtree(self.ring_dir, ignore_errors=True)
@@ -0,0 +1,120 @@
+# ui_watchdog.py (Tk 이벤트 루프 지연 감시)
+
+import sys
+import time
+import threading
+import traceback
+from collections import deque
+
+# 지연 히스토그램 구간 (ms): 각 값은 구간의 상한
+LAG_BUCKETS = (16, 50, 100, 250, 500, 1000, 5000, float('inf'))
+
+
+def _bucket_label(index: int) -> str:
+    low = 0 if index == 0 else LAG_BUCKETS[index - 1]
+    high = LAG_BUCKETS[index]
+    return f"{low:.0f}ms 이상" if high == float('inf') else f"{low:.0f}~{high:.0f}ms"
+
+
+class UiWatchdog:
+    """
+    after() 하트비트로 Tk 이벤트 루프의 지연(lag)을 측정합니다.
+
+    - 하트비트가 예정보다 늦게 실행된 만큼을 지연으로 보고 히스토그램에 기록
+    - 별도 감시 스레드가 하트비트가 멈춘 것을 발견하면 그 순간 GUI 스레드의 스택을 채취
+    - 기준(stall_threshold_ms)을 넘은 멈춤은 진행 중이던 작업 이름, 스택과 함께 보관
+    """
+    def __init__(self, app, interval_ms: int = 100, stall_threshold_ms: int = 250,
+                 get_operation=None, on_stall=None, max_stalls: int = 50):
+        self.app = app
+        self.interval_ms = interval_ms
+        self.stall_threshold_ms = stall_threshold_ms
+        self.get_operation = get_operation or (lambda: None)
+        self.on_stall = on_stall  # 멈춤 기록이 끝났을 때 GUI 스레드에서 호출됨
+        self.histogram = [0] * len(LAG_BUCKETS)
+        self.stalls = deque(maxlen=max_stalls)
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+
+        self._gui_ident = threading.main_thread().ident
+        self._lock = threading.Lock()
+        self._expected = 0.0
+        self._last_beat = 0.0
+        self._pending_stall = None  # 감시 스레드가 채취한, 아직 끝나지 않은 멈춤
+        self._running = False
+
+    def start(self):
+        self._running = True
+        now = time.perf_counter()
+        self._last_beat = now
+        self._expected = now + self.interval_ms / 1000
+        self.app.after(self.interval_ms, self._heartbeat)
+        threading.Thread(target=self._sample_loop, name="UiWatchdog", daemon=True).start()
+
+    def stop(self):
+        self._running = False
+
+    def _heartbeat(self):
+        """GUI 스레드에서 주기적으로 실행되어 예정 시각과의 차이를 기록합니다."""
+        if not self._running:
+            return
+        now = time.perf_counter()
+        lag_ms = max(0.0, (now - self._expected) * 1000)
+
+        with self._lock:
+            self.last_lag_ms = lag_ms
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+            for index, upper in enumerate(LAG_BUCKETS):
+                if lag_ms < upper:
+                    self.histogram[index] += 1
+                    break
+            stall = self._pending_stall
+            self._pending_stall = None
+            self._last_beat = now
+
+        if lag_ms >= self.stall_threshold_ms:
+            record = stall or {'started': time.time() - lag_ms / 1000,
+                               'operation': self.get_operation(), 'stack': None}
+            record['duration_ms'] = round(lag_ms)
+            self.stalls.append(record)
+            print(f"UI 멈춤 {lag_ms:.0f}ms (작업: {record['operation'] or '없음'})")
+            if self.on_stall:
+                self.on_stall(record)
+
+        self._expected = now + self.interval_ms / 1000
+        self.app.after(self.interval_ms, self._heartbeat)
+
+    def _sample_loop(self):
+        """하트비트가 기준 이상 늦어지면 그 순간의 GUI 스레드 스택을 한 번 채취합니다."""
+        check_interval = min(self.stall_threshold_ms, self.interval_ms) / 2000
+        while self._running:
+            time.sleep(check_interval)
+            with self._lock:
+                overdue_ms = (time.perf_counter() - self._last_beat) * 1000 - self.interval_ms
+                if overdue_ms < self.stall_threshold_ms or self._pending_stall is not None:
+                    continue
+                frame = sys._current_frames().get(self._gui_ident)
+                stack = ''.join(traceback.format_stack(frame, limit=15)) if frame else None
+                self._pending_stall = {
+                    'started': time.time() - overdue_ms / 1000,
+                    'operation': self.get_operation(),
+                    'stack': stack,
+                }
+
+    def histogram_text(self) -> str:
+        """지연 히스토그램과 최근 멈춤 기록을 로그용 문자열로 만듭니다."""
+        with self._lock:
+            counts = list(self.histogram)
+            max_lag = self.max_lag_ms
+        total = sum(counts) or 1
+        lines = [f"UI 응답성 (하트비트 {sum(counts)}회, 최대 지연 {max_lag:.0f}ms)"]
+        for index, count in enumerate(counts):
+            bar = '█' * int(count / total * 30)
+            lines.append(f"  {_bucket_label(index):>14} | {bar} {count}")
+        for stall in list(self.stalls)[-5:]:
+            started = time.strftime('%H:%M:%S', time.localtime(stall['started']))
+            lines.append(f"  - {started} {stall['duration_ms']}ms 멈춤 (작업: {stall['operation'] or '없음'})")
+            if stall['stack']:
+                # 가장 안쪽(멈춘 위치)에 가까운 줄만 보여줍니다.
+                lines.extend('      ' + line for line in stall['stack'].strip().splitlines()[-4:])
+        return '\n'.join(lines)
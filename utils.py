@@ -2,8 +2,12 @@
 
 import os.path
 import configparser
-from tkinter import messagebox
+from notifier import notify
 from playwright.sync_api import Page, Browser, expect, TimeoutError
+from har_replay import attach_har
+from timing_profile import timing
+from render_profile import point_for
+from page_index import index_for
 
 # (urls 딕셔너리 등 다른 부분은 변경 없음)
 urls = {
@@ -18,16 +22,18 @@ def login(page: Page):
     try:
         print("전자인증서 로그인 버튼을 찾습니다...")
         login_button = page.locator('button.elec-log-btn')
-        expect(login_button).to_be_visible(timeout=10000)
-        expect(login_button).to_be_enabled(timeout=10000)
+        with timing.measure('login.button'):
+            expect(login_button).to_be_visible(timeout=timing.timeout('login.button', 10000))
+            expect(login_button).to_be_enabled(timeout=timing.timeout('login.button', 10000))
         print("버튼을 클릭합니다.")
         login_button.click()
 
-        page.wait_for_timeout(2000)
+        page.wait_for_timeout(timing.settle('login.after_click', 2000))
         
         print("비밀번호 입력창을 찾습니다...")
         password_input = page.locator('input[name="certPassword"]')
-        expect(password_input).to_be_visible(timeout=10000)
+        with timing.measure('login.password'):
+            expect(password_input).to_be_visible(timeout=timing.timeout('login.password', 10000))
         
         password = get_password_from_file()
         password_input.fill(password)
@@ -43,19 +49,20 @@ def login(page: Page):
         final_confirm_button = confirm_button_locator.last
         
         # 마지막 버튼이 클릭 가능한 상태가 될 때까지 기다린 후 클릭
-        expect(final_confirm_button).to_be_enabled(timeout=10000)
+        with timing.measure('login.confirm'):
+            expect(final_confirm_button).to_be_enabled(timeout=timing.timeout('login.confirm', 10000))
         final_confirm_button.click()
         print("확인 버튼 클릭 완료")
         
     except TimeoutError as e:
         error_msg = f"로그인 과정에서 요소를 찾을 수 없습니다: {str(e)}"
         print(error_msg)
-        messagebox.showerror("로그인 오류", error_msg)
+        notify.showerror("로그인 오류", error_msg)
         raise
     except Exception as e:
         error_msg = f"로그인 중 예상치 못한 오류 발생: {str(e)}"
         print(error_msg)
-        messagebox.showerror("로그인 오류", error_msg)
+        notify.showerror("로그인 오류", error_msg)
         raise
 
 
@@ -82,29 +89,36 @@ def get_password_from_file():
 def neis_go_menu(page: Page, level1: str, level2: str, level3: str, level4: str):
     """나이스 메뉴 탐색 - 견고한 대기 조건으로 개선"""
     try:
+        attach_har(page.context, 'neis_go_menu')
+
         # 1단계: 첫 번째 메뉴 클릭
         level1_menu = page.locator(f'ul.cl-navigationbar-bar > li:has-text("{level1}")')
-        expect(level1_menu).to_be_visible(timeout=15000)
+        with timing.measure(point_for(page, 'neis_menu.level1')):
+            expect(level1_menu).to_be_visible(timeout=timing.timeout(point_for(page, 'neis_menu.level1'), 15000))
         level1_menu.click()
-        page.wait_for_timeout(1000)  # 메뉴 전개 대기
+        page.wait_for_timeout(timing.settle(point_for(page, 'neis_menu.expand'), 1000))  # 메뉴 전개 대기
         
         # 2단계: 서브메뉴 컨테이너 확인 및 클릭
         menu_container = page.locator('ul.cl-navigationbar-list.gnb')
-        expect(menu_container).to_be_visible(timeout=15000)
+        with timing.measure(point_for(page, 'neis_menu.container')):
+            expect(menu_container).to_be_visible(timeout=timing.timeout(point_for(page, 'neis_menu.container'), 15000))
         
         level3_menu = menu_container.locator(f'li.cl-navigationbar-category:has-text("{level2}")').locator(f'li:has-text("{level3}")')
-        expect(level3_menu).to_be_visible(timeout=15000)
+        with timing.measure(point_for(page, 'neis_menu.level3')):
+            expect(level3_menu).to_be_visible(timeout=timing.timeout(point_for(page, 'neis_menu.level3'), 15000))
         level3_menu.click()
-        page.wait_for_timeout(1000)  # 메뉴 전개 대기
+        page.wait_for_timeout(timing.settle(point_for(page, 'neis_menu.expand'), 1000))  # 메뉴 전개 대기
         
         # 3단계: 최종 메뉴 아이템 클릭
         fourth_menu_item = page.locator(f'a.cl-leaf.cl-level-2.cl-sidenavigation-item[title="{level4}"]')
-        expect(fourth_menu_item).to_be_visible(timeout=15000)
+        with timing.measure(point_for(page, 'neis_menu.leaf')):
+            expect(fourth_menu_item).to_be_visible(timeout=timing.timeout(point_for(page, 'neis_menu.leaf'), 15000))
         fourth_menu_item.click()
         
         # 4단계: 페이지 로딩 완료 대기 (견고한 조건)
-        page.wait_for_load_state('networkidle', timeout=30000)
-        page.wait_for_timeout(2000)  # 추가 안정화 대기
+        with timing.measure(point_for(page, 'neis_menu.networkidle')):
+            page.wait_for_load_state('networkidle', timeout=timing.timeout(point_for(page, 'neis_menu.networkidle'), 30000))
+        page.wait_for_timeout(timing.settle(point_for(page, 'neis_menu.stabilize'), 2000))  # 추가 안정화 대기
         
         print(f"메뉴 탐색 완료: {level1} > {level2} > {level3} > {level4}")
         
@@ -113,11 +127,20 @@ def neis_go_menu(page: Page, level1: str, level2: str, level3: str, level4: str)
         raise
 
 def switch_tab(browser: Browser, title_keyword: str) -> Page:
-    for page in browser.contexts[0].pages:
-        if title_keyword in page.title():
-            page.bring_to_front()
-            return page
-    return None
+    """
+    title_keyword가 들어간 탭을 앞으로 가져옵니다.
+    탭 색인이 있으면 탭마다 제목을 묻지 않고 색인에서 찾으며, 이때는 제목뿐 아니라 URL에 들어간 글자도 맞는 것으로 봅니다.
+    (포털이 띄운 팝업도 찾습니다. 여러 개면 가장 최근에 이동한 탭)
+    """
+    context = browser.contexts[0]
+    index = index_for(context)
+    if index is not None:
+        page = index.find(keyword=title_keyword)
+    else:
+        page = next((p for p in context.pages if title_keyword in p.title()), None)
+    if page is not None:
+        page.bring_to_front()
+    return page
 
 def open_url_in_new_tab(browser: Browser, url: str) -> Page:
     new_page = browser.new_page()
@@ -128,11 +151,12 @@ def neis_click_btn(page: Page, button_name: str):
     """나이스 버튼 클릭 - 견고한 대기 조건으로 개선"""
     try:
         button_locator = page.get_by_role("button", name=button_name, exact=True)
-        expect(button_locator).to_be_visible(timeout=15000)
-        expect(button_locator).to_be_enabled(timeout=15000)
+        with timing.measure(point_for(page, 'neis_btn.ready')):
+            expect(button_locator).to_be_visible(timeout=timing.timeout(point_for(page, 'neis_btn.ready'), 15000))
+            expect(button_locator).to_be_enabled(timeout=timing.timeout(point_for(page, 'neis_btn.ready'), 15000))
         
         button_locator.click()
-        page.wait_for_timeout(1000)  # 클릭 후 안정화 대기
+        page.wait_for_timeout(timing.settle(point_for(page, 'neis_btn.after_click'), 1000))  # 클릭 후 안정화 대기
         print(f"버튼 클릭 완료: {button_name}")
         
     except Exception as e: